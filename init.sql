@@ -1,30 +1,367 @@
 CREATE SCHEMA IF NOT EXISTS raw_data;
 
-CREATE TABLE IF NOT EXISTS raw_data.press_releases (
+-- Press releases, range-partitioned by publication month (src/resources/release_storage.py).
+-- press_release_keys holds the unique URLs and the ids summaries reference.
+CREATE TABLE IF NOT EXISTS raw_data.press_release_keys (
     id SERIAL PRIMARY KEY,
     url VARCHAR(500) UNIQUE NOT NULL,
     url_hash VARCHAR(64) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_press_release_keys_url_hash ON raw_data.press_release_keys (url_hash);
+
+CREATE TABLE IF NOT EXISTS raw_data.press_releases (
+    id INTEGER NOT NULL,
+    url VARCHAR(500) NOT NULL,
+    url_hash VARCHAR(64) NOT NULL,
     title TEXT,
     content TEXT,
     published_at TIMESTAMP,
     raw_response JSONB,
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+) PARTITION BY RANGE (published_at);
+CREATE TABLE IF NOT EXISTS raw_data.press_releases_undated
+    PARTITION OF raw_data.press_releases DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_press_releases_published
+    ON raw_data.press_releases (published_at DESC NULLS LAST, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_press_releases_id ON raw_data.press_releases (id);
+CREATE INDEX IF NOT EXISTS idx_press_releases_url_hash ON raw_data.press_releases (url_hash);
+
+CREATE OR REPLACE FUNCTION raw_data.register_press_release() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    new_id INTEGER;
+BEGIN
+    -- Rows moved between partitions by an UPDATE already carry their id
+    IF NEW.id IS NOT NULL THEN
+        RETURN NEW;
+    END IF;
+    INSERT INTO raw_data.press_release_keys (url, url_hash, content_hash, simhash)
+    VALUES (NEW.url, NEW.url_hash, NEW.content_hash, NEW.simhash)
+    ON CONFLICT (url) DO NOTHING
+    RETURNING id INTO new_id;
+    IF new_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    NEW.id := new_id;
+    -- Queue the new release for summarization
+    INSERT INTO raw_data.summary_queue (press_release_id) VALUES (new_id)
+    ON CONFLICT (press_release_id) DO NOTHING;
+    RETURN NEW;
+END $$;
+
+CREATE OR REPLACE TRIGGER press_releases_register
+    BEFORE INSERT ON raw_data.press_releases
+    FOR EACH ROW EXECUTE FUNCTION raw_data.register_press_release();
+
+-- Create the partition for one month, moving any of its rows out of the
+-- default partition first so the attach does not fail
+CREATE OR REPLACE FUNCTION raw_data.create_press_release_partition(month DATE) RETURNS BOOLEAN
+LANGUAGE plpgsql AS $$
+DECLARE
+    start_at DATE := date_trunc('month', month)::date;
+    end_at DATE := (date_trunc('month', month) + INTERVAL '1 month')::date;
+    part_name TEXT := 'press_releases_' || to_char(month, '"y"YYYY"m"MM');
+    columns TEXT;
+BEGIN
+    IF to_regclass('raw_data.' || part_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+    -- Generated columns (the search vector) are recomputed, not copied
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO columns
+    FROM pg_attribute
+    WHERE attrelid = 'raw_data.press_releases'::regclass AND attnum > 0
+      AND NOT attisdropped AND attgenerated = '';
+    EXECUTE format('CREATE TABLE raw_data.%I (LIKE raw_data.press_releases INCLUDING DEFAULTS INCLUDING GENERATED)', part_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM raw_data.press_releases_undated
+                        WHERE published_at >= %L AND published_at < %L RETURNING *)
+         INSERT INTO raw_data.%I (%s) SELECT %s FROM moved', start_at, end_at, part_name, columns, columns);
+    EXECUTE format(
+        'ALTER TABLE raw_data.press_releases ATTACH PARTITION raw_data.%I FOR VALUES FROM (%L) TO (%L)',
+        part_name, start_at, end_at);
+    RETURN TRUE;
+END $$;
+
+CREATE OR REPLACE FUNCTION raw_data.ensure_press_release_partitions(from_month DATE, to_month DATE) RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    month DATE;
+    created INTEGER := 0;
+BEGIN
+    FOR month IN SELECT generate_series(date_trunc('month', from_month), date_trunc('month', to_month), INTERVAL '1 month')::date LOOP
+        IF raw_data.create_press_release_partition(month) THEN
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END $$;
 
-CREATE INDEX idx_url_hash ON raw_data.press_releases(url_hash);
-CREATE INDEX idx_created_at ON raw_data.press_releases(created_at DESC);
+-- Give every dated release that landed in the default partition its own month
+CREATE OR REPLACE FUNCTION raw_data.split_undated_press_releases() RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    month DATE;
+    created INTEGER := 0;
+BEGIN
+    FOR month IN SELECT DISTINCT date_trunc('month', published_at)::date
+                 FROM raw_data.press_releases_undated WHERE published_at IS NOT NULL LOOP
+        IF raw_data.create_press_release_partition(month) THEN
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END $$;
+
+-- Partitions for last month through two months ahead; the pipeline extends these on every run
+SELECT raw_data.ensure_press_release_partitions((CURRENT_DATE - INTERVAL '1 month')::date,
+                                                (CURRENT_DATE + INTERVAL '2 months')::date);
 
 -- Create table for press release summaries
 CREATE TABLE IF NOT EXISTS raw_data.press_release_summary (
     id SERIAL PRIMARY KEY,
-    press_release_id INTEGER REFERENCES raw_data.press_releases(id) UNIQUE,
+    press_release_id INTEGER REFERENCES raw_data.press_release_keys(id) UNIQUE,
     summary TEXT NOT NULL,
     bullet_points JSONB,
     word_count INTEGER,
     model_used VARCHAR(100),
     summarized_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    reused_from INTEGER REFERENCES raw_data.press_release_keys(id)
 );
 
 CREATE INDEX idx_press_release_id ON raw_data.press_release_summary(press_release_id);
+
+-- Content fingerprints: exact hash plus SimHash band indexes (src/resources/fingerprint.py)
+ALTER TABLE raw_data.press_releases
+    ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS simhash BIGINT;
+ALTER TABLE raw_data.press_release_keys
+    ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS simhash BIGINT;
+CREATE INDEX IF NOT EXISTS idx_press_release_keys_content_hash
+    ON raw_data.press_release_keys (content_hash);
+CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band0
+    ON raw_data.press_release_keys (((simhash >> 48) & 65535));
+CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band1
+    ON raw_data.press_release_keys (((simhash >> 32) & 65535));
+CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band2
+    ON raw_data.press_release_keys (((simhash >> 16) & 65535));
+CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band3
+    ON raw_data.press_release_keys ((simhash & 65535));
+
+-- Full-text search vectors, generated on every insert/update (src/resources/search.py)
+ALTER TABLE raw_data.press_releases ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(content, '')), 'C')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_press_releases_search
+    ON raw_data.press_releases USING GIN (search_vector);
+ALTER TABLE raw_data.press_release_summary ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (setweight(to_tsvector('english', summary), 'B')) STORED;
+CREATE INDEX IF NOT EXISTS idx_press_release_summary_search
+    ON raw_data.press_release_summary USING GIN (search_vector);
+
+-- Summarization work queue; workers claim rows with FOR UPDATE SKIP LOCKED
+CREATE TABLE IF NOT EXISTS raw_data.summary_queue (
+    press_release_id INTEGER PRIMARY KEY REFERENCES raw_data.press_release_keys(id),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by VARCHAR(200),
+    lease_expires_at TIMESTAMP,
+    last_error TEXT,
+    enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_queue_claimable ON raw_data.summary_queue (status, lease_expires_at);
+COMMENT ON TABLE raw_data.summary_queue IS 'Queued on insert by register_press_release';
+
+-- Summaries by model, prompt version and normalized content hash (src/resources/summary_cache.py)
+CREATE TABLE IF NOT EXISTS raw_data.summary_cache (
+    model VARCHAR(100) NOT NULL,
+    prompt_version VARCHAR(20) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    summary TEXT NOT NULL,
+    bullet_points JSONB,
+    word_count INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model, prompt_version, content_hash)
+);
+
+-- LLM telemetry per generated summary (src/resources/summary_metrics.py)
+CREATE TABLE IF NOT EXISTS raw_data.summary_metrics (
+    id BIGSERIAL PRIMARY KEY,
+    press_release_id INTEGER REFERENCES raw_data.press_release_keys(id),
+    run_id VARCHAR(64),
+    model VARCHAR(100),
+    endpoint VARCHAR(255),
+    latency_ms REAL,
+    total_duration_ms REAL,
+    load_duration_ms REAL,
+    prompt_eval_count INTEGER,
+    prompt_eval_duration_ms REAL,
+    eval_count INTEGER,
+    eval_duration_ms REAL,
+    stopped_early BOOLEAN,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_metrics_model_recorded
+    ON raw_data.summary_metrics (model, recorded_at);
+
+-- Trigger-maintained totals read by /stats and the assets (src/resources/stats_rollup.py)
+CREATE TABLE IF NOT EXISTS raw_data.release_stats (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    total_releases BIGINT NOT NULL DEFAULT 0,
+    total_summarized BIGINT,
+    oldest_release TIMESTAMP,
+    newest_release TIMESTAMP,
+    last_scraped TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS raw_data.release_daily_counts (
+    day DATE PRIMARY KEY,
+    releases INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION raw_data.rollup_release_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE raw_data.release_stats s
+    SET total_releases = s.total_releases + n.cnt,
+        oldest_release = LEAST(s.oldest_release, n.oldest),
+        newest_release = GREATEST(s.newest_release, n.newest),
+        last_scraped = GREATEST(s.last_scraped, n.last_scraped)
+    FROM (
+        SELECT COUNT(*) AS cnt, MIN(published_at) AS oldest,
+               MAX(published_at) AS newest, MAX(scraped_at) AS last_scraped
+        FROM new_rows
+    ) n
+    WHERE n.cnt > 0;
+
+    INSERT INTO raw_data.release_daily_counts (day, releases)
+    SELECT published_at::date, COUNT(*) FROM new_rows
+    WHERE published_at IS NOT NULL
+    GROUP BY 1
+    ON CONFLICT (day) DO UPDATE SET releases = raw_data.release_daily_counts.releases + EXCLUDED.releases;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION raw_data.rollup_release_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE raw_data.release_stats s
+    SET total_releases = s.total_releases - (SELECT COUNT(*) FROM old_rows);
+
+    UPDATE raw_data.release_daily_counts d
+    SET releases = d.releases - o.cnt
+    FROM (
+        SELECT published_at::date AS day, COUNT(*) AS cnt FROM old_rows
+        WHERE published_at IS NOT NULL GROUP BY 1
+    ) o
+    WHERE d.day = o.day;
+    DELETE FROM raw_data.release_daily_counts WHERE releases <= 0;
+
+    PERFORM raw_data.rollup_release_bounds();
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION raw_data.rollup_release_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    -- Only publication dates move between days; totals are unchanged
+    UPDATE raw_data.release_daily_counts d
+    SET releases = d.releases - o.cnt
+    FROM (
+        SELECT published_at::date AS day, COUNT(*) AS cnt FROM old_rows
+        WHERE published_at IS NOT NULL GROUP BY 1
+    ) o
+    WHERE d.day = o.day;
+
+    INSERT INTO raw_data.release_daily_counts (day, releases)
+    SELECT published_at::date, COUNT(*) FROM new_rows
+    WHERE published_at IS NOT NULL
+    GROUP BY 1
+    ON CONFLICT (day) DO UPDATE SET releases = raw_data.release_daily_counts.releases + EXCLUDED.releases;
+    DELETE FROM raw_data.release_daily_counts WHERE releases <= 0;
+
+    PERFORM raw_data.rollup_release_bounds();
+    RETURN NULL;
+END $$;
+
+-- Oldest and newest dates cannot be decremented, so they are re-read
+-- through the per-partition published_at indexes after deletes and updates
+CREATE OR REPLACE FUNCTION raw_data.rollup_release_bounds() RETURNS void
+LANGUAGE sql AS $$
+    UPDATE raw_data.release_stats
+    SET oldest_release = (SELECT MIN(published_at) FROM raw_data.press_releases),
+        newest_release = (SELECT MAX(published_at) FROM raw_data.press_releases),
+        last_scraped = (SELECT MAX(scraped_at) FROM raw_data.press_releases);
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_press_releases_scraped_at
+    ON raw_data.press_releases (scraped_at);
+
+CREATE OR REPLACE TRIGGER press_releases_rollup_insert
+    AFTER INSERT ON raw_data.press_releases
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_release_insert();
+CREATE OR REPLACE TRIGGER press_releases_rollup_delete
+    AFTER DELETE ON raw_data.press_releases
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_release_delete();
+CREATE OR REPLACE TRIGGER press_releases_rollup_update
+    AFTER UPDATE ON raw_data.press_releases
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_release_update();
+
+-- First run only: seed the rollup from a full scan, with writers blocked
+-- so no insert falls between the scan and the triggers
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM raw_data.release_stats) THEN
+        LOCK TABLE raw_data.press_releases IN SHARE ROW EXCLUSIVE MODE;
+        INSERT INTO raw_data.release_stats (total_releases, oldest_release, newest_release, last_scraped)
+        SELECT COUNT(*), MIN(published_at), MAX(published_at), MAX(scraped_at)
+        FROM raw_data.press_releases
+        ON CONFLICT (id) DO NOTHING;
+        INSERT INTO raw_data.release_daily_counts (day, releases)
+        SELECT published_at::date, COUNT(*) FROM raw_data.press_releases
+        WHERE published_at IS NOT NULL
+        GROUP BY 1
+        ON CONFLICT (day) DO NOTHING;
+    END IF;
+END $$;
+
+CREATE OR REPLACE FUNCTION raw_data.rollup_summary_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE raw_data.release_stats SET total_summarized = total_summarized + (SELECT COUNT(*) FROM new_rows);
+    ELSE
+        UPDATE raw_data.release_stats SET total_summarized = total_summarized - (SELECT COUNT(*) FROM old_rows);
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE TRIGGER press_release_summary_rollup_insert
+    AFTER INSERT ON raw_data.press_release_summary
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_summary_change();
+CREATE OR REPLACE TRIGGER press_release_summary_rollup_delete
+    AFTER DELETE ON raw_data.press_release_summary
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_summary_change();
+
+DO $$
+BEGIN
+    IF (SELECT total_summarized IS NULL FROM raw_data.release_stats) THEN
+        LOCK TABLE raw_data.press_release_summary IN SHARE ROW EXCLUSIVE MODE;
+        UPDATE raw_data.release_stats
+        SET total_summarized = (SELECT COUNT(*) FROM raw_data.press_release_summary)
+        WHERE total_summarized IS NULL;
+    END IF;
+END $$;
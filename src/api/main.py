@@ -1,11 +1,14 @@
 import os
-from datetime import datetime
+from datetime import datetime, date
 from typing import List, Optional
 from fastapi import FastAPI, Query, HTTPException
 from pydantic import BaseModel
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from src.resources.search import search_releases
+from src.resources.stats_rollup import read_stats
+
 app = FastAPI(title="Press Releases API", version="1.0.0")
 
 
@@ -22,6 +25,17 @@ class ReleasesResponse(BaseModel):
     limit: int
 
 
+class SearchResult(PressRelease):
+    snippet: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    results: List[SearchResult]
+    query: str
+    limit: int
+
+
 def get_db_connection():
     return psycopg2.connect(
         host=os.getenv("POSTGRES_HOST", "postgres"),
@@ -58,8 +72,13 @@ def get_releases(limit: int = Query(default=20, ge=1, le=100)):
                 
                 rows = cursor.fetchall()
                 
-                cursor.execute("SELECT COUNT(*) FROM raw_data.press_releases")
-                total = cursor.fetchone()['count']
+                with conn.cursor() as rollup_cursor:
+                    stats = read_stats(rollup_cursor)
+                if stats is None:
+                    cursor.execute("SELECT COUNT(*) FROM raw_data.press_releases")
+                    total = cursor.fetchone()['count']
+                else:
+                    total = stats['total_releases']
                 
                 releases = []
                 for row in rows:
@@ -95,24 +114,62 @@ def get_releases(limit: int = Query(default=20, ge=1, le=100)):
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@app.get("/search", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: int = Query(default=20, ge=1, le=100)
+):
+    if since and until and since > until:
+        raise HTTPException(status_code=400, detail="since must not be after until")
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                rows = search_releases(cursor, q, since=since, until=until, limit=limit)
+        
+        return SearchResponse(
+            results=[
+                SearchResult(
+                    title=row['title'] or "No title",
+                    date=row['published_at'].strftime("%Y-%m-%d") if row['published_at'] else "Unknown",
+                    url=row['url'],
+                    summary=row['summary'],
+                    snippet=row['snippet'] or "",
+                    rank=row['rank']
+                )
+                for row in rows
+            ],
+            query=q,
+            limit=limit
+        )
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
 @app.get("/stats")
 def get_stats():
     try:
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_releases,
-                        COUNT(DISTINCT prs.id) as total_summarized,
-                        MIN(pr.published_at) as oldest_release,
-                        MAX(pr.published_at) as newest_release,
-                        MAX(pr.scraped_at) as last_scraped
-                    FROM raw_data.press_releases pr
-                    LEFT JOIN raw_data.press_release_summary prs 
-                        ON pr.id = prs.press_release_id
-                """)
-                
-                stats = cursor.fetchone()
+                # O(1) read of the trigger-maintained rollup; a full scan only
+                # before the pipeline has created it
+                with conn.cursor() as rollup_cursor:
+                    stats = read_stats(rollup_cursor)
+                if stats is None:
+                    cursor.execute("""
+                        SELECT 
+                            COUNT(*) as total_releases,
+                            COUNT(DISTINCT prs.id) as total_summarized,
+                            MIN(pr.published_at) as oldest_release,
+                            MAX(pr.published_at) as newest_release,
+                            MAX(pr.scraped_at) as last_scraped
+                        FROM raw_data.press_releases pr
+                        LEFT JOIN raw_data.press_release_summary prs 
+                            ON pr.id = prs.press_release_id
+                    """)
+                    stats = cursor.fetchone()
                 
                 return {
                     "total_releases": stats['total_releases'],
@@ -1,9 +1,36 @@
 import os
 import json
+import time
+import queue
 import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import ExitStack
 from datetime import datetime
 from dagster import asset, AssetExecutionContext, MaterializeResult
 
+from src.resources.archive import get_html_archive
+from src.resources.batch_writer import BatchedWriter
+from src.resources.fingerprint import ensure_fingerprints, fingerprint
+from src.resources.parsers import timed_parse
+from src.resources.release_storage import ensure_release_storage, split_undated
+from src.resources.resilience import CIRCUIT_OPEN
+from src.resources.search import ensure_release_search
+from src.resources.stats_rollup import ensure_release_rollup, read_stats
+
+
+def _known_urls(postgres, urls):
+    """Return the subset of urls already stored (or archived), matched by url_hash."""
+    hashes = {hashlib.sha256(url.encode()).hexdigest(): url for url in urls}
+    with postgres.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT url_hash FROM raw_data.press_release_keys WHERE url_hash = ANY(%s)",
+                (list(hashes),)
+            )
+            return {hashes[row[0]] for row in cursor.fetchall() if row[0] in hashes}
+
 
 @asset(
     required_resource_keys={"postgres", "scraper"}
@@ -17,22 +44,15 @@ def raw_press_releases(context: AssetExecutionContext) -> MaterializeResult:
     
     with postgres.get_connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute("""
-                CREATE SCHEMA IF NOT EXISTS raw_data;
-                CREATE TABLE IF NOT EXISTS raw_data.press_releases (
-                    id SERIAL PRIMARY KEY,
-                    url VARCHAR(500) UNIQUE NOT NULL,
-                    url_hash VARCHAR(64) NOT NULL,
-                    title TEXT,
-                    content TEXT,
-                    published_at TIMESTAMP,
-                    raw_response JSONB,
-                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
+            partitions_created = ensure_release_storage(cursor)
+            ensure_fingerprints(cursor)
+            ensure_release_search(cursor)
+            ensure_release_rollup(cursor)
     
-    urls = scraper.get_sec_urls(limit=scraper_limit)
+    urls = scraper.get_sec_urls(
+        limit=scraper_limit,
+        known_urls=lambda page_urls: _known_urls(postgres, page_urls)
+    )
     context.log.info(f"Found {len(urls)} URLs to process")
     
     if not urls:
@@ -40,76 +60,187 @@ def raw_press_releases(context: AssetExecutionContext) -> MaterializeResult:
             metadata={"message": "No URLs found"}
         )
     
-    existing = set()
-    with postgres.get_connection() as conn:
-        with conn.cursor() as cursor:
-            cursor.execute(
-                "SELECT url_hash FROM raw_data.press_releases WHERE url_hash = ANY(%s)",
-                ([hashlib.sha256(url.encode()).hexdigest() for url in urls],)
-            )
-            existing = {row[0] for row in cursor.fetchall()}
-    
-    new_urls = [url for url in urls if hashlib.sha256(url.encode()).hexdigest() not in existing]
+    existing = _known_urls(postgres, urls)
+    new_urls = [url for url in urls if url not in existing]
     context.log.info(f"Found {len(new_urls)} new URLs to scrape")
     
-    scraped = 0
     errors = 0
+    skipped = 0
+    archived = 0
+    archive = get_html_archive()
     
-    for url in new_urls:
+    # Three overlapping stages: fetch threads push pages into a bounded
+    # queue, a process pool parses them, and this thread writes results.
+    # A full queue blocks the fetchers, so memory stays flat on backfills.
+    concurrency = max(1, int(os.getenv("SCRAPER_CONCURRENCY", "4")))
+    parse_workers = max(0, int(os.getenv("SCRAPER_PARSE_WORKERS", "2")))
+    queue_size = max(1, int(os.getenv("SCRAPER_QUEUE_SIZE", "16")))
+    engine = os.getenv("PARSER_ENGINE", "bs4")
+    context.log.info(
+        f"Fetching with up to {concurrency} requests in flight, "
+        f"parsing with {parse_workers or 'inline'} workers"
+    )
+    
+    stage_seconds = {'fetch': 0.0, 'parse': 0.0, 'write': 0.0}
+    stage_lock = threading.Lock()
+    fetched = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+    
+    def fetch(url):
+        fetch_started = time.perf_counter()
         try:
             result = scraper.scrape_url(url)
-            
-            if result['success']:
-                parsed = scraper.parse_content(result['content'], url)
+        except Exception as e:
+            result = {'success': False, 'url': url, 'error': str(e)}
+        with stage_lock:
+            stage_seconds['fetch'] += time.perf_counter() - fetch_started
+        while not stopped.is_set():
+            try:
+                fetched.put((url, result), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    titles = {}
+    
+    def log_inserted(inserted_urls):
+        for url in inserted_urls:
+            context.log.info(f"✓ Scraped: {titles.pop(url, '')[:80]}...")
+    
+    writer = BatchedWriter(
+        postgres,
+        'raw_data.press_releases',
+        ('url', 'url_hash', 'title', 'content', 'published_at', 'raw_response', 'content_hash', 'simhash'),
+        # URL uniqueness is enforced by the press_release_keys registry trigger
+        conflict_target='',
+        returning='url',
+        on_inserted=log_inserted
+    )
+    
+    def write(url, result, parsed):
+        # Extract published date if available
+        published_at = parsed.get('published_at')
+        titles[url] = parsed['title'] or ''
+        content = parsed['content'][:5000] if parsed['content'] else 'No content'
+        # Lets the summarizer reuse summaries of republished or corrected releases
+        content_hash, simhash = fingerprint(content)
+        
+        writer.add((
+            url,
+            result['url_hash'],
+            parsed['title'][:500] if parsed['title'] else 'No title',
+            content,
+            published_at,  # This can be None if not found
+            json.dumps({
+                'url': url,
+                'scraped_at': result.get('scraped_at'),
+                'title': parsed['title'][:100] if parsed['title'] else None,
+                'published_at': published_at.isoformat() if published_at else None
+            }),
+            content_hash,
+            simhash
+        ))
+    
+    started = time.monotonic()
+    remaining = len(new_urls)
+    parsing = {}
+    
+    with ExitStack() as stack:
+        fetchers = stack.enter_context(ThreadPoolExecutor(max_workers=concurrency))
+        parsers = None
+        if parse_workers and new_urls:
+            # spawn, not fork: the fetch threads are already running
+            parsers = stack.enter_context(ProcessPoolExecutor(
+                max_workers=parse_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            ))
+        
+        for url in new_urls:
+            fetchers.submit(fetch, url)
+        # Release blocked fetchers and drop unstarted fetches if this thread fails mid-run
+        stack.callback(fetchers.shutdown, wait=False, cancel_futures=True)
+        stack.callback(stopped.set)
+        
+        while remaining or parsing:
+            # Hand fetched pages to the parsers while there is parse capacity
+            while remaining and len(parsing) < max(1, parse_workers) * 2:
+                try:
+                    url, result = fetched.get(timeout=None if not parsing else 0.05)
+                except queue.Empty:
+                    break
+                remaining -= 1
                 
-                # Extract published date if available
-                published_at = parsed.get('published_at')
+                if result.get('error_kind') == CIRCUIT_OPEN:
+                    # Remaining fetches are refused without a request, so the
+                    # queue drains quickly once the provider is down
+                    if not skipped:
+                        context.log.error("ScrapingBee circuit open, skipping the remaining pages this run")
+                    skipped += 1
+                    continue
                 
-                with postgres.get_connection() as conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute("""
-                            INSERT INTO raw_data.press_releases 
-                            (url, url_hash, title, content, published_at, raw_response)
-                            VALUES (%s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (url) DO NOTHING
-                            RETURNING id
-                        """, (
-                            url,
-                            result['url_hash'],
-                            parsed['title'][:500] if parsed['title'] else 'No title',
-                            parsed['content'][:5000] if parsed['content'] else 'No content',
-                            published_at,  # This can be None if not found
-                            json.dumps({
-                                'url': url,
-                                'scraped_at': result.get('scraped_at'),
-                                'title': parsed['title'][:100] if parsed['title'] else None,
-                                'published_at': published_at.isoformat() if published_at else None
-                            })
-                        ))
-                        
-                        inserted_id = cursor.fetchone()
-                        if inserted_id:
-                            scraped += 1
-                            context.log.info(f"✓ Scraped: {parsed['title'][:80]}...")
-            else:
-                errors += 1
-                context.log.error(f"Failed to scrape {url}: {result.get('error')}")
+                if not result['success']:
+                    errors += 1
+                    context.log.error(f"Failed to scrape {url}: {result.get('error')}")
+                    continue
                 
-        except Exception as e:
-            errors += 1
-            context.log.error(f"Exception for {url}: {str(e)}")
+                try:
+                    if archive and archive.put(result['url_hash'], result['content']):
+                        archived += 1
+                except OSError as e:
+                    context.log.warning(f"Could not archive {url}: {str(e)}")
+                
+                if parsers:
+                    future = parsers.submit(timed_parse, result['content'], url, engine)
+                    parsing[future] = (url, result)
+                else:
+                    try:
+                        parse_started = time.perf_counter()
+                        parsed = scraper.parse_content(result['content'], url)
+                        stage_seconds['parse'] += time.perf_counter() - parse_started
+                        write(url, result, parsed)
+                    except Exception as e:
+                        errors += 1
+                        context.log.error(f"Exception for {url}: {str(e)}")
+            
+            writer.flush_if_due()
+            if parsing:
+                done, _ = wait(parsing, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, result = parsing.pop(future)
+                    try:
+                        parsed, parse_elapsed = future.result()
+                        stage_seconds['parse'] += parse_elapsed
+                        write(url, result, parsed)
+                    except Exception as e:
+                        errors += 1
+                        context.log.error(f"Exception for {url}: {str(e)}")
+    
+    writer.flush()
+    scraped = writer.inserted
+    
+    # Backfilled releases from months without a partition land in the
+    # default partition; give them their own months now
+    with postgres.get_connection() as conn:
+        with conn.cursor() as cursor:
+            partitions_created += split_undated(cursor)
+    errors += writer.failed
+    stage_seconds['write'] = writer.write_seconds
+    
+    elapsed = time.monotonic() - started
+    pages_per_sec = len(new_urls) / elapsed if elapsed > 0 else 0.0
+    context.log.info(
+        f"Processed {len(new_urls)} pages in {elapsed:.1f}s ({pages_per_sec:.2f} pages/sec); "
+        f"fetch {stage_seconds['fetch']:.1f}s, parse {stage_seconds['parse']:.1f}s, "
+        f"write {stage_seconds['write']:.1f}s"
+    )
     
     # Get some statistics
     with postgres.get_connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) FROM raw_data.press_releases")
-            total_count = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM raw_data.press_releases 
-                WHERE published_at >= NOW() - INTERVAL '30 days'
-            """)
-            recent_count = cursor.fetchone()[0]
+            # Read from the trigger-maintained rollup instead of counting the table
+            stats = read_stats(cursor) or {'total_releases': 0, 'recent_releases': 0}
+            total_count = stats['total_releases']
+            recent_count = stats['recent_releases']
             
             cursor.execute("""
                 SELECT url, title, published_at 
@@ -130,7 +261,24 @@ def raw_press_releases(context: AssetExecutionContext) -> MaterializeResult:
             "total_urls": len(urls),
             "new_urls": len(new_urls),
             "scraped": scraped,
+            "skipped_existing": writer.skipped,
             "errors": errors,
+            "write_stats": writer.stats(),
+            "skipped_circuit_open": skipped,
+            "circuit_state": scraper.circuit_state(),
+            "archived": archived,
+            "partitions_created": partitions_created,
+            "concurrency": concurrency,
+            "parse_workers": parse_workers,
+            "wall_seconds": round(elapsed, 2),
+            "fetch_seconds": round(stage_seconds['fetch'], 2),
+            "parse_seconds": round(stage_seconds['parse'], 2),
+            "write_seconds": round(stage_seconds['write'], 2),
+            "pages_per_sec": round(pages_per_sec, 2),
+            "http_stats": scraper.http_stats(),
+            "cache_stats": scraper.cache_stats(),
+            "fetch_mode_stats": scraper.fetch_mode_stats(),
+            "db_pool_stats": postgres.pool_stats(),
             "total_in_db": total_count,
             "recent_releases": recent_count,
             "success_rate": f"{(scraped/len(new_urls)*100):.1f}%" if new_urls else "N/A"
@@ -1,6 +1,22 @@
+import os
 import json
+import time
+import socket
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED, FIRST_COMPLETED
 from dagster import asset, AssetExecutionContext, MaterializeResult
 
+from src.resources.batch_writer import BatchedWriter
+from src.resources.extractive import estimate_tokens, select_sentences
+from src.resources.fingerprint import find_summarized_duplicates
+from src.resources.llm import CONTENT_LIMIT, PROMPT_VERSION, summary_cache_key
+from src.resources.resilience import AdaptiveLimiter
+from src.resources.search import ensure_summary_search
+from src.resources.stats_rollup import ensure_release_rollup, ensure_summary_rollup, read_stats
+from src.resources.summary_cache import SummaryCache
+from src.resources.summary_metrics import COLUMNS as METRIC_COLUMNS, aggregate_metrics, ensure_summary_metrics, metrics_row
+from src.resources.summary_queue import SummaryQueue
+
 @asset(
     deps=["raw_press_releases"],
     required_resource_keys={"postgres", "llm"}
@@ -14,7 +30,7 @@ def press_release_summary(context: AssetExecutionContext) -> MaterializeResult:
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS raw_data.press_release_summary (
                     id SERIAL PRIMARY KEY,
-                    press_release_id INTEGER REFERENCES raw_data.press_releases(id) UNIQUE,
+                    press_release_id INTEGER REFERENCES raw_data.press_release_keys(id) UNIQUE,
                     summary TEXT NOT NULL,
                     bullet_points JSONB,
                     word_count INTEGER,
@@ -22,21 +38,19 @@ def press_release_summary(context: AssetExecutionContext) -> MaterializeResult:
                     summarized_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
+                ALTER TABLE raw_data.press_release_summary
+                    ADD COLUMN IF NOT EXISTS reused_from INTEGER REFERENCES raw_data.press_release_keys(id);
             """)
+            ensure_summary_search(cursor)
+            ensure_release_rollup(cursor)
+            ensure_summary_rollup(cursor)
+            ensure_summary_metrics(cursor)
     
-    with postgres.get_connection() as conn:
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT pr.id, pr.title, pr.content 
-                FROM raw_data.press_releases pr
-                LEFT JOIN raw_data.press_release_summary prs 
-                    ON pr.id = prs.press_release_id
-                WHERE prs.id IS NULL
-                ORDER BY pr.created_at DESC
-            """)
-            unsummarized = cursor.fetchall()
-    
-    total_to_process = len(unsummarized)
+    # Work is claimed from a leased queue, so overlapping runs never
+    # summarize the same release twice
+    queue = SummaryQueue(postgres, worker_id=f"{socket.gethostname()}:{os.getpid()}:{context.run_id[:8]}")
+    queue.ensure_table()
+    total_to_process = queue.claimable_count()
     context.log.info(f"Found {total_to_process} press releases to summarize")
     
     if total_to_process == 0:
@@ -60,66 +74,246 @@ def press_release_summary(context: AssetExecutionContext) -> MaterializeResult:
             }
         )
     
-    summarized = 0
+    # Loading the model on a cold Ollama takes longer than a summary's read
+    # timeout; load it up front, and keep_alive holds it until the next run
+    warm_up = llm.warm_up()
+    if not warm_up['loaded']:
+        context.log.warning(f"Model preload failed, continuing: {warm_up['error']}")
+    
+    # Releases whose title and content were summarized before by this model
+    # and prompt are served from the cache instead of Ollama
+    cache = SummaryCache(postgres, model=os.getenv("LLM_MODEL", "qwen2.5:0.5b"), prompt_version=PROMPT_VERSION)
+    cache.ensure_table()
+    invalidated = cache.invalidate_stale()
+    if invalidated:
+        context.log.info(f"Invalidated {invalidated} cached summaries from another model or prompt version")
+    
+    processed = 0
     errors = 0
+    reused = 0
+    reuse_distance = int(os.getenv("SUMMARY_REUSE_MAX_DISTANCE", "3"))
+    writer = BatchedWriter(
+        postgres,
+        'raw_data.press_release_summary',
+        ('press_release_id', 'summary', 'bullet_points', 'word_count', 'model_used', 'reused_from'),
+        conflict_target='(press_release_id)',
+        returning='press_release_id',
+        on_flushed=lambda rows: queue.complete([row[0] for row in rows])
+    )
+    
+    # One row of LLM telemetry per generated summary, next to the summaries
+    metrics_writer = BatchedWriter(
+        postgres,
+        'raw_data.summary_metrics',
+        METRIC_COLUMNS,
+        conflict_target='',
+        returning='id'
+    )
+    
+    # Each Ollama serves OLLAMA_NUM_PARALLEL requests at once; "auto" finds how
+    # many in-flight requests the endpoint pool takes before they start queueing
+    concurrency = os.getenv("SUMMARY_CONCURRENCY", "1")
+    if concurrency == "auto":
+        endpoints = llm.endpoint_count()
+        max_concurrency = os.getenv("SUMMARY_MAX_CONCURRENCY") or 8 * endpoints
+        limiter = AdaptiveLimiter(endpoints, 1, int(max_concurrency))
+    else:
+        fixed = max(1, int(concurrency))
+        limiter = AdaptiveLimiter(fixed, fixed, fixed)
+    context.log.info(f"Summarizing with up to {limiter.max_limit} requests in flight ({concurrency})")
     
-    batch_size = 10
-    for i in range(0, total_to_process, batch_size):
-        batch = unsummarized[i:i + batch_size]
-        batch_end = min(i + batch_size, total_to_process)
-        context.log.info(f"Processing batch {i//batch_size + 1}: items {i+1}-{batch_end} of {total_to_process}")
-        
-        for release_id, title, content in batch:
+    def summarize(title, content):
+        started = time.perf_counter()
+        result = None
+        try:
+            result = llm.summarize(content or "", title or "")
+            return result
+        finally:
+            # LLMResource reports failures as a 'failed' placeholder summary
+            limiter.release(
+                time.perf_counter() - started,
+                ok=result is not None and result.get('model_used') != 'failed'
+            )
+    
+    in_flight = {}
+    streamed = []
+    timed = []
+    metrics = []
+    
+    def collect(block):
+        """Write finished summaries; results are only ever handled on this thread."""
+        nonlocal processed, errors
+        if not in_flight:
+            return
+        done, _ = wait(in_flight, timeout=None if block else 0,
+                       return_when=ALL_COMPLETED if block else FIRST_COMPLETED)
+        for future in done:
+            release_id, cache_key = in_flight.pop(future)
+            processed += 1
             try:
-                result = llm.summarize(content or "", title or "")
-                
+                result = future.result()
+                # LLMResource returns a placeholder instead of raising; the
+                # release goes back to the queue rather than keeping it
+                if result['model_used'] == 'failed':
+                    raise Exception(result.get('error') or "Summary generation failed")
+                if 'stopped_early' in result:
+                    streamed.append(result)
+                if 'generate_ms' in result:
+                    timed.append(result)
+                if 'metrics' in result:
+                    metrics.append(result['metrics'])
+                    metrics_writer.add(metrics_row(release_id, context.run_id, result))
+                writer.add((
+                    release_id,
+                    result['summary'],
+                    json.dumps(result['bullet_points']),
+                    result['word_count'],
+                    result['model_used'],
+                    None
+                ))
+            except Exception as e:
+                errors += 1
+                queue.fail(release_id, str(e))
+                context.log.error(f"Error summarizing release ID {release_id}: {str(e)}")
+            else:
+                cache.put(cache_key, result)
+    
+    # Prompts carry the most informative sentences within a token budget
+    # instead of the first CONTENT_LIMIT characters; 0 keeps the old cut
+    token_budget = int(os.getenv("SUMMARY_TOKEN_BUDGET", "200"))
+    fetch_size = int(os.getenv("SUMMARY_FETCH_SIZE", "10"))
+    selection = {'items': 0, 'tokens_before': 0, 'tokens_after': 0, 'seconds': 0.0}
+    
+    batch_size = int(os.getenv("SUMMARY_CLAIM_SIZE", "10"))
+    batch_number = 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=limiter.max_limit) as pool:
+        while True:
+            claimed = queue.claim(batch_size)
+            if not claimed:
+                break
+            batch_number += 1
+            context.log.info(f"Processing batch {batch_number}: {len(claimed)} claimed releases")
+            
+            # Republished or corrected releases take the summary of their nearest
+            # already-summarized duplicate instead of another Ollama call
+            duplicates = {}
+            if reuse_distance >= 0:
                 with postgres.get_connection() as conn:
                     with conn.cursor() as cursor:
-                        cursor.execute("""
-                            INSERT INTO raw_data.press_release_summary 
-                            (press_release_id, summary, bullet_points, word_count, model_used)
-                            VALUES (%s, %s, %s, %s, %s)
-                            ON CONFLICT (press_release_id) DO NOTHING
-                            RETURNING id
-                        """, (
+                        duplicates = find_summarized_duplicates(cursor, claimed, reuse_distance)
+            for release_id, duplicate in duplicates.items():
+                processed += 1
+                reused += 1
+                bullet_points = duplicate['bullet_points']
+                writer.add((
+                    release_id,
+                    duplicate['summary'],
+                    bullet_points if isinstance(bullet_points, str) else json.dumps(bullet_points),
+                    duplicate['word_count'],
+                    duplicate['model_used'],
+                    duplicate['source_id']
+                ))
+            
+            # Content is streamed a page at a time, and the next claim is taken
+            # while this one's requests are still in flight
+            rows = queue.iter_claimed([i for i in claimed if i not in duplicates])
+            while True:
+                page = list(islice(rows, fetch_size))
+                if not page:
+                    break
+                contents = [content for _, _, content in page]
+                if token_budget > 0:
+                    selecting = time.perf_counter()
+                    excerpts = select_sentences(contents, token_budget)
+                    selection['seconds'] += time.perf_counter() - selecting
+                else:
+                    excerpts = contents
+                selection['items'] += len(page)
+                selection['tokens_before'] += sum(estimate_tokens((c or '')[:CONTENT_LIMIT]) for c in contents)
+                selection['tokens_after'] += sum(estimate_tokens((e or '')[:CONTENT_LIMIT]) for e in excerpts)
+                
+                for (release_id, title, _), excerpt in zip(page, excerpts):
+                    cache_key = summary_cache_key(excerpt, title)
+                    cached = cache.get(cache_key)
+                    if cached:
+                        processed += 1
+                        writer.add((
                             release_id,
-                            result['summary'],
-                            json.dumps(result['bullet_points']),
-                            result['word_count'],
-                            result['model_used']
+                            cached['summary'],
+                            json.dumps(cached['bullet_points']),
+                            cached['word_count'],
+                            cached['model_used'],
+                            None
                         ))
-                        
-                        if cursor.fetchone():
-                            summarized += 1
-                        
-            except Exception as e:
-                errors += 1
-                context.log.error(f"Error summarizing release ID {release_id}: {str(e)}")
-        
-        progress_pct = round((i + len(batch)) / total_to_process * 100, 1)
-        context.log.info(f"Progress: {progress_pct}% complete ({summarized} summarized, {errors} errors)")
+                        continue
+                    limiter.acquire()
+                    in_flight[pool.submit(summarize, title, excerpt)] = (release_id, cache_key)
+                    collect(block=False)
+            collect(block=False)
+            
+            context.log.info(
+                f"Progress: {processed} processed ({writer.inserted} summarized, {reused} reused, "
+                f"{cache.memory_hits + cache.db_hits} cached, "
+                f"{errors} errors, {len(in_flight)} in flight, limit {limiter.limit})"
+            )
+        collect(block=True)
+    elapsed = time.monotonic() - started
+    first_bullet = [r['first_bullet_ms'] for r in streamed if r['first_bullet_ms'] is not None]
+    loads = [r['load_ms'] for r in timed if r['load_ms'] > 0]
+    
+    metrics_writer.flush()
+    writer.flush()
+    summarized = writer.inserted
+    errors += writer.failed
     
     with postgres.get_connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) FROM raw_data.press_release_summary")
-            total_summaries = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM raw_data.press_releases pr
-                LEFT JOIN raw_data.press_release_summary prs 
-                    ON pr.id = prs.press_release_id
-                WHERE prs.id IS NULL
-            """)
-            remaining_unsummarized = cursor.fetchone()[0]
+            # Read from the trigger-maintained rollup instead of an anti-join
+            stats = read_stats(cursor) or {'total_summarized': 0, 'unsummarized': 0}
+            total_summaries = stats['total_summarized']
+            remaining_unsummarized = stats['unsummarized']
     
     return MaterializeResult(
         metadata={
-            "processed": total_to_process,
+            "processed": processed,
             "summarized": summarized,
+            "skipped_existing": writer.skipped,
+            "reused_summaries": reused,
+            "summary_cache": cache.stats(),
+            "prompt_selection": {
+                "token_budget": token_budget,
+                "items": selection['items'],
+                "avg_tokens_before": round(selection['tokens_before'] / selection['items'], 1) if selection['items'] else None,
+                "avg_tokens_after": round(selection['tokens_after'] / selection['items'], 1) if selection['items'] else None,
+                "select_ms_per_item": round(selection['seconds'] * 1000 / selection['items'], 2) if selection['items'] else None
+            },
             "errors": errors,
+            "write_stats": writer.stats(),
+            "llm_concurrency": limiter.stats(),
+            "wall_seconds": round(elapsed, 2),
+            "llm_streaming": {
+                "streamed": len(streamed),
+                "stopped_early": sum(1 for r in streamed if r['stopped_early']),
+                "avg_first_bullet_ms": round(sum(first_bullet) / len(first_bullet), 1) if first_bullet else None,
+                "max_first_bullet_ms": max(first_bullet, default=None)
+            },
+            "llm_timing": {
+                "keep_alive": warm_up['keep_alive'],
+                "warm_up_loaded": warm_up['loaded'],
+                "warm_up_load_ms": warm_up['load_ms'],
+                "timed_requests": len(timed),
+                "requests_with_load": len(loads),
+                "load_ms_total": round(sum(loads), 1),
+                "avg_generate_ms": round(sum(r['generate_ms'] for r in timed) / len(timed), 1) if timed else None
+            },
             "total_summaries_in_db": total_summaries,
             "remaining_unsummarized": remaining_unsummarized,
-            "success_rate": f"{round(summarized/total_to_process*100, 1)}%" if total_to_process > 0 else "N/A"
+            "http_stats": llm.http_stats(),
+            "llm_endpoints": llm.endpoint_stats(),
+            "llm_metrics": dict(aggregate_metrics(metrics), recorded=metrics_writer.inserted),
+            "db_pool_stats": postgres.pool_stats(),
+            "queue_stats": queue.stats(),
+            "success_rate": f"{round(summarized/processed*100, 1)}%" if processed > 0 else "N/A"
         }
     )
@@ -0,0 +1,471 @@
+"""Local stand-ins for ScrapingBee and Ollama, for offline load tests.
+
+One server answers ScrapingBee's ``/api/v1/``, Ollama's ``/api/tags`` and
+``/api/generate`` and the OpenAI-compatible ``/v1/models`` and
+``/v1/chat/completions``. In replay mode (the default) responses come from a
+recordings directory, falling back to synthetic SEC listing and article pages
+and a canned summary. Generations asked for with ``stream`` (Ollama's default)
+are sent as NDJSON a token at a time. With ``--record`` requests are forwarded
+to the real services and saved for later replay. Latency, errors and Ollama's
+model load, generation and prompt evaluation time can be injected.
+
+    python -m src.benchmarks.fake_services [--port 8900] [--recordings DIR] [--record]
+        [--latency-ms 200] [--jitter-ms 50] [--error-rate 0.05] [--error-status 503]
+        [--generate-ms 100] [--ollama-parallel 4] [--prompt-ms-per-token 2] [--load-ms 3000]
+
+Point the pipeline at it with::
+
+    SCRAPER_API_URL=http://localhost:8900/api/v1/ OLLAMA_HOST=localhost OLLAMA_PORT=8900
+
+or, to spread summaries over several instances, ``LLM_ENDPOINTS=localhost:8900,localhost:8901``
+(``openai+http://localhost:8901/v1`` for the OpenAI-compatible API).
+"""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from src.resources.extractive import estimate_tokens
+
+LISTING_PAGE_SIZE = 25
+# Ollama unloads an idle model after five minutes unless asked otherwise
+DEFAULT_KEEP_ALIVE_SECONDS = 300.0
+_METRICS = ('total_duration', 'load_duration', 'prompt_eval_count', 'prompt_eval_duration', 'eval_count', 'eval_duration')
+
+
+class Recordings:
+    """Recorded responses stored as ``<directory>/<kind>/<key>.json``."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        return hashlib.sha256('\x00'.join(parts).encode()).hexdigest()
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, kind, f"{key}.json"), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, kind: str, key: str, entry: Dict[str, Any]):
+        path = os.path.join(self.directory, kind, f"{key}.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+
+def synthetic_listing(page: int) -> str:
+    """A listing page linking LISTING_PAGE_SIZE press releases, newest first."""
+    first = 999 - page * LISTING_PAGE_SIZE
+    rows = '\n'.join(
+        f'<div class="views-row"><a href="/newsroom/press-release/2025-{n}">Press release 2025-{n}</a></div>'
+        for n in range(first, max(first - LISTING_PAGE_SIZE, 0), -1)
+    )
+    return f'<html><body><div class="view-content">\n{rows}\n</div></body></html>'
+
+
+_RESPONDENTS = ('Northbridge Capital', 'Elm Street Advisers', 'Harbor Point Securities', 'Crestline Partners',
+                'Juniper Asset Management', 'Blue Mesa Holdings', 'Sterling Ridge LLC', 'Oakmont Brokerage')
+_CONDUCT = ('misleading investors about fees', 'unregistered securities offerings', 'insider trading ahead of a merger',
+            'cherry-picking profitable trades', 'failing to safeguard customer data', 'inflating reported revenue',
+            'recordkeeping failures involving off-channel communications', 'a fraudulent crypto asset scheme')
+_SENTENCES = (
+    "According to the SEC's order, {who} engaged in {what} between {start} and {end}.",
+    "The complaint alleges that {who} concealed the conduct from clients and auditors.",
+    "{who} agreed to pay a civil penalty of ${amount} million and to retain an independent consultant.",
+    "Without admitting or denying the findings, {who} consented to a cease-and-desist order.",
+    "The investigation was conducted by staff in the {office} Regional Office.",
+    "The SEC appreciates the assistance of the {agency} in this matter.",
+    "Investors harmed by {what} will receive distributions from a fair fund.",
+    "The litigation will be led by attorneys from the Division of Enforcement's {unit} Unit.",
+)
+
+
+def synthetic_article(url: str) -> str:
+    """An SEC-style article page, stable for a given URL.
+
+    Respondent, conduct and sentence order are drawn per URL, so bodies
+    differ the way real releases do rather than by a number or two.
+    """
+    number = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+    rng = random.Random(number)
+    day = rng.randint(1, 28)
+    who = rng.choice(_RESPONDENTS)
+    what = rng.choice(_CONDUCT)
+    paragraphs = '\n'.join(
+        "<p>" + ' '.join(
+            rng.choice(_SENTENCES).format(
+                who=who, what=what, amount=rng.randint(1, 90),
+                start=2015 + rng.randint(0, 4), end=2020 + rng.randint(0, 4),
+                office=rng.choice(('New York', 'Boston', 'Chicago', 'Denver', 'San Francisco')),
+                agency=rng.choice(('Department of Justice', 'FINRA', 'FBI', 'Ontario Securities Commission')),
+                unit=rng.choice(('Asset Management', 'Market Abuse', 'Crypto Assets and Cyber', 'Complex Financial Instruments'))
+            )
+            for _ in range(rng.randint(2, 4))
+        ) + f" (Release {number}, part {i}.)</p>"
+        for i in range(1, rng.randint(4, 9))
+    )
+    return f"""<html><head><title>SEC.gov | Press Release {number}</title></head><body><main>
+<article><h1 class="page-title">SEC Announces Enforcement Action {number}</h1>
+<time datetime="2025-03-{day:02d}T14:00:00Z">March {day}, 2025</time>
+<div class="field--name-body">
+{paragraphs}
+</div></article></main></body></html>"""
+
+
+def synthetic_summary(prompt: str) -> str:
+    title = re.search(r'^Title: (.*)$', prompt, re.MULTILINE)
+    subject = title.group(1) if title else 'The press release'
+    return (f"• {subject[:60]}\n"
+            "• The SEC found violations of federal securities laws\n"
+            "• A civil penalty was imposed\n\n"
+            "These points capture the key facts of the announcement.")
+
+
+def keep_alive_seconds(value) -> float:
+    """Seconds a ``keep_alive`` value ("20m", "300s", 600, -1) keeps the model loaded."""
+    if value is None:
+        return DEFAULT_KEEP_ALIVE_SECONDS
+    match = re.fullmatch(r'(-?\d+(?:\.\d+)?)(ms|s|m|h)?', str(value).strip())
+    if not match:
+        return DEFAULT_KEEP_ALIVE_SECONDS
+    seconds = float(match.group(1)) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, None: 1}[match.group(2)]
+    return float('inf') if seconds < 0 else seconds
+
+
+class FakeServices:
+    """Threaded HTTP server impersonating ScrapingBee and Ollama.
+
+    ``latency_ms`` +/- ``jitter_ms`` is added to every response, and a
+    fraction ``error_rate`` of requests is answered with ``error_status``.
+    Synthetic generations take ``generate_ms`` each on one of
+    ``ollama_parallel`` slots, so extra requests queue the way they do on
+    Ollama with ``OLLAMA_NUM_PARALLEL``; streamed generations spread that
+    time over their tokens and give up their slot when the client disconnects.
+    ``prompt_ms_per_token`` adds prompt evaluation time in proportion to the
+    prompt's length, as on a CPU-only Ollama. A model that is not loaded
+    takes ``load_ms`` to load (one load at a time) and then stays loaded for
+    the request's ``keep_alive``; an empty prompt only loads it.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, recordings: Optional[str] = None,
+                 record: bool = False, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: Optional[int] = None,
+                 scrapingbee_url: str = "https://app.scrapingbee.com/api/v1/",
+                 ollama_url: str = "http://localhost:11434", generate_ms: float = 0,
+                 ollama_parallel: int = 1, prompt_ms_per_token: float = 0, load_ms: float = 0):
+        if record and not recordings:
+            raise ValueError("Record mode needs a recordings directory")
+        self.recordings = Recordings(recordings) if recordings else None
+        self.record = record
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.scrapingbee_url = scrapingbee_url
+        self.ollama_url = ollama_url.rstrip('/')
+        self.generate_ms = generate_ms
+        self.prompt_ms_per_token = prompt_ms_per_token
+        self.load_ms = load_ms
+        self._load_lock = threading.Lock()
+        self._loaded_until = 0.0
+        self._generate_slots = threading.BoundedSemaphore(max(1, ollama_parallel))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'injected_errors': 0, 'replayed': 0, 'recorded': 0, 'synthetic': 0, 'cancelled': 0, 'loads': 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> 'FakeServices':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _delay_and_fail(self) -> bool:
+        """Apply injected latency; returns True if this request should fail."""
+        with self._lock:
+            self._stats['requests'] += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self._stats['injected_errors'] += 1
+        time.sleep(delay)
+        return fail
+
+    def _load_model(self, keep_alive) -> float:
+        """Load the model unless it is still loaded; returns the seconds loading took."""
+        with self._load_lock:
+            loaded = time.monotonic() < self._loaded_until
+            if not loaded:
+                self._count('loads')
+                time.sleep(self.load_ms / 1000)
+            self._loaded_until = time.monotonic() + keep_alive_seconds(keep_alive)
+        return 0.0 if loaded else self.load_ms / 1000
+
+    def scrapingbee(self, query: Dict[str, str], headers: Dict[str, str]) -> Dict[str, Any]:
+        url = query.get('url', '')
+        key = Recordings.key(url, query.get('render_js', 'false'))
+        if self.record:
+            response = requests.get(self.scrapingbee_url, params=query, headers=headers, timeout=(5, 90))
+            entry = {
+                'status': response.status_code,
+                'headers': {k: v for k, v in response.headers.items() if k.lower() in ('etag', 'last-modified', 'spb-etag', 'spb-last-modified', 'retry-after')},
+                'body': response.text
+            }
+            if response.status_code == 200:
+                self.recordings.put('scrapingbee', key, entry)
+                self._count('recorded')
+            return entry
+        entry = self.recordings.get('scrapingbee', key) if self.recordings else None
+        if entry:
+            self._count('replayed')
+            return entry
+        self._count('synthetic')
+        page = parse_qs(urlparse(url).query).get('page')
+        if page and page[0].isdigit():
+            return {'status': 200, 'headers': {}, 'body': synthetic_listing(int(page[0]))}
+        return {'status': 200, 'headers': {}, 'body': synthetic_article(url)}
+
+    def ollama_generate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        key = Recordings.key(payload.get('model', ''), payload.get('prompt', ''))
+        stream = payload.get('stream', True)
+        if not payload.get('prompt') and not self.record:
+            self._load_model(payload.get('keep_alive'))
+            return {'status': 200, 'headers': {}, 'body': json.dumps({
+                'model': payload.get('model', ''), 'response': '', 'done': True, 'done_reason': 'load'
+            })}
+        if self.record:
+            # Recordings hold whole generations, so they replay in either mode
+            response = requests.post(f"{self.ollama_url}/api/generate", json=dict(payload, stream=False), timeout=(5, 300))
+            entry = {'status': response.status_code, 'headers': {}, 'body': response.text}
+            if response.status_code == 200 and payload.get('prompt'):
+                self.recordings.put('ollama', key, entry)
+                self._count('recorded')
+            return self._as_stream(entry, paced=False) if stream else entry
+        entry = self.recordings.get('ollama', key) if self.recordings else None
+        if entry:
+            self._count('replayed')
+            return self._as_stream(entry, paced=False) if stream else entry
+        self._count('synthetic')
+        load_seconds = self._load_model(payload.get('keep_alive'))
+        prompt_seconds = self.prompt_ms_per_token * estimate_tokens(payload.get('prompt', '')) / 1000
+        summary = synthetic_summary(payload.get('prompt', ''))
+        entry = {'status': 200, 'headers': {}, 'body': json.dumps({
+            'model': payload.get('model', ''),
+            'response': summary,
+            'done': True,
+            'total_duration': int((load_seconds + prompt_seconds + self.generate_ms / 1000) * 1e9),
+            'load_duration': int(load_seconds * 1e9),
+            'prompt_eval_count': estimate_tokens(payload.get('prompt', '')),
+            'prompt_eval_duration': int(prompt_seconds * 1e9),
+            'eval_count': estimate_tokens(summary),
+            'eval_duration': int(self.generate_ms * 1e6)
+        })}
+        if stream:
+            return dict(self._as_stream(entry, paced=True), prompt_seconds=prompt_seconds)
+        if self.generate_ms or prompt_seconds:
+            with self._generate_slots:
+                time.sleep(prompt_seconds + self.generate_ms / 1000)
+        return entry
+
+    def openai_chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """An OpenAI-compatible chat completion, generated like an Ollama one."""
+        messages = payload.get('messages') or [{}]
+        entry = self.ollama_generate({
+            'model': payload.get('model', ''),
+            'prompt': messages[-1].get('content', ''),
+            'stream': payload.get('stream', False)
+        })
+        if entry['status'] != 200:
+            return entry
+        if 'chunks' in entry:
+            events = []
+            for chunk in map(json.loads, entry['chunks']):
+                events.append('data: ' + json.dumps({'choices': [{
+                    'index': 0,
+                    'delta': {'content': chunk['response']},
+                    'finish_reason': 'stop' if chunk['done'] else None
+                }]}) + '\n')
+            events.append('data: [DONE]\n')
+            return dict(entry, chunks=events, content_type='text/event-stream')
+        result = json.loads(entry['body'])
+        return dict(entry, body=json.dumps({
+            'model': result.get('model', ''),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': result.get('response', '')},
+                'finish_reason': 'stop'
+            }]
+        }))
+
+    def _as_stream(self, entry: Dict[str, Any], paced: bool) -> Dict[str, Any]:
+        """Split a whole generation into Ollama's one-token-per-line chunks."""
+        if entry['status'] != 200:
+            return entry
+        result = json.loads(entry['body'])
+        tokens = re.findall(r'\s*\S+', result.get('response', '')) or ['']
+        chunks = [json.dumps({'model': result.get('model', ''), 'response': token, 'done': False}) for token in tokens]
+        metrics = {name: result[name] for name in _METRICS if name in result}
+        chunks.append(json.dumps({'model': result.get('model', ''), 'response': '', 'done': True, **metrics}))
+        return {
+            'status': 200,
+            'headers': {},
+            'chunks': chunks,
+            'token_seconds': self.generate_ms / 1000 / len(tokens) if paced else 0
+        }
+
+    def _handler_class(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlparse(self.path)
+                if services._delay_and_fail():
+                    return self._send_error()
+                if parts.path.rstrip('/') == '/api/v1':
+                    query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                    forwarded = {k: v for k, v in self.headers.items() if k.lower().startswith('spb-')}
+                    return self._send(services.scrapingbee(query, forwarded), 'text/html')
+                if parts.path == '/api/tags':
+                    return self._send({'status': 200, 'headers': {}, 'body': json.dumps({'models': []})})
+                if parts.path == '/v1/models':
+                    return self._send({'status': 200, 'headers': {}, 'body': json.dumps({'object': 'list', 'data': []})})
+                self._send({'status': 404, 'headers': {}, 'body': 'Not found'})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                if services._delay_and_fail():
+                    return self._send_error()
+                path = urlparse(self.path).path
+                if path in ('/api/generate', '/v1/chat/completions'):
+                    if path == '/api/generate':
+                        entry = services.ollama_generate(payload)
+                    else:
+                        entry = services.openai_chat(payload)
+                    if 'chunks' in entry:
+                        return self._send_stream(entry)
+                    return self._send(entry)
+                self._send({'status': 404, 'headers': {}, 'body': 'Not found'})
+
+            def _send_error(self):
+                headers = {'Retry-After': '1'} if services.error_status == 429 else {}
+                self._send({'status': services.error_status, 'headers': headers, 'body': 'Injected error'})
+
+            def _send(self, entry, content_type='application/json'):
+                body = entry['body'].encode('utf-8')
+                self.send_response(entry['status'])
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in entry.get('headers', {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self, entry):
+                self.send_response(200)
+                self.send_header('Content-Type', entry.get('content_type', 'application/x-ndjson'))
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                paced = entry['token_seconds'] or entry.get('prompt_seconds')
+                slot = services._generate_slots if paced else contextlib.nullcontext()
+                with slot:
+                    time.sleep(entry.get('prompt_seconds', 0))
+                    try:
+                        for chunk in entry['chunks']:
+                            time.sleep(entry['token_seconds'])
+                            data = (chunk + '\n').encode('utf-8')
+                            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+                        self.wfile.write(b'0\r\n\r\n')
+                    except (BrokenPipeError, ConnectionResetError):
+                        # The client stopped reading: stop generating, like Ollama does
+                        services._count('cancelled')
+                        self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--recordings', help="Directory of recorded responses")
+    parser.add_argument('--record', action='store_true', help="Forward to the real services and save responses")
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests to fail")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, help="Seed for repeatable latency and error injection")
+    parser.add_argument('--generate-ms', type=float, default=0, help="Time per synthetic summary")
+    parser.add_argument('--ollama-parallel', type=int, default=1, help="Summaries generated at once")
+    parser.add_argument('--prompt-ms-per-token', type=float, default=0, help="Prompt evaluation time per prompt token")
+    parser.add_argument('--load-ms', type=float, default=0, help="Time to load the model when it is not loaded")
+    parser.add_argument('--ollama-url', default=f"http://{os.getenv('OLLAMA_HOST', 'localhost')}:{os.getenv('OLLAMA_PORT', '11434')}")
+    args = parser.parse_args(argv)
+
+    services = FakeServices(
+        host=args.host, port=args.port, recordings=args.recordings, record=args.record,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        error_status=args.error_status, seed=args.seed, ollama_url=args.ollama_url,
+        generate_ms=args.generate_ms, ollama_parallel=args.ollama_parallel,
+        prompt_ms_per_token=args.prompt_ms_per_token, load_ms=args.load_ms
+    )
+    print(f"Serving fake ScrapingBee and Ollama on http://{services.address} "
+          f"({'record' if args.record else 'replay'} mode)")
+    print(f"  SCRAPER_API_URL=http://{services.address}/api/v1/ "
+          f"OLLAMA_HOST={args.host} OLLAMA_PORT={services._server.server_address[1]}")
+    try:
+        services._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        services._server.server_close()
+        print(json.dumps(services.stats()))
+
+
+if __name__ == '__main__':
+    main()
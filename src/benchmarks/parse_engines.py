@@ -0,0 +1,100 @@
+"""Benchmark the parse_content engines on a corpus of saved SEC pages.
+
+Reports per-page parse time and peak memory for each engine, and checks
+that both engines produce identical output. Each engine runs in a fresh
+process so peak RSS reflects that engine alone.
+
+    python -m src.benchmarks.parse_engines [CORPUS_DIR] [--repeat N]
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import resource
+import statistics
+import tracemalloc
+import multiprocessing
+
+from src.resources.parsers import PARSER_ENGINES
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'sec_pages')
+
+
+def load_corpus(corpus_dir):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def _run_engine(engine, pages, repeat, queue):
+    parse = PARSER_ENGINES[engine]
+    # Warm up imports and compiled selectors before measuring
+    for name, html in pages:
+        parse(html, name)
+    
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    timings = []
+    for _ in range(repeat):
+        for name, html in pages:
+            started = time.perf_counter()
+            parse(html, name)
+            timings.append(time.perf_counter() - started)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    queue.put({
+        'engine': engine,
+        'pages': len(timings),
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p95_ms': sorted(timings)[int(len(timings) * 0.95) - 1] * 1000,
+        'python_peak_kb': traced_peak / 1024,
+        # ru_maxrss is in KB on Linux; covers libxml2 allocations tracemalloc cannot see
+        'rss_growth_kb': rss_after - rss_before
+    })
+
+
+def check_parity(pages):
+    mismatches = []
+    for name, html in pages:
+        results = {engine: parse(html, name) for engine, parse in PARSER_ENGINES.items()}
+        if len({repr(r) for r in results.values()}) > 1:
+            mismatches.append(name)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus_dir', nargs='?', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args(argv)
+    
+    pages = load_corpus(args.corpus_dir)
+    if not pages:
+        print(f"No .html pages found in {args.corpus_dir}")
+        return 1
+    
+    mismatches = check_parity(pages)
+    print(f"Corpus: {len(pages)} pages, {args.repeat} repeats")
+    print(f"Parity: {'identical output' if not mismatches else 'MISMATCH in ' + ', '.join(mismatches)}")
+    print()
+    print(f"{'engine':<8}{'mean ms/page':>14}{'p95 ms/page':>14}{'py peak KB':>13}{'RSS growth KB':>15}")
+    
+    ctx = multiprocessing.get_context('spawn')
+    for engine in PARSER_ENGINES:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_engine, args=(engine, pages, args.repeat, queue))
+        proc.start()
+        r = queue.get()
+        proc.join()
+        print(f"{r['engine']:<8}{r['mean_ms']:>14.3f}{r['p95_ms']:>14.3f}{r['python_peak_kb']:>13.1f}{r['rss_growth_kb']:>15}")
+    
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Measure prompt size and summary latency with and without sentence pre-selection.
+
+Builds each release's prompt two ways, from the first CONTENT_LIMIT
+characters and from the sentences select_sentences keeps within the token
+budget, and reports prompt tokens per item and selection time. With
+``--summarize`` both prompts are also sent to Ollama (OLLAMA_HOST and
+OLLAMA_PORT, or the fake services) and their mean latency is reported.
+
+    python -m src.benchmarks.prompt_selection [--budget 200] [--releases 40] [--batch 10]
+        [--corpus DIR] [--summarize]
+
+Without ``--corpus`` the releases are the fake services' synthetic articles.
+"""
+import os
+import glob
+import time
+import argparse
+import statistics
+
+from src.benchmarks.fake_services import synthetic_article
+from src.resources.extractive import estimate_tokens, select_sentences
+from src.resources.llm import CONTENT_LIMIT, PROMPT_TEMPLATE, WORD_BUDGET, LLMResource
+from src.resources.parsers import parse_content
+
+
+def load_releases(corpus_dir, count):
+    if corpus_dir:
+        pages = [(path, open(path, encoding='utf-8').read())
+                 for path in sorted(glob.glob(os.path.join(corpus_dir, '*.html')))[:count]]
+    else:
+        pages = [(url, synthetic_article(url)) for url in
+                 (f"https://www.sec.gov/newsroom/press-release/2025-{n}" for n in range(1, count + 1))]
+    return [parse_content(html, url, 'bs4') for url, html in pages]
+
+
+def prompt_tokens(title, content):
+    return estimate_tokens(PROMPT_TEMPLATE.format(
+        word_budget=WORD_BUDGET, title=title or 'No title', content=(content or '')[:CONTENT_LIMIT]
+    ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=int, default=int(os.getenv("SUMMARY_TOKEN_BUDGET", "200")))
+    parser.add_argument('--releases', type=int, default=40)
+    parser.add_argument('--batch', type=int, default=int(os.getenv("SUMMARY_FETCH_SIZE", "10")))
+    parser.add_argument('--corpus', help="Directory of saved press release pages")
+    parser.add_argument('--summarize', action='store_true', help="Also time LLMResource.summarize on both prompts")
+    args = parser.parse_args(argv)
+
+    releases = load_releases(args.corpus, args.releases)
+    titles = [r['title'] for r in releases]
+    contents = [r['content'] for r in releases]
+
+    started = time.perf_counter()
+    excerpts = []
+    for i in range(0, len(contents), args.batch):
+        excerpts.extend(select_sentences(contents[i:i + args.batch], args.budget))
+    select_ms = (time.perf_counter() - started) * 1000 / len(contents)
+
+    before = [prompt_tokens(t, c) for t, c in zip(titles, contents)]
+    after = [prompt_tokens(t, e) for t, e in zip(titles, excerpts)]
+    print(f"{len(releases)} releases, token budget {args.budget}")
+    print(f"  prompt tokens/item   first {CONTENT_LIMIT} chars: {statistics.mean(before):.1f}   "
+          f"selected: {statistics.mean(after):.1f} ({1 - sum(after) / sum(before):.0%} fewer)")
+    print(f"  selection time/item  {select_ms:.2f} ms")
+
+    if args.summarize:
+        llm = LLMResource()
+        for label, texts in (('first chars', contents), ('selected', excerpts)):
+            timings = []
+            for title, text in zip(titles, texts):
+                summarize_started = time.perf_counter()
+                llm.summarize(text, title)
+                timings.append(time.perf_counter() - summarize_started)
+            print(f"  summarize latency    {label:<11} mean {statistics.mean(timings) * 1000:.0f} ms   "
+                  f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
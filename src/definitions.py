@@ -8,6 +8,7 @@ from dagster import (
 )
 
 from src import assets
+from src.jobs import reparse_archive_job, release_retention_job
 from src.resources.database import PostgresResource
 from src.resources.scraper import ScraperResource
 from src.resources.llm import LLMResource
@@ -56,6 +57,6 @@ defs = Definitions(
         "scraper": ScraperResource(),
         "llm": LLMResource(),
     },
-    jobs=[all_assets_job],
+    jobs=[all_assets_job, reparse_archive_job, release_retention_job],
     schedules=[press_releases_schedule, business_hours_schedule]
 )
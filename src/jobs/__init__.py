@@ -0,0 +1,4 @@
+from .reparse import reparse_archive_job
+from .retention import release_retention_job
+
+__all__ = ["reparse_archive_job", "release_retention_job"]
@@ -0,0 +1,107 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from dagster import op, job, OpExecutionContext, Output
+from psycopg2.extras import execute_values
+
+from src.resources.archive import HtmlArchive, get_html_archive
+from src.resources.fingerprint import fingerprint
+from src.resources.parsers import parse_content
+
+
+def _reparse_page(args):
+    """Parse one archived page; runs in a worker process."""
+    archive_dir, url_hash, url, engine = args
+    html = HtmlArchive(archive_dir).get(url_hash)
+    if html is None:
+        return None
+    parsed = parse_content(html, url, engine)
+    content = parsed['content'][:5000] if parsed['content'] else 'No content'
+    return (
+        url_hash,
+        parsed['title'][:500] if parsed['title'] else 'No title',
+        content,
+        parsed['published_at'],
+        *fingerprint(content)
+    )
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+@op(required_resource_keys={"postgres"})
+def reparse_archived_releases(context: OpExecutionContext):
+    """Re-run parse_content over the raw HTML archive and bulk-update press releases and their fingerprints."""
+    postgres = context.resources.postgres
+    archive = get_html_archive()
+
+    if archive is None:
+        context.log.warning("SCRAPER_ARCHIVE_DIR not set, nothing to re-parse")
+        return Output(None, metadata={"message": "No archive configured"})
+
+    engine = os.getenv("PARSER_ENGINE", "bs4")
+    workers = int(os.getenv("REPARSE_WORKERS", str(os.cpu_count() or 1)))
+    batch_size = int(os.getenv("REPARSE_BATCH_SIZE", "500"))
+
+    hashes = list(archive.iter_hashes())
+    context.log.info(f"Re-parsing {len(hashes)} archived pages with {workers} workers ({engine} engine)")
+
+    updated = 0
+    missing = 0
+    started = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in _chunks(hashes, batch_size):
+            with postgres.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT url_hash, url FROM raw_data.press_releases WHERE url_hash = ANY(%s)",
+                        (batch,)
+                    )
+                    urls = dict(cursor.fetchall())
+            missing += len(batch) - len(urls)
+
+            jobs = [(archive.directory, url_hash, url, engine) for url_hash, url in urls.items()]
+            rows = [row for row in pool.map(_reparse_page, jobs, chunksize=max(1, len(jobs) // (workers * 4))) if row]
+
+            if rows:
+                with postgres.get_connection() as conn:
+                    with conn.cursor() as cursor:
+                        execute_values(cursor, """
+                            UPDATE raw_data.press_releases pr
+                            SET title = v.title,
+                                content = v.content,
+                                published_at = COALESCE(v.published_at, pr.published_at),
+                                content_hash = v.content_hash,
+                                simhash = v.simhash
+                            FROM (VALUES %s) AS v(url_hash, title, content, published_at, content_hash, simhash)
+                            WHERE pr.url_hash = v.url_hash
+                        """, rows, template="(%s, %s, %s, %s::timestamp, %s, %s::bigint)", page_size=batch_size)
+                        updated += cursor.rowcount
+                        # Duplicate lookups read fingerprints from the key registry
+                        execute_values(cursor, """
+                            UPDATE raw_data.press_release_keys k
+                            SET content_hash = v.content_hash, simhash = v.simhash
+                            FROM (VALUES %s) AS v(url_hash, content_hash, simhash)
+                            WHERE k.url_hash = v.url_hash
+                        """, [(row[0], row[4], row[5]) for row in rows], template="(%s, %s, %s::bigint)", page_size=batch_size)
+
+            context.log.info(f"Re-parsed {updated} releases so far")
+
+    elapsed = time.monotonic() - started
+    return Output(None, metadata={
+        "archived_pages": len(hashes),
+        "updated": updated,
+        "not_in_db": missing,
+        "workers": workers,
+        "engine": engine,
+        "pages_per_sec": round(len(hashes) / elapsed, 2) if elapsed > 0 else 0.0
+    })
+
+
+@job(description="Re-parse the raw HTML archive and update stored press releases")
+def reparse_archive_job():
+    reparse_archived_releases()
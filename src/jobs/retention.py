@@ -0,0 +1,64 @@
+import os
+from datetime import date
+
+from dagster import op, job, OpExecutionContext, Output
+
+from src.resources.release_storage import (
+    add_months, detach_partition, export_partition, list_partitions
+)
+
+
+@op(required_resource_keys={"postgres"})
+def archive_release_partitions(context: OpExecutionContext):
+    """Detach press release partitions past the hot window and archive detached ones.
+
+    Partitions older than RELEASE_HOT_MONTHS are detached, so queries and the
+    stats rollup stop seeing them while the table stays in the database. With
+    RELEASE_ARCHIVE_DIR set, detached partitions are then written there as
+    gzipped CSV and dropped. Their URLs stay in press_release_keys, so archived
+    releases are never scraped again.
+    """
+    postgres = context.resources.postgres
+    hot_months = int(os.getenv("RELEASE_HOT_MONTHS", "24"))
+    archive_dir = os.getenv("RELEASE_ARCHIVE_DIR")
+    cutoff = add_months(date.today().replace(day=1), -hot_months)
+
+    with postgres.get_connection() as conn:
+        with conn.cursor() as cursor:
+            partitions = list_partitions(cursor)
+
+    detached = []
+    for partition in partitions:
+        if partition['attached'] and partition['month'] < cutoff:
+            with postgres.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    detach_partition(cursor, partition['name'])
+            partition['attached'] = False
+            detached.append(partition['name'])
+            context.log.info(f"Detached {partition['name']}")
+
+    archived = []
+    if archive_dir:
+        for partition in partitions:
+            if partition['attached']:
+                continue
+            with postgres.get_connection() as conn:
+                path = export_partition(conn, partition['name'], archive_dir)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE raw_data.{partition['name']}")
+            archived.append(path)
+            context.log.info(f"Archived {partition['name']} to {path}")
+    elif detached:
+        context.log.info("RELEASE_ARCHIVE_DIR not set, keeping detached partitions in the database")
+
+    return Output(None, metadata={
+        "hot_months": hot_months,
+        "attached_partitions": sum(1 for p in partitions if p['attached']),
+        "detached": detached,
+        "archived": archived,
+    })
+
+
+@job(description="Detach press release partitions past the retention window and archive them compressed")
+def release_retention_job():
+    archive_release_partitions()
@@ -0,0 +1,55 @@
+import os
+import gzip
+import threading
+from typing import Iterator, Optional
+
+
+class HtmlArchive:
+    """Gzip-compressed raw HTML, addressed by the press release's url_hash.
+
+    Pages live at ``<directory>/<hash[:2]>/<hash>.html.gz`` so a full
+    re-parse can be run from disk without scraping again.
+    """
+
+    SUFFIX = '.html.gz'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, url_hash: str) -> str:
+        return os.path.join(self.directory, url_hash[:2], f"{url_hash}{self.SUFFIX}")
+
+    def __contains__(self, url_hash: str) -> bool:
+        return os.path.exists(self.path(url_hash))
+
+    def put(self, url_hash: str, html: str) -> bool:
+        """Store a page; returns False if it was already archived."""
+        path = self.path(url_hash)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+        return True
+
+    def get(self, url_hash: str) -> Optional[str]:
+        try:
+            with gzip.open(self.path(url_hash), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def iter_hashes(self) -> Iterator[str]:
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(self.SUFFIX):
+                    yield name[:-len(self.SUFFIX)]
+
+
+def get_html_archive() -> Optional[HtmlArchive]:
+    """Archive configured by SCRAPER_ARCHIVE_DIR, or None when unset."""
+    directory = os.getenv("SCRAPER_ARCHIVE_DIR", "")
+    return HtmlArchive(directory) if directory else None
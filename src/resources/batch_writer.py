@@ -0,0 +1,140 @@
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2
+from dagster import get_dagster_logger
+from psycopg2.extras import execute_values
+
+
+class BatchedWriter:
+    """Buffers rows and writes them with one multi-row INSERT per batch.
+
+    Each flush runs ``INSERT ... VALUES %s ON CONFLICT DO NOTHING RETURNING
+    <returning>`` through ``execute_values`` on a single connection, so rows
+    skipped as conflicts are told apart from inserted ones exactly as a
+    per-row ``RETURNING id`` would. A flush happens when ``batch_size`` rows
+    are buffered, when ``flush_seconds`` have passed since the last one, and
+    on leaving the ``with`` block. ``on_inserted`` receives the RETURNING
+    values of new rows and ``on_flushed`` every row of a successful batch.
+
+    When a batch is rejected (a value too long, bad encoding, a trigger
+    error) its rows are retried one at a time, each under a savepoint, so
+    only the offending rows are lost. Failed rows are logged and counted as
+    ``failed``; if the database is unreachable the whole batch is. The
+    writer keeps accepting rows so one bad batch does not end the run.
+    """
+
+    def __init__(self, postgres, table: str, columns: Sequence[str], conflict_target: str,
+                 returning: str, template: Optional[str] = None,
+                 batch_size: Optional[int] = None, flush_seconds: Optional[float] = None,
+                 on_inserted: Optional[Callable[[List[Any]], None]] = None,
+                 on_flushed: Optional[Callable[[List[tuple]], None]] = None):
+        self.postgres = postgres
+        self.batch_size = batch_size or int(os.getenv("DB_WRITE_BATCH_SIZE", "100"))
+        self.flush_seconds = flush_seconds if flush_seconds is not None else float(os.getenv("DB_WRITE_FLUSH_SECONDS", "5"))
+        self.template = template
+        self.on_inserted = on_inserted
+        self.on_flushed = on_flushed
+        self.query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s "
+            f"ON CONFLICT {conflict_target} DO NOTHING RETURNING {returning}"
+        )
+        self._rows: List[tuple] = []
+        self._last_flush = time.monotonic()
+        self.inserted = 0
+        self.skipped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.row_fallbacks = 0
+        self.write_seconds = 0.0
+
+    def __enter__(self) -> 'BatchedWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, row: tuple):
+        self._rows.append(row)
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        if len(self._rows) >= self.batch_size or (
+            self._rows and time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> List[Any]:
+        """Write the buffered rows; returns the RETURNING value of each inserted row."""
+        rows, self._rows = self._rows, []
+        self._last_flush = time.monotonic()
+        if not rows:
+            return []
+
+        logger = get_dagster_logger()
+        started = time.perf_counter()
+        try:
+            with self.postgres.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    returned = execute_values(
+                        cursor, self.query, rows,
+                        template=self.template, page_size=len(rows), fetch=True
+                    )
+            written = rows
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            # Row-by-row retries cannot succeed without a connection
+            self.failed += len(rows)
+            logger.error(f"Failed to write batch of {len(rows)} rows: {str(e)}")
+            return []
+        except Exception as e:
+            logger.warning(f"Batch of {len(rows)} rows rejected, writing them one at a time: {str(e)}")
+            try:
+                returned, written = self._write_each(rows)
+            except Exception as e:
+                self.failed += len(rows)
+                logger.error(f"Failed to write batch of {len(rows)} rows: {str(e)}")
+                return []
+            self.failed += len(rows) - len(written)
+        finally:
+            self.write_seconds += time.perf_counter() - started
+
+        inserted = [row[0] for row in returned]
+        self.flushes += 1
+        self.inserted += len(inserted)
+        self.skipped += len(written) - len(inserted)
+        if inserted and self.on_inserted:
+            self.on_inserted(inserted)
+        if written and self.on_flushed:
+            self.on_flushed(written)
+        return inserted
+
+    def _write_each(self, rows: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+        """Insert rows one at a time under a savepoint each; returns (RETURNING rows, rows written)."""
+        logger = get_dagster_logger()
+        returned, written = [], []
+        self.row_fallbacks += 1
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                for row in rows:
+                    cursor.execute("SAVEPOINT batch_row")
+                    try:
+                        returned.extend(execute_values(cursor, self.query, [row], template=self.template, fetch=True))
+                    except psycopg2.Error as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT batch_row")
+                        logger.error(f"Failed to write row {str(row)[:200]}: {str(e)}")
+                        continue
+                    cursor.execute("RELEASE SAVEPOINT batch_row")
+                    written.append(row)
+        return returned, written
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'inserted': self.inserted,
+            'skipped_conflicts': self.skipped,
+            'failed': self.failed,
+            'flushes': self.flushes,
+            'row_fallbacks': self.row_fallbacks,
+            'batch_size': self.batch_size,
+            'write_seconds': round(self.write_seconds, 3)
+        }
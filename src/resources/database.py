@@ -1,24 +1,146 @@
 import os
+import time
+import threading
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 import psycopg2
-from dagster import ConfigurableResource
+from dagster import ConfigurableResource, get_dagster_logger
 from psycopg2.extras import RealDictCursor
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class _PoolStats:
+    """Checkout, wait and usage counters for one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidated = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def attach(self, pool: QueuePool):
+        event.listen(pool, 'connect', self._on_connect)
+        event.listen(pool, 'checkout', self._on_checkout)
+        event.listen(pool, 'checkin', self._on_checkin)
+        event.listen(pool, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, *args):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, *args):
+        # Health check: a dead connection is discarded and the checkout retried
+        try:
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except psycopg2.Error as e:
+            raise DisconnectionError(str(e))
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, *args):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def _on_invalidate(self, *args):
+        with self._lock:
+            self.invalidated += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'invalidated': self.invalidated,
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'avg_wait_ms': round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 2)
+            }
+
+
+# One pool per process and database, shared by every asset in a run
+_pools: Dict[Tuple[int, str], Tuple[QueuePool, _PoolStats]] = {}
+_pools_lock = threading.Lock()
 
 
 class PostgresResource(ConfigurableResource):
-    @contextmanager
-    def get_connection(self) -> Iterator[psycopg2.extensions.connection]:
-        conn = psycopg2.connect(
+    """PostgreSQL connections, pooled when POSTGRES_POOL_MAX is above zero.
+
+    Without a pool every ``get_connection`` opens and closes its own
+    psycopg2 connection. With one, connections come from a SQLAlchemy
+    QueuePool that is pre-warmed with POSTGRES_POOL_MIN connections and
+    checked with ``SELECT 1`` on every checkout.
+    """
+
+    def _connect_args(self) -> Dict[str, Any]:
+        return dict(
             host=os.getenv("POSTGRES_HOST", "postgres"),
             port=5432,
             database=os.getenv("POSTGRES_DB", "news_pipeline"),
             user=os.getenv("POSTGRES_USER", "dagster"),
             password=os.getenv("POSTGRES_PASSWORD", "dagster")
         )
+
+    def _pool(self) -> Optional[Tuple[QueuePool, _PoolStats]]:
+        pool_max = int(os.getenv("POSTGRES_POOL_MAX", "0"))
+        if pool_max <= 0:
+            return None
+        connect_args = self._connect_args()
+        dsn = "{user}@{host}:{port}/{database}".format(**connect_args)
+        # Keyed by pid so a forked step process never reuses its parent's sockets
+        key = (os.getpid(), dsn)
+        with _pools_lock:
+            if key not in _pools:
+                pool = QueuePool(
+                    lambda: psycopg2.connect(**connect_args),
+                    pool_size=pool_max,
+                    max_overflow=0,
+                    timeout=float(os.getenv("POSTGRES_POOL_TIMEOUT", "30")),
+                    recycle=int(os.getenv("POSTGRES_POOL_RECYCLE", "1800"))
+                )
+                stats = _PoolStats()
+                stats.attach(pool)
+                warm = [pool.connect() for _ in range(min(pool_max, int(os.getenv("POSTGRES_POOL_MIN", "1"))))]
+                for conn in warm:
+                    conn.close()
+                get_dagster_logger().info(f"Opened PostgreSQL pool of up to {pool_max} connections to {dsn}")
+                _pools[key] = (pool, stats)
+            return _pools[key]
+
+    @contextmanager
+    def get_connection(self) -> Iterator[psycopg2.extensions.connection]:
+        pooled = self._pool()
+        if pooled is None:
+            conn = psycopg2.connect(**self._connect_args())
+        else:
+            pool, stats = pooled
+            wait_started = time.perf_counter()
+            try:
+                conn = pool.connect()
+            except PoolTimeoutError:
+                stats.record_wait(time.perf_counter() - wait_started, timed_out=True)
+                raise
+            stats.record_wait(time.perf_counter() - wait_started)
         try:
             yield conn
             conn.commit()
@@ -26,4 +148,13 @@ class PostgresResource(ConfigurableResource):
             conn.rollback()
             raise
         finally:
+            # Returns the connection to the pool when pooled
             conn.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connects, checkouts, waits and peak usage of this process's pool."""
+        pooled = self._pool()
+        if pooled is None:
+            return {'pooled': False}
+        pool, stats = pooled
+        return {'pooled': True, 'size': pool.size(), 'idle': pool.checkedin(), **stats.snapshot()}
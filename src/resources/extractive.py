@@ -0,0 +1,111 @@
+"""Extractive pre-selection of release sentences for the summarization prompt.
+
+Prompt length dominates latency on CPU-only Ollama, and the opening of a
+release is often a dateline and boilerplate. Each release is split into
+sentences, and every sentence is scored by cosine similarity to the
+release's TF-IDF centroid, with IDF taken over that release's own
+sentences. Earlier sentences weigh more. The best sentences that fit the
+token budget are kept in their original order, skipping near-repeats of
+sentences already kept. A batch of releases is scored as one NumPy matrix,
+but a release's selection depends only on its own text, so the same
+release always yields the same prompt (and summary cache key).
+"""
+import re
+from typing import List, Sequence
+
+import numpy as np
+
+# The last sentence of a release weighs this much less than the first
+POSITION_DECAY = 0.5
+# Sentences this similar to one already kept add nothing new
+REDUNDANCY = 0.8
+# Sentences with fewer content terms (datelines, "###", reference tags) score proportionally less
+MIN_TERMS = 6
+
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+(?=["“(]?[A-Z0-9$])|(?<=[a-z]{2}[.!?])(?=[A-Z][a-z])')
+# Roughly one model token per word or punctuation mark
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_TERM = re.compile(r"[a-z]+(?:['’][a-z]+)?")
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do does for from had has have
+he her his if in into is it its may more most not of on or our over said she should so such than that the
+their them then there these they this those through to under was we were what when which while who will
+with would you your
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate prompt tokens: words and punctuation marks."""
+    return len(_TOKEN.findall(text or ''))
+
+
+def split_sentences(text: str) -> List[str]:
+    sentences = []
+    for line in text.splitlines():
+        sentences.extend(s.strip() for s in _SENTENCE_BREAK.split(line) if s.strip())
+    return sentences
+
+
+def select_sentences(texts: Sequence[str], token_budget: int) -> List[str]:
+    """The most informative sentences of each text within ``token_budget`` tokens.
+
+    Texts already within the budget are returned unchanged.
+    """
+    selected = list(texts)
+    docs = [(i, split_sentences(text)) for i, text in enumerate(texts)
+            if text and estimate_tokens(text) > token_budget]
+    docs = [(i, sentences) for i, sentences in docs if sentences]
+    if not docs:
+        return selected
+
+    vocabulary = {}
+    rows, cols, sentence_doc, positions, term_counts = [], [], [], [], []
+    for d, (_, sentences) in enumerate(docs):
+        last = max(1, len(sentences) - 1)
+        for j, sentence in enumerate(sentences):
+            terms = [term for term in _TERM.findall(sentence.lower()) if term not in STOPWORDS]
+            rows.extend([len(sentence_doc)] * len(terms))
+            cols.extend(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+            sentence_doc.append(d)
+            positions.append(j / last)
+            term_counts.append(len(terms))
+
+    counts = np.zeros((len(sentence_doc), max(1, len(vocabulary))), dtype=np.float32)
+    np.add.at(counts, (rows, cols), 1)
+    sentence_doc = np.array(sentence_doc)
+    starts = np.flatnonzero(np.r_[True, sentence_doc[1:] != sentence_doc[:-1]])
+    sentence_count = np.diff(np.r_[starts, len(sentence_doc)])
+
+    # Per-release IDF: terms in every sentence carry little, the release's
+    # distinctive terms carry most
+    document_frequency = np.add.reduceat((counts > 0).astype(np.float32), starts, axis=0)
+    idf = np.log((1 + sentence_count)[:, None] / (1 + document_frequency)) + 1
+    weights = counts * idf[sentence_doc]
+    centroids = np.add.reduceat(weights, starts, axis=0)[sentence_doc]
+    weight_norms = np.linalg.norm(weights, axis=1)
+    norms = weight_norms * np.linalg.norm(centroids, axis=1)
+    similarity = np.einsum('ij,ij->i', weights, centroids) / np.where(norms > 0, norms, 1)
+    scores = (similarity * (1 - POSITION_DECAY * np.array(positions))
+              * np.minimum(1, np.array(term_counts) / MIN_TERMS))
+    unit = weights / np.where(weight_norms > 0, weight_norms, 1)[:, None]
+
+    for d, (i, sentences) in enumerate(docs):
+        doc = slice(starts[d], starts[d] + len(sentences))
+        doc_scores = scores[doc]
+        overlap = unit[doc] @ unit[doc].T
+        budget = token_budget
+        keep = []
+        for j in np.argsort(-doc_scores, kind='stable'):
+            tokens = estimate_tokens(sentences[j])
+            if doc_scores[j] <= 0 or tokens > budget or (keep and overlap[j, keep].max() >= REDUNDANCY):
+                continue
+            keep.append(j)
+            budget -= tokens
+        if keep:
+            selected[i] = '\n'.join(sentences[j] for j in sorted(keep))
+        else:
+            # Even the best sentence is over budget: keep its opening words
+            words = sentences[int(np.argmax(doc_scores))].split()
+            selected[i] = ' '.join(words[:token_budget])
+    return selected
@@ -0,0 +1,115 @@
+import os
+import re
+import json
+import time
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qsl
+
+
+def url_pattern(url: str) -> str:
+    """Collapse the numeric parts of a URL so every listing page shares a pattern."""
+    parts = urlparse(url)
+    path = re.sub(r'\d+', '{n}', parts.path)
+    query = '&'.join(sorted(
+        f"{key}={{n}}" if value.isdigit() else f"{key}={value}"
+        for key, value in parse_qsl(parts.query)
+    ))
+    return f"{parts.netloc}{path}?{query}" if query else f"{parts.netloc}{path}"
+
+
+class FetchModeTracker:
+    """Remembers which URL patterns need JS rendering and times each fetch mode.
+
+    A pattern marked as needing rendering is probed with a plain fetch again
+    once its decision is older than ``recheck_seconds``, so a site that stops
+    needing JavaScript is picked up without manual intervention.
+    """
+
+    def __init__(self, state_path: Optional[str] = None, recheck_seconds: float = 86400):
+        self.state_path = state_path
+        self.recheck_seconds = recheck_seconds
+        self._lock = threading.Lock()
+        self._patterns: Dict[str, Dict[str, Any]] = {}
+        self._modes = {
+            mode: {'requests': 0, 'errors': 0, 'total_latency_ms': 0.0}
+            for mode in ('plain', 'render_js')
+        }
+        self._probes = {'plain_matched': 0, 'escalations': 0}
+        if state_path:
+            try:
+                with open(state_path) as f:
+                    self._patterns = json.load(f)
+            except (FileNotFoundError, ValueError):
+                pass
+
+    def needs_render(self, url: str) -> bool:
+        with self._lock:
+            decision = self._patterns.get(url_pattern(url))
+        if not decision or not decision['render_js']:
+            return False
+        return time.time() - decision['decided_at'] < self.recheck_seconds
+
+    def record_probe(self, url: str, plain_matched: bool):
+        """Record whether a plain fetch found the expected selectors."""
+        with self._lock:
+            self._patterns[url_pattern(url)] = {'render_js': not plain_matched, 'decided_at': time.time()}
+            self._probes['plain_matched' if plain_matched else 'escalations'] += 1
+            patterns = dict(self._patterns)
+        self._save(patterns)
+
+    def record_fetch(self, render_js: bool, elapsed: float, success: bool):
+        with self._lock:
+            stats = self._modes['render_js' if render_js else 'plain']
+            stats['requests'] += 1
+            stats['total_latency_ms'] += elapsed * 1000
+            if not success:
+                stats['errors'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            modes = {mode: dict(s) for mode, s in self._modes.items()}
+            result = dict(self._probes)
+            result['render_js_patterns'] = sorted(p for p, d in self._patterns.items() if d['render_js'])
+        for s in modes.values():
+            s['avg_latency_ms'] = round(s['total_latency_ms'] / s['requests'], 1) if s['requests'] else 0.0
+            s['total_latency_ms'] = round(s['total_latency_ms'], 1)
+        result.update(modes)
+        return result
+
+    def _save(self, patterns: Dict[str, Dict[str, Any]]):
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(patterns, f)
+        os.replace(tmp_path, self.state_path)
+
+
+_tracker: Optional[FetchModeTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def render_state_path(cache_dir: str) -> str:
+    """Where the tracker persists its decisions: beside the cache directory, never inside it."""
+    return f"{os.path.abspath(cache_dir)}.render_modes.json"
+
+
+def get_fetch_mode_tracker() -> FetchModeTracker:
+    """Process-wide tracker, persisted next to the page cache when SCRAPER_CACHE_DIR is set."""
+    global _tracker
+    directory = os.getenv("SCRAPER_CACHE_DIR", "")
+    state_path = render_state_path(directory) if directory else None
+    with _tracker_lock:
+        if _tracker is None or _tracker.state_path != state_path:
+            if directory:
+                os.makedirs(os.path.dirname(state_path), exist_ok=True)
+                # Earlier releases kept the state inside the cache directory
+                legacy_path = os.path.join(directory, 'render_modes.json')
+                if os.path.exists(legacy_path) and not os.path.exists(state_path):
+                    os.replace(legacy_path, state_path)
+            _tracker = FetchModeTracker(
+                state_path=state_path,
+                recheck_seconds=float(os.getenv("SCRAPER_RENDER_RECHECK_HOURS", "24")) * 3600
+            )
+        return _tracker
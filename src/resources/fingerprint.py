@@ -0,0 +1,129 @@
+"""Content fingerprints for spotting republished and corrected releases.
+
+Each release gets a SHA-256 of its normalized text (exact duplicates) and a
+64-bit SimHash over word 3-shingles (near duplicates: a correction flips a
+few bits, unrelated text about half of them). The SimHash is stored as a
+signed BIGINT and looked up through four 16-bit band indexes: two
+fingerprints within 3 bits of each other always agree on at least one band,
+so a candidate search probes four indexes instead of scanning every release.
+"""
+import re
+import hashlib
+from collections import Counter
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+BITS = 64
+BANDS = 4
+SHINGLE_SIZE = 3
+# Shorter texts (placeholders like "No content") are not fingerprinted
+MIN_TOKENS = 20
+
+_TOKEN = re.compile(r"\w+")
+
+FINGERPRINT_DDL = """
+    ALTER TABLE raw_data.press_releases
+        ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64),
+        ADD COLUMN IF NOT EXISTS simhash BIGINT;
+    ALTER TABLE raw_data.press_release_keys
+        ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64),
+        ADD COLUMN IF NOT EXISTS simhash BIGINT;
+    CREATE INDEX IF NOT EXISTS idx_press_release_keys_content_hash
+        ON raw_data.press_release_keys (content_hash);
+    CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band0
+        ON raw_data.press_release_keys (((simhash >> 48) & 65535));
+    CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band1
+        ON raw_data.press_release_keys (((simhash >> 32) & 65535));
+    CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band2
+        ON raw_data.press_release_keys (((simhash >> 16) & 65535));
+    CREATE INDEX IF NOT EXISTS idx_press_release_keys_simhash_band3
+        ON raw_data.press_release_keys ((simhash & 65535));
+"""
+
+# For each release, the closest already-summarized release (excluding itself)
+# that is an exact duplicate or within max_distance SimHash bits. Failed
+# placeholder summaries are never copied, so duplicates get their own retry
+DUPLICATE_QUERY = """
+    SELECT c.id, d.source_id, d.summary, d.bullet_points, d.word_count, d.model_used, d.distance
+    FROM raw_data.press_release_keys c
+    CROSS JOIN LATERAL (
+        SELECT k.id AS source_id, prs.summary, prs.bullet_points, prs.word_count, prs.model_used,
+               bit_count((k.simhash # c.simhash)::bit(64)) AS distance
+        FROM raw_data.press_release_keys k
+        JOIN raw_data.press_release_summary prs ON prs.press_release_id = k.id
+        WHERE k.id <> c.id
+          AND prs.model_used <> 'failed'
+          AND (k.content_hash = c.content_hash
+               OR ((k.simhash >> 48) & 65535) = ((c.simhash >> 48) & 65535)
+               OR ((k.simhash >> 32) & 65535) = ((c.simhash >> 32) & 65535)
+               OR ((k.simhash >> 16) & 65535) = ((c.simhash >> 16) & 65535)
+               OR (k.simhash & 65535) = (c.simhash & 65535))
+          AND (k.content_hash = c.content_hash
+               OR bit_count((k.simhash # c.simhash)::bit(64)) <= %s)
+        ORDER BY k.content_hash = c.content_hash DESC, distance, k.id
+        LIMIT 1
+    ) d
+    WHERE c.id = ANY(%s) AND c.simhash IS NOT NULL
+"""
+
+
+def _tokens(text: str):
+    return _TOKEN.findall(text.lower())
+
+
+def simhash(tokens: Sequence[str]) -> int:
+    """Unsigned 64-bit SimHash of the token sequence's 3-shingles."""
+    shingles = Counter(
+        ' '.join(tokens[i:i + SHINGLE_SIZE])
+        for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))
+    )
+    weights = [0] * BITS
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big')
+        for bit in range(BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit in range(BITS) if weights[bit] > 0)
+
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value onto PostgreSQL's signed BIGINT range."""
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << BITS) - 1)).count('1')
+
+
+def fingerprint(text: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """(content_hash, signed simhash) of a release body, or (None, None) if it is too short."""
+    tokens = _tokens(text or '')
+    if len(tokens) < MIN_TOKENS:
+        return None, None
+    content_hash = hashlib.sha256(' '.join(tokens).encode()).hexdigest()
+    return content_hash, to_signed(simhash(tokens))
+
+
+def ensure_fingerprints(cursor):
+    """Add the fingerprint columns and the exact-hash and SimHash band indexes."""
+    cursor.execute(FINGERPRINT_DDL)
+
+
+def find_summarized_duplicates(cursor, release_ids: Sequence[int], max_distance: int) -> Dict[int, Dict[str, Any]]:
+    """Summaries of the nearest duplicate of each release, keyed by release id.
+
+    ``max_distance`` above ``BANDS - 1`` bits may miss neighbors, since such
+    fingerprints can differ in every band.
+    """
+    if not release_ids:
+        return {}
+    cursor.execute(DUPLICATE_QUERY, (max_distance, list(release_ids)))
+    return {
+        release_id: {
+            'source_id': source_id,
+            'summary': summary,
+            'bullet_points': bullet_points,
+            'word_count': word_count,
+            'model_used': model_used,
+            'distance': distance
+        }
+        for release_id, source_id, summary, bullet_points, word_count, model_used, distance in cursor.fetchall()
+    }
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+
+class HttpCache:
+    """On-disk cache of fetched pages keyed by the sha256 of the URL.
+
+    Each entry is a body file plus a JSON sidecar holding the validators
+    (ETag/Last-Modified), the body's content hash and any annotations the
+    scraper attaches, such as the links parsed from a listing page.
+
+    The scraper caches JS-rendered fetches under the URL plus a
+    ``#render_js`` marker, so they never revalidate against a plain fetch.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, max_bytes: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'not_modified': 0, 'evictions': 0}
+        # Bytes on disk; unknown until the first eviction pass scans the directory
+        self._total_bytes: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def content_hash(body: str) -> str:
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.html"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the entry metadata with its body, or None if missing or expired."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, encoding='utf-8') as f:
+                body = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if time.time() - meta['stored_at'] > self.ttl_seconds:
+            self._remove(meta_path, body_path)
+            return None
+
+        meta['accessed_at'] = time.time()
+        self._write_meta(meta_path, meta)
+        meta['body'] = body
+        return meta
+
+    def put(self, url: str, body: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> Dict[str, Any]:
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        try:
+            with open(meta_path) as f:
+                previous = json.load(f)
+        except (FileNotFoundError, ValueError):
+            previous = {}
+        previous_size = previous.get('size', 0)
+        content_hash = self.content_hash(body)
+        now = time.time()
+        # Annotations describe the body, so they survive only an identical refetch
+        meta = dict(previous) if previous.get('content_hash') == content_hash else {}
+        meta.update({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': content_hash,
+            'size': len(body.encode()),
+            'stored_at': now,
+            'accessed_at': now
+        })
+        with open(body_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        self._write_meta(meta_path, meta)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += meta['size'] - previous_size
+            needs_eviction = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if needs_eviction:
+            self.evict()
+        return meta
+
+    def annotate(self, url: str, **fields):
+        """Attach extra fields to an existing entry's metadata."""
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        meta.update(fields)
+        self._write_meta(meta_path, meta)
+
+    def record(self, outcome: str):
+        with self._lock:
+            self._counters[outcome] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes.
+
+        Runs on the first write of a process and afterwards only when the
+        tracked size goes over budget, so a full scan is rare. Only entry
+        sidecars in the key subdirectories are read; any other file left in
+        the directory is ignored.
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            now = time.time()
+            for root, _, files in os.walk(self.directory):
+                if root == self.directory:
+                    continue
+                for name in files:
+                    if not name.endswith('.json'):
+                        continue
+                    meta_path = os.path.join(root, name)
+                    body_path = meta_path[:-len('.json')] + '.html'
+                    try:
+                        with open(meta_path) as f:
+                            meta = json.load(f)
+                    except (FileNotFoundError, ValueError):
+                        continue
+                    if not isinstance(meta, dict) or 'stored_at' not in meta or 'size' not in meta:
+                        continue
+                    if now - meta['stored_at'] > self.ttl_seconds:
+                        self._remove(meta_path, body_path)
+                        self._counters['evictions'] += 1
+                        continue
+                    entries.append((meta.get('accessed_at', meta['stored_at']), meta['size'], meta_path, body_path))
+                    total += meta['size']
+
+            for _, size, meta_path, body_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(meta_path, body_path)
+                self._counters['evictions'] += 1
+                total -= size
+
+            self._total_bytes = total
+
+    @staticmethod
+    def _write_meta(meta_path: str, meta: Dict[str, Any]):
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({k: v for k, v in meta.items() if k != 'body'}, f)
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def _remove(*paths: str):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Return the process-wide cache, or None when SCRAPER_CACHE_DIR is unset."""
+    global _cache
+    directory = os.getenv("SCRAPER_CACHE_DIR", "")
+    if not directory:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.directory != directory:
+            _cache = HttpCache(
+                directory,
+                ttl_seconds=float(os.getenv("SCRAPER_CACHE_TTL_HOURS", "168")) * 3600,
+                max_bytes=int(float(os.getenv("SCRAPER_CACHE_MAX_MB", "500")) * 1024 * 1024)
+            )
+        return _cache
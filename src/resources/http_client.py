@@ -0,0 +1,115 @@
+import os
+import time
+import asyncio
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class _InstrumentedAdapter(HTTPAdapter):
+    """HTTPAdapter that reports connection reuse and latency to its client."""
+
+    def __init__(self, client: "HttpClient", **kwargs):
+        self._client = client
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        pool = self.get_connection(request.url, kwargs.get('proxies'))
+        opened_before = pool.num_connections
+        started = time.perf_counter()
+        failed = False
+        try:
+            return super().send(request, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # urllib3 counts every new socket on the pool, so anything that
+            # did not bump the counter was served from a kept-alive connection.
+            opened = pool.num_connections - opened_before
+            self._client._record(host, opened, time.perf_counter() - started, failed)
+
+
+class HttpClient:
+    """Keep-alive HTTP client shared by the scraper and LLM resources."""
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 connect_timeout: float = 5.0):
+        self.connect_timeout = connect_timeout
+        self.session = requests.Session()
+        adapter = _InstrumentedAdapter(
+            self,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def request(self, method: str, url: str, read_timeout: float = 30, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', (self.connect_timeout, read_timeout))
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, read_timeout: float = 30, **kwargs) -> requests.Response:
+        return self.request('GET', url, read_timeout=read_timeout, **kwargs)
+
+    def post(self, url: str, read_timeout: float = 30, **kwargs) -> requests.Response:
+        return self.request('POST', url, read_timeout=read_timeout, **kwargs)
+
+    async def arequest(self, method: str, url: str, read_timeout: float = 30, **kwargs) -> requests.Response:
+        """Async entry point; runs on a worker thread over the same connection pools."""
+        return await asyncio.to_thread(self.request, method, url, read_timeout, **kwargs)
+
+    def _record(self, host: str, opened: int, elapsed: float, failed: bool):
+        with self._lock:
+            stats = self._stats.setdefault(host, {
+                'requests': 0,
+                'errors': 0,
+                'connections_opened': 0,
+                'connections_reused': 0,
+                'total_latency_ms': 0.0,
+                'max_latency_ms': 0.0
+            })
+            stats['requests'] += 1
+            if failed:
+                stats['errors'] += 1
+            if opened > 0:
+                stats['connections_opened'] += opened
+            else:
+                stats['connections_reused'] += 1
+            latency_ms = elapsed * 1000
+            stats['total_latency_ms'] += latency_ms
+            stats['max_latency_ms'] = max(stats['max_latency_ms'], latency_ms)
+
+    def stats(self, host: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-host request, connection reuse and latency counters."""
+        with self._lock:
+            snapshot = {h: dict(s) for h, s in self._stats.items() if host is None or h == host}
+
+        for s in snapshot.values():
+            s['avg_latency_ms'] = round(s['total_latency_ms'] / s['requests'], 1) if s['requests'] else 0.0
+            s['total_latency_ms'] = round(s['total_latency_ms'], 1)
+            s['max_latency_ms'] = round(s['max_latency_ms'], 1)
+        return snapshot
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide client, creating it from the environment on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                pool_connections=int(os.getenv("HTTP_POOL_CONNECTIONS", "10")),
+                pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", "10")),
+                connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+            )
+        return _client
@@ -1,92 +1,331 @@
 import os
-import requests
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dagster import ConfigurableResource, get_dagster_logger
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.resources.http_client import get_http_client
+from src.resources.llm_pool import OPENAI, Endpoint, get_endpoint_pool
+
+BULLET_COUNT = 3
+WORD_BUDGET = 50
+BULLET_MARKERS = ('•', '-', '*')
+CONTENT_LIMIT = 2000
+
+PROMPT_TEMPLATE = """Summarize this SEC press release into EXACTLY 3 bullet points.
+Each bullet point should be concise and factual.
+Total word count for all 3 bullets must be ≤{word_budget} words.
+
+Title: {title}
+
+Content:
+{content}
+
+Format your response as:
+• First key point
+• Second key point  
+• Third key point"""
+
+GENERATE_OPTIONS = {
+    "temperature": 0.3,
+    "num_predict": 150
+}
+
+# Changes whenever the template, budget or sampling options change, so
+# cached summaries from an older prompt are never served
+PROMPT_VERSION = hashlib.sha256(
+    json.dumps([PROMPT_TEMPLATE, WORD_BUDGET, GENERATE_OPTIONS], sort_keys=True).encode()
+).hexdigest()[:12]
+
+
+# Long enough to span the 15-minute schedule, so each run finds the model loaded
+DEFAULT_KEEP_ALIVE = "20m"
+
+# Last health check result per endpoint URL, as (checked at, healthy)
+_health: Dict[str, Tuple[float, bool]] = {}
+_health_lock = threading.Lock()
+
+
+def _timings(result: Dict[str, Any]) -> Dict[str, float]:
+    """Model load and prompt evaluation + generation time Ollama reports on a finished request."""
+    if 'load_duration' not in result:
+        return {}
+    return {
+        'load_ms': round(result['load_duration'] / 1e6, 1),
+        'generate_ms': round((result.get('prompt_eval_duration', 0) + result.get('eval_duration', 0)) / 1e6, 1)
+    }
+
+
+def _ms(nanoseconds: Optional[int]) -> Optional[float]:
+    return round(nanoseconds / 1e6, 2) if nanoseconds is not None else None
+
+
+def _metrics(result: Dict[str, Any], latency_ms: float) -> Dict[str, Any]:
+    """Per-request counters as reported by Ollama (durations in ms).
+    
+    OpenAI-compatible servers report token counts only. A stream cut short
+    never sees the final chunk that carries them, so its generated tokens
+    and generation time are counted from the chunks received instead.
+    """
+    usage = result.get('usage') or {}
+    return {
+        'latency_ms': round(latency_ms, 2),
+        'total_duration_ms': _ms(result.get('total_duration')),
+        'load_duration_ms': _ms(result.get('load_duration')),
+        'prompt_eval_count': result.get('prompt_eval_count', usage.get('prompt_tokens')),
+        'prompt_eval_duration_ms': _ms(result.get('prompt_eval_duration')),
+        'eval_count': result.get('eval_count', usage.get('completion_tokens')),
+        'eval_duration_ms': _ms(result.get('eval_duration'))
+    }
+
+
+def _prompt_inputs(content: str, title: str) -> Tuple[str, str]:
+    return content[:CONTENT_LIMIT] if content else "No content available", title or 'No title'
+
+
+def summary_cache_key(content: str, title: str = "") -> str:
+    """SHA-256 of the whitespace-normalized title and content the prompt is built from."""
+    content, title = _prompt_inputs(content, title)
+    return hashlib.sha256(f"{' '.join(title.split())}\n{' '.join(content.split())}".encode()).hexdigest()
+
+
+def _parse_bullets(summary_text: str, sentence_fallback: bool = True) -> List[str]:
+    """Exactly three bullet texts from a model response.
+    
+    Responses with fewer bullets are split into sentences instead, unless
+    ``sentence_fallback`` is off (a stream cut at the word budget).
+    """
+    bullet_points = []
+    for line in summary_text.split('\n'):
+        line = line.strip()
+        if line and line.startswith(BULLET_MARKERS):
+            bullet_points.append(line.lstrip('•-* ').strip())
+    
+    if len(bullet_points) < BULLET_COUNT and sentence_fallback:
+        sentences = summary_text.split('.')
+        bullet_points = [s.strip() for s in sentences if s.strip()][:BULLET_COUNT]
+    
+    while len(bullet_points) < BULLET_COUNT:
+        bullet_points.append("Detail unavailable")
+    return bullet_points[:BULLET_COUNT]
+
+
+def _decode_ollama(raw: bytes) -> Optional[Dict[str, Any]]:
+    return json.loads(raw)
+
+
+def _decode_openai(raw: bytes) -> Optional[Dict[str, Any]]:
+    """An OpenAI server-sent event as an Ollama-style chunk; None for other SSE lines."""
+    if not raw.startswith(b'data:'):
+        return None
+    data = raw[len(b'data:'):].strip()
+    if data == b'[DONE]':
+        return {'response': '', 'done': True}
+    event = json.loads(data)
+    if event.get('error'):
+        return event
+    choice = (event.get('choices') or [{}])[0]
+    return {
+        'response': (choice.get('delta') or {}).get('content') or '',
+        'done': choice.get('finish_reason') is not None
+    }
+
+
+def _read_stream(response, started: float, decode=_decode_ollama) -> Tuple[str, Optional[float], bool, Dict[str, Any]]:
+    """Collect a streamed generation until three bullets or the word budget are in.
+    
+    Returns the text kept, milliseconds until the first complete bullet,
+    whether generation was cut short and the final chunk (with Ollama's
+    metrics) if it was read, otherwise the tokens received and the time
+    from first to last. Closing the response drops the connection, which
+    makes the server stop generating and free its slot.
+    """
+    text = ''
+    first_bullet_ms = None
+    tokens = 0
+    first_token_at = last_token_at = None
+    
+    def received() -> Dict[str, Any]:
+        if first_token_at is None:
+            return {}
+        return {'eval_count': tokens, 'eval_duration': int((last_token_at - first_token_at) * 1e9)}
+    
+    try:
+        for raw in response.iter_lines(chunk_size=None):
+            if not raw:
+                continue
+            chunk = decode(raw)
+            if chunk is None:
+                continue
+            if chunk.get('error'):
+                raise Exception(f"LLM stream error: {chunk['error']}")
+            if chunk.get('response'):
+                tokens += 1
+                last_token_at = time.perf_counter()
+                first_token_at = first_token_at or last_token_at
+            text += chunk.get('response', '')
+            done = chunk.get('done', False)
+            
+            *complete, partial = text.split('\n')
+            if done:
+                complete, partial = complete + [partial], ''
+            bullets = 0
+            bullet_words = 0
+            kept = []
+            for line in complete:
+                kept.append(line)
+                if line.strip().startswith(BULLET_MARKERS):
+                    bullets += 1
+                    bullet_words += len(line.strip().lstrip('•-* ').split())
+                    if first_bullet_ms is None:
+                        first_bullet_ms = (time.perf_counter() - started) * 1000
+                    if bullets == BULLET_COUNT or bullet_words >= WORD_BUDGET:
+                        return '\n'.join(kept), first_bullet_ms, not done, chunk if done else received()
+            if done:
+                return text, first_bullet_ms, False, chunk
+            
+            # Only words followed by whitespace are known to be complete
+            if partial.strip().startswith(BULLET_MARKERS):
+                words = partial.strip().lstrip('•-* ').split()
+                if not partial[-1:].isspace():
+                    words = words[:-1]
+                if bullet_words + len(words) >= WORD_BUDGET:
+                    marker = partial.strip()[0]
+                    kept.append(f"{marker} {' '.join(words[:WORD_BUDGET - bullet_words])}")
+                    return '\n'.join(kept), first_bullet_ms, True, received()
+        return text, first_bullet_ms, False, received()
+    finally:
+        response.close()
+
+
+def _model_for(endpoint: Endpoint) -> str:
+    """The model set for the endpoint in LLM_ENDPOINTS, else LLM_MODEL."""
+    return endpoint.model or os.getenv("LLM_MODEL", "qwen2.5:0.5b")
+
+
+def _openai_headers() -> Dict[str, str]:
+    api_key = os.getenv("OPENAI_API_KEY")
+    return {'Authorization': f"Bearer {api_key}"} if api_key else {}
+
 
 class LLMResource(ConfigurableResource):
     def test_connection(self) -> bool:
+        """Whether any LLM endpoint answers; results are reused for LLM_HEALTH_TTL seconds."""
+        ttl = float(os.getenv("LLM_HEALTH_TTL", "30"))
+        healthy = []
+        for endpoint in get_endpoint_pool().endpoints:
+            with _health_lock:
+                cached = _health.get(endpoint.url)
+            if cached and time.monotonic() - cached[0] < ttl:
+                healthy.append(cached[1])
+                continue
+            ok = self._check_connection(endpoint)
+            with _health_lock:
+                _health[endpoint.url] = (time.monotonic(), ok)
+            healthy.append(ok)
+        return any(healthy)
+    
+    def _check_connection(self, endpoint: Endpoint) -> bool:
         logger = get_dagster_logger()
         try:
-            ollama_host = os.getenv("OLLAMA_HOST", "ollama")
-            ollama_port = os.getenv("OLLAMA_PORT", "11434")
-            
-            response = requests.get(f"http://{ollama_host}:{ollama_port}/api/tags", timeout=5)
+            if endpoint.kind == OPENAI:
+                response = get_http_client().get(f"{endpoint.url}/models", read_timeout=5, headers=_openai_headers())
+            else:
+                response = get_http_client().get(f"{endpoint.url}/api/tags", read_timeout=5)
             if response.status_code == 200:
-                logger.info("Ollama is accessible")
+                logger.info(f"LLM endpoint {endpoint.url} is accessible")
                 return True
             else:
-                logger.error(f"Ollama returned status {response.status_code}")
+                logger.error(f"LLM endpoint {endpoint.url} returned status {response.status_code}")
                 return False
         except Exception as e:
-            logger.error(f"Failed to connect to Ollama: {str(e)}")
+            logger.error(f"Failed to connect to LLM endpoint {endpoint.url}: {str(e)}")
             return False
     
+    def warm_up(self) -> Dict[str, Any]:
+        """Load the model on every Ollama endpoint, in parallel, and keep it loaded for LLM_KEEP_ALIVE.
+        
+        An empty prompt makes Ollama load the model without generating, under
+        LLM_LOAD_TIMEOUT rather than the per-summary read timeout. ``load_ms``
+        is the time the slowest load took; near zero when the model was still
+        loaded. OpenAI-compatible servers load their model at startup.
+        """
+        keep_alive = os.getenv("LLM_KEEP_ALIVE", DEFAULT_KEEP_ALIVE)
+        endpoints = [e for e in get_endpoint_pool().endpoints if e.kind != OPENAI]
+        if not endpoints:
+            return {'loaded': True, 'load_ms': None, 'keep_alive': keep_alive}
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+            results = list(pool.map(lambda e: self._warm_up_endpoint(e, keep_alive), endpoints))
+        errors = [r['error'] for r in results if not r['loaded']]
+        loads = [r['load_ms'] for r in results if r['loaded']]
+        warm_up = {'loaded': not errors, 'load_ms': max(loads, default=None), 'keep_alive': keep_alive}
+        if errors:
+            warm_up['error'] = '; '.join(errors)
+        return warm_up
+    
+    def _warm_up_endpoint(self, endpoint: Endpoint, keep_alive: str) -> Dict[str, Any]:
+        logger = get_dagster_logger()
+        model = _model_for(endpoint)
+        started = time.perf_counter()
+        try:
+            response = get_http_client().post(
+                f"{endpoint.url}/api/generate",
+                json={"model": model, "prompt": "", "stream": False, "keep_alive": keep_alive},
+                read_timeout=float(os.getenv("LLM_LOAD_TIMEOUT", "120"))
+            )
+            if response.status_code != 200:
+                raise Exception(f"Ollama API returned status {response.status_code}: {response.text}")
+            load_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(f"Model {model} loaded on {endpoint.url} in {load_ms} ms, kept alive for {keep_alive}")
+            return {'loaded': True, 'load_ms': load_ms}
+        except Exception as e:
+            logger.warning(f"Failed to preload model {model} on {endpoint.url}: {str(e)}")
+            return {'loaded': False, 'error': f"{endpoint.url}: {str(e)}"}
+    
+    def http_stats(self) -> Dict[str, Any]:
+        """Connection reuse and latency counters for each LLM endpoint's host."""
+        stats = {}
+        for endpoint in get_endpoint_pool().endpoints:
+            stats.update(get_http_client().stats(endpoint.host))
+        return stats
+    
+    def endpoint_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests, failures and ejections per LLM endpoint."""
+        return get_endpoint_pool().stats()
+    
+    def endpoint_count(self) -> int:
+        return len(get_endpoint_pool().endpoints)
+    
     def summarize(self, content: str, title: str = "") -> Dict[str, Any]:
         logger = get_dagster_logger()
         
         try:
-            ollama_host = os.getenv("OLLAMA_HOST", "ollama")
-            ollama_port = os.getenv("OLLAMA_PORT", "11434")
-            model = os.getenv("LLM_MODEL", "qwen2.5:0.5b")
+            content, title = _prompt_inputs(content, title)
+            prompt = PROMPT_TEMPLATE.format(word_budget=WORD_BUDGET, title=title, content=content)
             
-            content = content[:2000] if content else "No content available"
-            
-            prompt = f"""Summarize this SEC press release into EXACTLY 3 bullet points.
-Each bullet point should be concise and factual.
-Total word count for all 3 bullets must be ≤50 words.
-
-Title: {title or 'No title'}
-
-Content:
-{content}
-
-Format your response as:
-• First key point
-• Second key point  
-• Third key point"""
-            
-            response = requests.post(
-                f"http://{ollama_host}:{ollama_port}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "num_predict": 150
-                    }
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                summary_text = result.get('response', '').strip()
-                
-                bullet_points = []
-                for line in summary_text.split('\n'):
-                    line = line.strip()
-                    if line and (line.startswith('•') or line.startswith('-') or line.startswith('*')):
-                        bullet_points.append(line.lstrip('•-* ').strip())
-                
-                if len(bullet_points) < 3:
-                    sentences = summary_text.split('.')
-                    bullet_points = [s.strip() for s in sentences if s.strip()][:3]
-                
-                while len(bullet_points) < 3:
-                    bullet_points.append("Detail unavailable")
-                bullet_points = bullet_points[:3]
-                
-                word_count = sum(len(point.split()) for point in bullet_points)
-                
-                return {
-                    'summary': '\n'.join([f'• {point}' for point in bullet_points]),
-                    'bullet_points': bullet_points,
-                    'word_count': word_count,
-                    'model_used': model
-                }
-            else:
-                raise Exception(f"Ollama API returned status {response.status_code}: {response.text}")
+            # A failed request is retried once on each other admitted endpoint
+            pool = get_endpoint_pool()
+            tried = []
+            error = None
+            while True:
+                endpoint = pool.acquire(exclude=tried)
+                if endpoint is None:
+                    break
+                tried.append(endpoint)
+                ok = False
+                try:
+                    result = self._generate(endpoint, _model_for(endpoint), prompt)
+                    ok = True
+                    return dict(result, endpoint=endpoint.url)
+                except Exception as e:
+                    error = e
+                    logger.warning(f"LLM endpoint {endpoint.url} failed: {str(e)}")
+                finally:
+                    pool.release(endpoint, ok)
+            raise error or Exception("No LLM endpoint available; all are ejected")
                 
         except Exception as e:
             logger.error(f"Summarization error: {str(e)}")
@@ -94,5 +333,73 @@ Format your response as:
                 'summary': "• Summary generation failed\n• Error in processing\n• Please retry",
                 'bullet_points': ["Summary generation failed", "Error in processing", "Please retry"],
                 'word_count': 8,
-                'model_used': "failed"
+                'model_used': "failed",
+                'error': str(e)
+            }
+    
+    def _generate(self, endpoint: Endpoint, model: str, prompt: str) -> Dict[str, Any]:
+        # Streaming lets us stop as soon as the bullets we keep are in,
+        # instead of waiting out num_predict
+        stream = os.getenv("LLM_STREAM", "false").lower() == "true"
+        read_timeout = float(os.getenv("LLM_READ_TIMEOUT", "30"))
+        started = time.perf_counter()
+        if endpoint.kind == OPENAI:
+            response = get_http_client().post(
+                f"{endpoint.url}/chat/completions",
+                json={
+                    "model": model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "stream": stream,
+                    "temperature": GENERATE_OPTIONS["temperature"],
+                    "max_tokens": GENERATE_OPTIONS["num_predict"]
+                },
+                headers=_openai_headers(),
+                read_timeout=read_timeout,
+                stream=stream
+            )
+        else:
+            response = get_http_client().post(
+                f"{endpoint.url}/api/generate",
+                json={
+                    "model": model,
+                    "prompt": prompt,
+                    "stream": stream,
+                    "keep_alive": os.getenv("LLM_KEEP_ALIVE", DEFAULT_KEEP_ALIVE),
+                    "options": GENERATE_OPTIONS
+                },
+                read_timeout=read_timeout,
+                stream=stream
+            )
+        
+        if response.status_code != 200:
+            api = "OpenAI-compatible API" if endpoint.kind == OPENAI else "Ollama API"
+            raise Exception(f"{api} returned status {response.status_code}: {response.text}")
+        
+        streamed = {}
+        if stream:
+            decode = _decode_openai if endpoint.kind == OPENAI else _decode_ollama
+            summary_text, first_bullet_ms, stopped_early, final = _read_stream(response, started, decode)
+            streamed = {
+                'first_bullet_ms': round(first_bullet_ms, 1) if first_bullet_ms is not None else None,
+                'stopped_early': stopped_early
             }
+            bullet_points = _parse_bullets(summary_text.strip(), sentence_fallback=not stopped_early)
+        else:
+            final = response.json()
+            if endpoint.kind == OPENAI:
+                summary_text = final['choices'][0]['message']['content'] or ''
+            else:
+                summary_text = final.get('response', '')
+            bullet_points = _parse_bullets(summary_text.strip())
+        
+        word_count = sum(len(point.split()) for point in bullet_points)
+        
+        return {
+            'summary': '\n'.join([f'• {point}' for point in bullet_points]),
+            'bullet_points': bullet_points,
+            'word_count': word_count,
+            'model_used': model,
+            'metrics': _metrics(final, (time.perf_counter() - started) * 1000),
+            **streamed,
+            **_timings(final)
+        }
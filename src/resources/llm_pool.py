@@ -0,0 +1,132 @@
+"""Routing of LLM requests across a pool of Ollama and OpenAI-compatible endpoints.
+
+``LLM_ENDPOINTS`` lists the endpoints, comma separated. ``openai+`` marks an
+OpenAI-compatible server (vLLM, llama.cpp, LM Studio) given by its ``/v1``
+base URL; anything else is an Ollama server. ``=model`` after an entry sets
+the model that endpoint serves; entries without one use LLM_MODEL. Without
+``LLM_ENDPOINTS`` the pool is the single Ollama at OLLAMA_HOST:OLLAMA_PORT.
+
+    LLM_ENDPOINTS=http://llm-1:11434,http://llm-2:11434,openai+http://vllm:8000/v1=Qwen/Qwen2.5-0.5B-Instruct
+
+Every request goes to the admitted endpoint with the fewest requests
+outstanding. An endpoint is ejected after LLM_EJECT_AFTER consecutive
+failures and re-admitted when a trial request succeeds, tried at most once
+every LLM_EJECT_SECONDS.
+"""
+import os
+import itertools
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from src.resources.resilience import CircuitBreaker
+
+OLLAMA = 'ollama'
+OPENAI = 'openai'
+
+
+class Endpoint:
+    """One LLM server with its outstanding-request count and ejection breaker."""
+
+    def __init__(self, url: str, kind: str = OLLAMA, model: Optional[str] = None,
+                 failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.url = url.rstrip('/')
+        self.kind = kind
+        self.model = model
+        self.host = urlparse(self.url).netloc
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+
+def parse_endpoints(spec: str) -> List[Tuple[str, str, Optional[str]]]:
+    """(kind, base URL, model or None) of each comma-separated entry of an LLM_ENDPOINTS value."""
+    endpoints = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        kind, model = OLLAMA, None
+        if '=' in item:
+            item, model = (part.strip() for part in item.split('=', 1))
+        for prefix in (OLLAMA, OPENAI):
+            if item.startswith(f"{prefix}+"):
+                kind, item = prefix, item[len(prefix) + 1:]
+        endpoints.append((kind, item if '://' in item else f"http://{item}", model or None))
+    return endpoints
+
+
+class EndpointPool:
+    """Least-outstanding-requests routing with ejection of failing endpoints."""
+
+    def __init__(self, endpoints: Sequence[Endpoint]):
+        if not endpoints:
+            raise ValueError("An LLM endpoint pool needs at least one endpoint")
+        self.endpoints = list(endpoints)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self, exclude: Sequence[Endpoint] = ()) -> Optional[Endpoint]:
+        """Take the admitted endpoint with the fewest requests outstanding, or None.
+
+        The caller must ``release`` it with the request's outcome.
+        """
+        with self._lock:
+            # Ties go round-robin, so an idle pool spreads requests evenly
+            start = next(self._turn) % len(self.endpoints)
+            rotated = self.endpoints[start:] + self.endpoints[:start]
+            for endpoint in sorted((e for e in rotated if e not in exclude), key=lambda e: e.outstanding):
+                if endpoint.breaker.allow():
+                    endpoint.outstanding += 1
+                    endpoint.requests += 1
+                    return endpoint
+        return None
+
+    def release(self, endpoint: Endpoint, ok: bool):
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.breaker.record_success()
+                return
+            endpoint.failures += 1
+            was_open = endpoint.breaker.state == CircuitBreaker.OPEN
+            endpoint.breaker.record_failure()
+            if not was_open and endpoint.breaker.state == CircuitBreaker.OPEN:
+                endpoint.ejections += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                e.url: {
+                    'kind': e.kind,
+                    'model': e.model,
+                    'state': e.breaker.state,
+                    'outstanding': e.outstanding,
+                    'requests': e.requests,
+                    'failures': e.failures,
+                    'ejections': e.ejections
+                }
+                for e in self.endpoints
+            }
+
+
+_pools: Dict[str, EndpointPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_endpoint_pool() -> EndpointPool:
+    """Process-wide pool for the configured endpoints, so their load and health are shared."""
+    spec = os.getenv("LLM_ENDPOINTS") or f"{os.getenv('OLLAMA_HOST', 'ollama')}:{os.getenv('OLLAMA_PORT', '11434')}"
+    with _pools_lock:
+        if spec not in _pools:
+            _pools[spec] = EndpointPool([
+                Endpoint(
+                    url, kind, model,
+                    failure_threshold=int(os.getenv("LLM_EJECT_AFTER", "3")),
+                    reset_timeout=float(os.getenv("LLM_EJECT_SECONDS", "30"))
+                )
+                for kind, url, model in parse_endpoints(spec)
+            ])
+        return _pools[spec]
@@ -0,0 +1,278 @@
+import re
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+
+def parse_content_bs4(html, url):
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Remove scripts and styles
+    for element in soup(['script', 'style']):
+        element.decompose()
+    
+    # Find title
+    title = None
+    title_selectors = [
+        'h1.article__headline',
+        'h1.page-title',
+        'h1',
+        '.article__headline',
+        'meta[property="og:title"]'
+    ]
+    
+    for selector in title_selectors:
+        if selector.startswith('meta'):
+            elem = soup.find('meta', property='og:title')
+            if elem:
+                title = elem.get('content', '')
+                break
+        else:
+            elem = soup.select_one(selector)
+            if elem:
+                title = elem.get_text(strip=True)
+                break
+    
+    if not title:
+        title = 'No title found'
+    
+    # Get content
+    content = ""
+    content_selectors = [
+        '.article__content',
+        '.article__body',
+        '.field--name-body',
+        'article .content',
+        'main .content',
+        '.region-content'
+    ]
+    
+    for selector in content_selectors:
+        elem = soup.select_one(selector)
+        if elem:
+            paragraphs = elem.find_all(['p', 'li'])
+            if paragraphs:
+                content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+                break
+    
+    if not content:
+        # Fallback: get all text
+        content = soup.get_text(separator='\n', strip=True)
+        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        content = '\n'.join(lines[:100])  # Limit to first 100 lines
+    
+    # Try to extract publication date
+    published_at = None
+    date_selectors = [
+        'time[datetime]',
+        '.date-display-single',
+        '.field--name-field-display-date',
+        'meta[property="article:published_time"]'
+    ]
+    
+    for selector in date_selectors:
+        if selector.startswith('meta'):
+            elem = soup.find('meta', property='article:published_time')
+            if elem:
+                try:
+                    published_at = datetime.fromisoformat(elem.get('content', '').replace('Z', '+00:00'))
+                except:
+                    pass
+        else:
+            elem = soup.select_one(selector)
+            if elem:
+                if elem.get('datetime'):
+                    try:
+                        published_at = datetime.fromisoformat(elem.get('datetime').replace('Z', '+00:00'))
+                    except:
+                        pass
+                else:
+                    # Try to parse text date
+                    date_text = elem.get_text(strip=True)
+                    # Add date parsing logic here if needed
+    
+    return {
+        'title': title[:500],
+        'content': content[:5000],
+        'url': url,
+        'published_at': published_at
+    }
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of the CSS selectors used by parse_content_bs4, compiled
+# once per process. Each list keeps the same priority order.
+_TITLE_XPATHS = [
+    ('text', etree.XPath(f"(//h1[{_has_class('article__headline')}])[1]")),
+    ('text', etree.XPath(f"(//h1[{_has_class('page-title')}])[1]")),
+    ('text', etree.XPath("(//h1)[1]")),
+    ('text', etree.XPath(f"(//*[{_has_class('article__headline')}])[1]")),
+    ('meta', etree.XPath("(//meta[@property='og:title'])[1]"))
+]
+
+_CONTENT_XPATHS = [
+    etree.XPath(f"(//*[{_has_class('article__content')}])[1]"),
+    etree.XPath(f"(//*[{_has_class('article__body')}])[1]"),
+    etree.XPath(f"(//*[{_has_class('field--name-body')}])[1]"),
+    etree.XPath(f"(//article//*[{_has_class('content')}])[1]"),
+    etree.XPath(f"(//main//*[{_has_class('content')}])[1]"),
+    etree.XPath(f"(//*[{_has_class('region-content')}])[1]")
+]
+
+_DATE_XPATHS = [
+    ('element', etree.XPath("(//time[@datetime])[1]")),
+    ('element', etree.XPath(f"(//*[{_has_class('date-display-single')}])[1]")),
+    ('element', etree.XPath(f"(//*[{_has_class('field--name-field-display-date')}])[1]")),
+    ('meta', etree.XPath("(//meta[@property='article:published_time'])[1]"))
+]
+
+_PARAGRAPHS_XPATH = etree.XPath(".//*[self::p or self::li]")
+
+# Start tags before which an open <p> is implicitly closed by libxml2, plus
+# the tags needed to track open <p> and <li> elements
+_BLOCK_TAGS = re.compile(
+    r'<(/?)(p|li|ul|ol|dl|div|table|h[1-6]|pre|form|blockquote|address|hr|fieldset|'
+    r'section|article|header|footer|nav|aside|main|figure|center|menu|dir)(?=[\s/>])',
+    re.IGNORECASE
+)
+_HIDDEN_TEXT_XPATH = etree.XPath("//script | //style | //template")
+
+
+def _text(elem):
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    return ''.join(s.strip() for s in elem.itertext())
+
+
+def _has_implied_end_tags(html):
+    """Whether a <p> or <li> is left open where HTML implies its end tag.
+    
+    libxml2 closes ``<p>b<p>c`` into two paragraphs as browsers do, while
+    html.parser nests the second inside the first, so the engines would
+    extract different paragraphs. Tags in scripts and comments are counted
+    too; a false positive only costs the slower engine.
+    """
+    if not isinstance(html, str):
+        return True
+    stack = []
+    for match in _BLOCK_TAGS.finditer(html):
+        closing, tag = match.group(1), match.group(2).lower()
+        if closing:
+            # Like html.parser, an end tag closes everything opened after its element
+            if tag in stack:
+                del stack[len(stack) - 1 - stack[::-1].index(tag):]
+            continue
+        if 'p' in stack or (tag == 'li' and stack and stack[-1] == 'li'):
+            return True
+        if tag != 'hr':
+            stack.append(tag)
+    return False
+
+
+def _parse_datetime(value):
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except:
+        return None
+
+
+def parse_content_lxml(html, url):
+    """lxml engine producing the same output as parse_content_bs4.
+    
+    Falls back to the BeautifulSoup engine for input libxml2 will not take
+    (empty documents, XML encoding declarations) and for pages that leave a
+    <p> or <li> open where its end tag is implied, which the two parsers
+    build into different trees.
+    """
+    if _has_implied_end_tags(html):
+        return parse_content_bs4(html, url)
+    try:
+        root = etree.HTML(html)
+    except (etree.LxmlError, ValueError):
+        root = None
+    if root is None:
+        return parse_content_bs4(html, url)
+    
+    # BeautifulSoup drops script/style and never reports text under
+    # <template>; blank that text instead of removing nodes so the
+    # surrounding text keeps its boundaries.
+    for hidden in _HIDDEN_TEXT_XPATH(root):
+        hidden.text = None
+        if hidden.tag == 'template':
+            for child in hidden.iterdescendants():
+                child.text = None
+                child.tail = None
+    
+    title = None
+    for kind, xpath in _TITLE_XPATHS:
+        found = xpath(root)
+        if found:
+            title = found[0].get('content', '') if kind == 'meta' else _text(found[0])
+            break
+    
+    if not title:
+        title = 'No title found'
+    
+    content = ""
+    for xpath in _CONTENT_XPATHS:
+        found = xpath(root)
+        if found:
+            paragraphs = _PARAGRAPHS_XPATH(found[0])
+            if paragraphs:
+                content = '\n\n'.join(text for text in (_text(p) for p in paragraphs) if text)
+                break
+    
+    if not content:
+        # Fallback: first 100 non-empty lines of all text
+        lines = []
+        for s in root.itertext():
+            s = s.strip()
+            if not s:
+                continue
+            lines.extend(line.strip() for line in s.split('\n') if line.strip())
+            if len(lines) >= 100:
+                break
+        content = '\n'.join(lines[:100])
+    
+    # Later selectors override earlier ones, as in parse_content_bs4
+    published_at = None
+    for kind, xpath in _DATE_XPATHS:
+        found = xpath(root)
+        if not found:
+            continue
+        value = found[0].get('content', '') if kind == 'meta' else found[0].get('datetime')
+        if kind == 'meta' or value:
+            parsed = _parse_datetime(value)
+            if parsed is not None:
+                published_at = parsed
+    
+    return {
+        'title': title[:500],
+        'content': content[:5000],
+        'url': url,
+        'published_at': published_at
+    }
+
+
+PARSER_ENGINES = {
+    'bs4': parse_content_bs4,
+    'lxml': parse_content_lxml
+}
+
+
+def parse_content(html, url, engine='bs4'):
+    """Parse a press release page with the named engine ('bs4' or 'lxml')."""
+    if engine not in PARSER_ENGINES:
+        raise ValueError(f"Unknown parser engine: {engine}")
+    return PARSER_ENGINES[engine](html, url)
+
+
+def timed_parse(html, url, engine='bs4'):
+    """parse_content plus its duration in seconds, for process-pool workers."""
+    started = time.perf_counter()
+    parsed = parse_content(html, url, engine)
+    return parsed, time.perf_counter() - started
@@ -0,0 +1,269 @@
+"""Monthly-partitioned storage for ``raw_data.press_releases``.
+
+Releases are range-partitioned by ``published_at``, one partition per month,
+with ``press_releases_undated`` as the default partition for releases without
+a date (or with a date no partition exists for yet). PostgreSQL only allows
+unique constraints on a partitioned table when they include the partition key,
+so URL uniqueness and the ids that summaries reference live in the small
+unpartitioned ``raw_data.press_release_keys`` registry. A BEFORE INSERT
+trigger registers each new URL there, assigns the row its id and silently
+drops the row if the URL is already known, which keeps
+``INSERT ... RETURNING`` reporting inserted vs skipped rows. New releases
+are also queued for summarization there.
+
+An existing unpartitioned table is migrated in place the first time
+``ensure_release_storage`` runs.
+"""
+import os
+import gzip
+from datetime import date
+from typing import Any, Dict, List
+
+from src.resources.summary_queue import SUMMARY_QUEUE_DDL
+
+STORAGE_DDL = """
+    CREATE SCHEMA IF NOT EXISTS raw_data;
+
+    CREATE TABLE IF NOT EXISTS raw_data.press_release_keys (
+        id SERIAL PRIMARY KEY,
+        url VARCHAR(500) UNIQUE NOT NULL,
+        url_hash VARCHAR(64) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_press_release_keys_url_hash ON raw_data.press_release_keys (url_hash);
+
+    -- Migrate a pre-partitioning table: keep ids, re-point foreign keys to the registry
+    DO $$
+    BEGIN
+        IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('raw_data.press_releases')) = 'r' THEN
+            ALTER TABLE raw_data.press_releases RENAME TO press_releases_unpartitioned;
+            INSERT INTO raw_data.press_release_keys (id, url, url_hash, created_at)
+            SELECT id, url, url_hash, created_at FROM raw_data.press_releases_unpartitioned
+            ON CONFLICT (url) DO NOTHING;
+            PERFORM setval(pg_get_serial_sequence('raw_data.press_release_keys', 'id'),
+                           GREATEST((SELECT MAX(id) FROM raw_data.press_release_keys), 1));
+        END IF;
+    END $$;
+
+    CREATE TABLE IF NOT EXISTS raw_data.press_releases (
+        id INTEGER NOT NULL,
+        url VARCHAR(500) NOT NULL,
+        url_hash VARCHAR(64) NOT NULL,
+        title TEXT,
+        content TEXT,
+        published_at TIMESTAMP,
+        raw_response JSONB,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) PARTITION BY RANGE (published_at);
+    CREATE TABLE IF NOT EXISTS raw_data.press_releases_undated
+        PARTITION OF raw_data.press_releases DEFAULT;
+
+    CREATE INDEX IF NOT EXISTS idx_press_releases_published
+        ON raw_data.press_releases (published_at DESC NULLS LAST, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_press_releases_id ON raw_data.press_releases (id);
+    CREATE INDEX IF NOT EXISTS idx_press_releases_url_hash ON raw_data.press_releases (url_hash);
+
+    CREATE OR REPLACE FUNCTION raw_data.register_press_release() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        new_id INTEGER;
+    BEGIN
+        -- Rows moved between partitions by an UPDATE already carry their id
+        IF NEW.id IS NOT NULL THEN
+            RETURN NEW;
+        END IF;
+        INSERT INTO raw_data.press_release_keys (url, url_hash, content_hash, simhash)
+        VALUES (NEW.url, NEW.url_hash, NEW.content_hash, NEW.simhash)
+        ON CONFLICT (url) DO NOTHING
+        RETURNING id INTO new_id;
+        IF new_id IS NULL THEN
+            RETURN NULL;
+        END IF;
+        NEW.id := new_id;
+        -- Queue the new release for summarization
+        INSERT INTO raw_data.summary_queue (press_release_id) VALUES (new_id)
+        ON CONFLICT (press_release_id) DO NOTHING;
+        RETURN NEW;
+    END $$;
+
+    CREATE OR REPLACE TRIGGER press_releases_register
+        BEFORE INSERT ON raw_data.press_releases
+        FOR EACH ROW EXECUTE FUNCTION raw_data.register_press_release();
+
+    -- Create the partition for one month, moving any of its rows out of the
+    -- default partition first so the attach does not fail
+    CREATE OR REPLACE FUNCTION raw_data.create_press_release_partition(month DATE) RETURNS BOOLEAN
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        start_at DATE := date_trunc('month', month)::date;
+        end_at DATE := (date_trunc('month', month) + INTERVAL '1 month')::date;
+        part_name TEXT := 'press_releases_' || to_char(month, '"y"YYYY"m"MM');
+        columns TEXT;
+    BEGIN
+        IF to_regclass('raw_data.' || part_name) IS NOT NULL THEN
+            RETURN FALSE;
+        END IF;
+        -- Generated columns (the search vector) are recomputed, not copied
+        SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO columns
+        FROM pg_attribute
+        WHERE attrelid = 'raw_data.press_releases'::regclass AND attnum > 0
+          AND NOT attisdropped AND attgenerated = '';
+        EXECUTE format('CREATE TABLE raw_data.%I (LIKE raw_data.press_releases INCLUDING DEFAULTS INCLUDING GENERATED)', part_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM raw_data.press_releases_undated
+                            WHERE published_at >= %L AND published_at < %L RETURNING *)
+             INSERT INTO raw_data.%I (%s) SELECT %s FROM moved', start_at, end_at, part_name, columns, columns);
+        EXECUTE format(
+            'ALTER TABLE raw_data.press_releases ATTACH PARTITION raw_data.%I FOR VALUES FROM (%L) TO (%L)',
+            part_name, start_at, end_at);
+        RETURN TRUE;
+    END $$;
+
+    CREATE OR REPLACE FUNCTION raw_data.ensure_press_release_partitions(from_month DATE, to_month DATE) RETURNS INTEGER
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        month DATE;
+        created INTEGER := 0;
+    BEGIN
+        FOR month IN SELECT generate_series(date_trunc('month', from_month), date_trunc('month', to_month), INTERVAL '1 month')::date LOOP
+            IF raw_data.create_press_release_partition(month) THEN
+                created := created + 1;
+            END IF;
+        END LOOP;
+        RETURN created;
+    END $$;
+
+    -- Give every dated release that landed in the default partition its own month
+    CREATE OR REPLACE FUNCTION raw_data.split_undated_press_releases() RETURNS INTEGER
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        month DATE;
+        created INTEGER := 0;
+    BEGIN
+        FOR month IN SELECT DISTINCT date_trunc('month', published_at)::date
+                     FROM raw_data.press_releases_undated WHERE published_at IS NOT NULL LOOP
+            IF raw_data.create_press_release_partition(month) THEN
+                created := created + 1;
+            END IF;
+        END LOOP;
+        RETURN created;
+    END $$;
+
+    DO $$
+    BEGIN
+        IF to_regclass('raw_data.press_releases_unpartitioned') IS NOT NULL THEN
+            PERFORM raw_data.ensure_press_release_partitions(m, m)
+            FROM (SELECT DISTINCT date_trunc('month', published_at)::date AS m
+                  FROM raw_data.press_releases_unpartitioned WHERE published_at IS NOT NULL) months;
+            INSERT INTO raw_data.press_releases
+                (id, url, url_hash, title, content, published_at, raw_response, scraped_at, created_at)
+            SELECT id, url, url_hash, title, content, published_at, raw_response, scraped_at, created_at
+            FROM raw_data.press_releases_unpartitioned;
+            DROP TABLE raw_data.press_releases_unpartitioned CASCADE;
+            IF to_regclass('raw_data.press_release_summary') IS NOT NULL THEN
+                ALTER TABLE raw_data.press_release_summary ADD CONSTRAINT press_release_summary_press_release_id_fkey
+                    FOREIGN KEY (press_release_id) REFERENCES raw_data.press_release_keys(id);
+            END IF;
+            IF to_regclass('raw_data.summary_queue') IS NOT NULL THEN
+                ALTER TABLE raw_data.summary_queue ADD CONSTRAINT summary_queue_press_release_id_fkey
+                    FOREIGN KEY (press_release_id) REFERENCES raw_data.press_release_keys(id);
+            END IF;
+        END IF;
+    END $$;
+
+    -- Summarization work queue (src/resources/summary_queue.py). New releases are
+    -- queued by register_press_release; releases stored before it did so are
+    -- queued once, here, and the table comment records that this has happened
+""" + SUMMARY_QUEUE_DDL + """
+    DO $$
+    BEGIN
+        IF obj_description('raw_data.summary_queue'::regclass, 'pg_class') IS DISTINCT FROM 'Queued on insert by register_press_release' THEN
+            IF to_regclass('raw_data.press_release_summary') IS NULL THEN
+                INSERT INTO raw_data.summary_queue (press_release_id)
+                SELECT id FROM raw_data.press_releases
+                ON CONFLICT (press_release_id) DO NOTHING;
+            ELSE
+                INSERT INTO raw_data.summary_queue (press_release_id)
+                SELECT pr.id FROM raw_data.press_releases pr
+                WHERE NOT EXISTS (SELECT 1 FROM raw_data.press_release_summary prs WHERE prs.press_release_id = pr.id)
+                ON CONFLICT (press_release_id) DO NOTHING;
+            END IF;
+            COMMENT ON TABLE raw_data.summary_queue IS 'Queued on insert by register_press_release';
+        END IF;
+    END $$;
+"""
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_release_storage(cursor, today: date = None) -> int:
+    """Create (or migrate to) the partitioned layout and the partitions around today.
+
+    Returns the number of partitions created.
+    """
+    month = (today or date.today()).replace(day=1)
+    ahead = int(os.getenv("RELEASE_PARTITIONS_AHEAD", "2"))
+    cursor.execute(STORAGE_DDL)
+    cursor.execute(
+        "SELECT raw_data.ensure_press_release_partitions(%s, %s)",
+        (add_months(month, -1), add_months(month, ahead))
+    )
+    return cursor.fetchone()[0]
+
+
+def split_undated(cursor) -> int:
+    """Move dated rows out of the default partition into new monthly partitions."""
+    cursor.execute("SELECT raw_data.split_undated_press_releases()")
+    return cursor.fetchone()[0]
+
+
+def list_partitions(cursor) -> List[Dict[str, Any]]:
+    """Attached and detached monthly partitions, oldest first."""
+    cursor.execute("""
+        SELECT c.relname, i.inhrelid IS NOT NULL
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+        WHERE n.nspname = 'raw_data' AND c.relkind = 'r'
+          AND c.relname ~ '^press_releases_y[0-9]{4}m[0-9]{2}$'
+        ORDER BY c.relname
+    """)
+    return [
+        {'name': name, 'month': date(int(name[16:20]), int(name[21:23]), 1), 'attached': attached}
+        for name, attached in cursor.fetchall()
+    ]
+
+
+def detach_partition(cursor, name: str):
+    """Detach a monthly partition, taking its rows out of the stats rollup in the same transaction."""
+    cursor.execute(f"""
+        UPDATE raw_data.release_stats
+        SET total_releases = total_releases - (SELECT COUNT(*) FROM raw_data.{name}),
+            total_summarized = total_summarized - (
+                SELECT COUNT(*) FROM raw_data.press_release_summary prs
+                WHERE prs.press_release_id IN (SELECT id FROM raw_data.{name})
+            );
+        UPDATE raw_data.release_daily_counts d
+        SET releases = d.releases - p.cnt
+        FROM (SELECT published_at::date AS day, COUNT(*) AS cnt FROM raw_data.{name} GROUP BY 1) p
+        WHERE d.day = p.day;
+        DELETE FROM raw_data.release_daily_counts WHERE releases <= 0;
+        ALTER TABLE raw_data.press_releases DETACH PARTITION raw_data.{name};
+        SELECT raw_data.rollup_release_bounds();
+    """)
+
+
+def export_partition(conn, name: str, directory: str) -> str:
+    """Write a detached partition to ``<directory>/<name>.csv.gz`` with COPY; returns the path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.csv.gz")
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        with conn.cursor() as cursor:
+            cursor.copy_expert(f"COPY raw_data.{name} TO STDOUT WITH (FORMAT csv, HEADER true)", f)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,200 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+import requests
+
+
+# Error classes reported as 'error_kind' on failed fetch results
+TRANSIENT = 'transient'
+RATE_LIMITED = 'rate_limited'
+PERMANENT = 'permanent'
+CIRCUIT_OPEN = 'circuit_open'
+BUDGET_EXHAUSTED = 'budget_exhausted'
+
+
+def classify_status(status_code: int) -> str:
+    if status_code == 429:
+        return RATE_LIMITED
+    if status_code >= 500 or status_code == 408:
+        return TRANSIENT
+    return PERMANENT
+
+
+def classify_exception(error: Exception) -> str:
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return TRANSIENT
+    return PERMANENT
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given zero-based attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Credit limiter: ``rate`` tokens per second refill up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1.0, timeout: float = 0.0) -> bool:
+        """Take ``cost`` tokens, waiting up to ``timeout`` seconds for them to refill."""
+        if self.rate <= 0:
+            return True
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return True
+                wait = (cost - self._tokens) / self.rate
+            if cost > self.capacity or now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call is refused; after ``reset_timeout`` seconds a
+    single trial call is let through (half-open) and its outcome closes or
+    re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class AdaptiveLimiter:
+    """In-flight limit for a server of unknown parallelism, tuned AIMD-style.
+
+    The fastest successful call is taken as the unloaded latency. While calls
+    finish within ``tolerance`` times that and the whole limit is in use, the
+    limit grows by one per ``limit`` completions; a slower call (requests
+    queueing on the server) or a failure cuts it by ``backoff``, at most once
+    per ``limit`` completions. ``min_limit == max_limit`` gives a fixed limit.
+    """
+
+    def __init__(self, initial: int = 1, min_limit: int = 1, max_limit: int = 1,
+                 tolerance: float = 1.5, backoff: float = 0.75):
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self._limit = float(min(max(initial, min_limit), self.max_limit))
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._baseline: Optional[float] = None
+        self._completed = 0
+        self._last_decrease = 0
+        self._decreases = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return int(self._limit)
+
+    def acquire(self):
+        """Block until a slot is free under the current limit."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def release(self, latency: float, ok: bool = True):
+        """Return a slot with the call's latency in seconds and outcome."""
+        with self._cond:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            self._completed += 1
+            if ok:
+                self._baseline = latency if self._baseline is None else min(self._baseline, latency)
+            overloaded = not ok or latency > self._baseline * self.tolerance
+            if overloaded:
+                if self._completed - self._last_decrease >= self._limit:
+                    self._limit = max(self.min_limit, self._limit * self.backoff)
+                    self._last_decrease = self._completed
+                    self._decreases += 1
+            elif saturated:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'limit': int(self._limit),
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'max_in_flight': self._max_in_flight,
+                'completed': self._completed,
+                'decreases': self._decreases,
+                'baseline_ms': round(self._baseline * 1000, 1) if self._baseline is not None else None
+            }
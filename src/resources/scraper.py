@@ -1,12 +1,100 @@
 import os
+import time
 import hashlib
-import requests
+import threading
 from datetime import datetime
+from typing import Optional
+from urllib.parse import urlparse
 from dagster import ConfigurableResource, get_dagster_logger
 from bs4 import BeautifulSoup
 
+from src.resources.fetch_modes import get_fetch_mode_tracker
+from src.resources.http_cache import HttpCache, get_http_cache
+from src.resources.http_client import get_http_client
+from src.resources.parsers import parse_content
+from src.resources.resilience import (
+    TRANSIENT, PERMANENT, CIRCUIT_OPEN, BUDGET_EXHAUSTED,
+    CircuitBreaker, TokenBucket,
+    backoff_delay, classify_exception, classify_status, retry_after_seconds
+)
+
+SCRAPINGBEE_API_URL = "https://app.scrapingbee.com/api/v1/"
+
+# Press release links on the SEC listing pages
+LISTING_SELECTORS = [
+    'a[href*="/news/press-release/"]',
+    'a[href*="/newsroom/press-release/"]',
+    'article a[href*="press-release"]',
+    '.views-row a[href*="press-release"]',
+    'td.views-field-field-display-title a',
+    '.view-content a[href*="press-release"]'
+]
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same target host across worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def acquire(self, host: str, rate: float):
+        if rate <= 0:
+            return
+        interval = 1.0 / rate
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_host_limiter = HostRateLimiter()
+_breaker: Optional[CircuitBreaker] = None
+_credit_bucket: Optional[TokenBucket] = None
+_resilience_lock = threading.Lock()
+
+
+def get_scrapingbee_breaker() -> CircuitBreaker:
+    """Process-wide breaker that trips after consecutive ScrapingBee outages."""
+    global _breaker
+    with _resilience_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                failure_threshold=int(os.getenv("SCRAPER_BREAKER_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("SCRAPER_BREAKER_RESET", "60"))
+            )
+        return _breaker
+
+
+def get_credit_bucket() -> TokenBucket:
+    """Process-wide ScrapingBee credit limiter; SCRAPER_CREDITS_PER_MINUTE=0 disables it."""
+    global _credit_bucket
+    with _resilience_lock:
+        if _credit_bucket is None:
+            per_minute = float(os.getenv("SCRAPER_CREDITS_PER_MINUTE", "0"))
+            _credit_bucket = TokenBucket(
+                rate=per_minute / 60,
+                capacity=float(os.getenv("SCRAPER_CREDIT_BURST", str(max(per_minute, 5))))
+            )
+        return _credit_bucket
+
+
+def _cache_key(url: str, render_js: bool) -> str:
+    """Rendered and plain fetches return different pages, so each gets its own cache entry."""
+    return f"{url}#render_js" if render_js else url
+
+
 class ScraperResource(ConfigurableResource):
-    def scrape_url(self, url: str, render_js: bool = False):
+    def scrape_url(self, url: str, render_js: bool = False, revalidate: bool = False, refresh: bool = False):
+        """Fetch a page through ScrapingBee, consulting the on-disk cache first.
+        
+        Cached pages are returned without a request unless ``revalidate``
+        (send a conditional request and compare content hashes, used for
+        listing pages) or ``refresh`` (ignore the cache entirely) is set.
+        """
         logger = get_dagster_logger()
         api_key = os.getenv("SCRAPER_API_KEY", "")
         
@@ -14,6 +102,26 @@ class ScraperResource(ConfigurableResource):
             logger.error("SCRAPER_API_KEY not set")
             return {'success': False, 'error': 'No API key'}
         
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        cache = get_http_cache()
+        refresh = refresh or os.getenv("SCRAPER_CACHE_REFRESH", "false").lower() == "true"
+        cache_key = _cache_key(url, render_js)
+        cached = cache.get(cache_key) if cache and not refresh else None
+        
+        if cached and not revalidate:
+            cache.record('hits')
+            logger.info(f"Cache hit: {url}")
+            return {
+                'success': True,
+                'url': url,
+                'url_hash': url_hash,
+                'content': cached['body'],
+                'content_hash': cached['content_hash'],
+                'scraped_at': datetime.utcfromtimestamp(cached['stored_at']).isoformat(),
+                'from_cache': True,
+                'unchanged': True
+            }
+        
         logger.info(f"Scraping: {url}")
         
         params = {
@@ -23,38 +131,146 @@ class ScraperResource(ConfigurableResource):
             'premium_proxy': 'false',
             'country_code': 'us'
         }
+        headers = {}
+        if cached and (cached.get('etag') or cached.get('last_modified')):
+            # ScrapingBee forwards Spb- prefixed headers to the target site
+            params['forward_headers'] = 'true'
+            params['transparent_status_code'] = 'true'
+            if cached.get('etag'):
+                headers['Spb-If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['Spb-If-Modified-Since'] = cached['last_modified']
         
-        try:
-            response = requests.get(
-                "https://app.scrapingbee.com/api/v1/",
-                params=params,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                return {
-                    'success': True,
-                    'url': url,
-                    'url_hash': hashlib.sha256(url.encode()).hexdigest(),
-                    'content': response.text,
-                    'scraped_at': datetime.utcnow().isoformat()
-                }
-            else:
-                return {
-                    'success': False,
-                    'url': url,
-                    'error': f"Status code: {response.status_code}"
-                }
-        except Exception as e:
+        response, failure = self._request_with_retries(url, params, headers, render_js)
+        if failure:
+            return {'success': False, 'url': url, **failure}
+        
+        if response.status_code == 304 and cached:
+            cache.record('not_modified')
             return {
-                'success': False,
+                'success': True,
                 'url': url,
-                'error': str(e)
+                'url_hash': url_hash,
+                'content': cached['body'],
+                'content_hash': cached['content_hash'],
+                'scraped_at': datetime.utcnow().isoformat(),
+                'from_cache': True,
+                'unchanged': True
             }
+        
+        if response.status_code != 200:
+            return {'success': False, 'url': url, 'error': f"Status code: {response.status_code}", 'error_kind': PERMANENT, 'attempts': 1}
+        
+        content_hash = HttpCache.content_hash(response.text)
+        if cache:
+            cache.record('misses')
+            if cached and cached['content_hash'] == content_hash:
+                cache.record('not_modified')
+            cache.put(
+                cache_key,
+                response.text,
+                etag=response.headers.get('Spb-ETag') or response.headers.get('ETag'),
+                last_modified=response.headers.get('Spb-Last-Modified') or response.headers.get('Last-Modified')
+            )
+        return {
+            'success': True,
+            'url': url,
+            'url_hash': url_hash,
+            'content': response.text,
+            'content_hash': content_hash,
+            'scraped_at': datetime.utcnow().isoformat(),
+            'from_cache': False,
+            'unchanged': bool(cached) and cached['content_hash'] == content_hash
+        }
+    
+    def _request_with_retries(self, url, params, headers, render_js):
+        """Send a ScrapingBee request, retrying transient and rate-limited failures.
+        
+        Returns ``(response, None)`` once ScrapingBee answers 200 or 304, or
+        ``(None, failure)`` where failure holds the error, its classified
+        ``error_kind`` and the number of attempts made.
+        """
+        logger = get_dagster_logger()
+        max_retries = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+        backoff_base = float(os.getenv("SCRAPER_BACKOFF_BASE", "1"))
+        backoff_max = float(os.getenv("SCRAPER_BACKOFF_MAX", "30"))
+        # Requests per second allowed against a single target host
+        host_rate = float(os.getenv("SCRAPER_HOST_RATE", "5"))
+        # ScrapingBee charges 5 credits for a JS render, 1 for a plain fetch
+        credits = 5 if render_js else 1
+        breaker = get_scrapingbee_breaker()
+        tracker = get_fetch_mode_tracker()
+        
+        error, kind = None, None
+        for attempt in range(max_retries + 1):
+            if not breaker.allow():
+                return None, {'error': 'ScrapingBee circuit open', 'error_kind': CIRCUIT_OPEN, 'attempts': attempt}
+            if not get_credit_bucket().acquire(credits, timeout=backoff_max):
+                return None, {'error': 'Credit budget exhausted', 'error_kind': BUDGET_EXHAUSTED, 'attempts': attempt}
+            _host_limiter.acquire(urlparse(url).netloc, host_rate)
+            
+            retry_after = None
+            fetch_started = time.perf_counter()
+            try:
+                response = get_http_client().get(
+                    os.getenv("SCRAPER_API_URL", SCRAPINGBEE_API_URL),
+                    params=params,
+                    headers=headers,
+                    read_timeout=float(os.getenv("SCRAPER_READ_TIMEOUT", "30"))
+                )
+                ok = response.status_code in (200, 304)
+                tracker.record_fetch(render_js, time.perf_counter() - fetch_started, ok)
+                if ok:
+                    breaker.record_success()
+                    return response, None
+                kind = classify_status(response.status_code)
+                error = f"Status code: {response.status_code}"
+                retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+            except Exception as e:
+                tracker.record_fetch(render_js, time.perf_counter() - fetch_started, False)
+                kind = classify_exception(e)
+                error = str(e)
+            
+            # Only outages count against the breaker; any other answer shows
+            # the provider is up.
+            if kind == TRANSIENT:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            
+            if kind == PERMANENT or attempt == max_retries:
+                break
+            delay = retry_after if retry_after is not None else backoff_delay(attempt, backoff_base, backoff_max)
+            if delay > backoff_max:
+                logger.warning(f"Retry-After of {delay:.0f}s for {url} exceeds SCRAPER_BACKOFF_MAX, giving up")
+                break
+            logger.warning(f"{kind} error for {url} ({error}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+        
+        return None, {'error': error, 'error_kind': kind, 'attempts': attempt + 1}
+    
+    def circuit_state(self):
+        """State of the ScrapingBee circuit breaker: closed, open or half_open."""
+        return get_scrapingbee_breaker().state
+    
+    def cache_stats(self):
+        """Hit, miss, not-modified and eviction counters of the page cache."""
+        cache = get_http_cache()
+        return cache.stats() if cache else {}
     
-    def get_sec_urls(self, limit=50):
-        """Get actual SEC press release URLs from the listing page."""
+    def http_stats(self):
+        """Connection reuse and latency counters for the ScrapingBee host."""
+        return get_http_client().stats(urlparse(os.getenv("SCRAPER_API_URL", SCRAPINGBEE_API_URL)).netloc)
+    
+    def get_sec_urls(self, limit=50, known_urls=None):
+        """Get actual SEC press release URLs from the listing page.
+        
+        When ``known_urls`` is given (a callable returning the subset of the
+        passed URLs that are already stored), paging stops at the first
+        listing page whose press releases are all known.
+        """
         logger = get_dagster_logger()
+        incremental = known_urls is not None and os.getenv("SCRAPER_INCREMENTAL", "true").lower() == "true"
         urls = []
         page = 0
         
@@ -62,56 +278,25 @@ class ScraperResource(ConfigurableResource):
             listing_url = f"https://www.sec.gov/newsroom/press-releases?page={page}"
             logger.info(f"Fetching listing page: {listing_url}")
             
-            result = self.scrape_url(listing_url, render_js=True)
+            result, listing = self._fetch_listing(listing_url)
             
             if result['success']:
-                soup = BeautifulSoup(result['content'], 'html.parser')
+                page_urls = [href for href in listing['links'] if href not in urls]
                 
-                # Find press release links
-                selectors = [
-                    'a[href*="/news/press-release/"]',
-                    'a[href*="/newsroom/press-release/"]',
-                    'article a[href*="press-release"]',
-                    '.views-row a[href*="press-release"]',
-                    'td.views-field-field-display-title a',
-                    '.view-content a[href*="press-release"]'
-                ]
-                
-                found_on_page = False
-                for selector in selectors:
-                    links = soup.select(selector)
-                    if links:
-                        logger.info(f"Found {len(links)} links with selector: {selector}")
-                        for link in links:
-                            href = link.get('href', '')
-                            if href:
-                                if not href.startswith('http'):
-                                    href = f"https://www.sec.gov{href}"
-                                # Only add if it's a press release URL and not already in list
-                                if 'press-release' in href and href not in urls:
-                                    urls.append(href)
-                                    found_on_page = True
-                                    if len(urls) >= limit:
-                                        break
-                        if len(urls) >= limit:
-                            break
-                
-                if not found_on_page:
+                if not page_urls:
                     logger.warning(f"No links found on page {page}")
                     # Try to find any links that might be press releases
-                    all_links = soup.find_all('a', href=True)
-                    for link in all_links:
-                        href = link.get('href', '')
-                        if '/2025-' in href or '/2024-' in href:  # Look for year patterns
-                            if not href.startswith('http'):
-                                href = f"https://www.sec.gov{href}"
-                            if href not in urls:
-                                urls.append(href)
-                                found_on_page = True
-                                if len(urls) >= limit:
-                                    break
+                    page_urls = [href for href in listing['fallback_links'] if href not in urls]
                     
-                    if not found_on_page:
+                    if not page_urls:
+                        break
+                
+                urls.extend(page_urls[:limit - len(urls)])
+                
+                if incremental:
+                    known = known_urls(page_urls)
+                    if len(known) >= len(page_urls):
+                        logger.info(f"All {len(page_urls)} press releases on page {page} are already stored, stopping")
                         break
                     
                 page += 1
@@ -136,96 +321,88 @@ class ScraperResource(ConfigurableResource):
         logger.info(f"Returning {len(urls[:limit])} URLs")
         return urls[:limit]
     
-    def parse_content(self, html, url):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove scripts and styles
-        for element in soup(['script', 'style']):
-            element.decompose()
-        
-        # Find title
-        title = None
-        title_selectors = [
-            'h1.article__headline',
-            'h1.page-title',
-            'h1',
-            '.article__headline',
-            'meta[property="og:title"]'
-        ]
-        
-        for selector in title_selectors:
-            if selector.startswith('meta'):
-                elem = soup.find('meta', property='og:title')
-                if elem:
-                    title = elem.get('content', '')
-                    break
-            else:
-                elem = soup.select_one(selector)
-                if elem:
-                    title = elem.get_text(strip=True)
-                    break
+    def _fetch_listing(self, listing_url):
+        """Fetch and parse a listing page, rendering JavaScript only when needed.
         
-        if not title:
-            title = 'No title found'
-        
-        # Get content
-        content = ""
-        content_selectors = [
-            '.article__content',
-            '.article__body',
-            '.field--name-body',
-            'article .content',
-            'main .content',
-            '.region-content'
-        ]
-        
-        for selector in content_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                paragraphs = elem.find_all(['p', 'li'])
-                if paragraphs:
-                    content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    break
+        A plain fetch is tried first unless the URL's pattern is known to need
+        rendering; if none of the press release selectors match, the page is
+        fetched again with render_js and the pattern is remembered.
+        """
+        tracker = get_fetch_mode_tracker()
+        render_js = tracker.needs_render(listing_url)
+        
+        result = self.scrape_url(listing_url, render_js=render_js, revalidate=True)
+        if not result['success']:
+            return result, None
+        listing = self._parsed_listing(listing_url, result, render_js)
         
-        if not content:
-            # Fallback: get all text
-            content = soup.get_text(separator='\n', strip=True)
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            content = '\n'.join(lines[:100])  # Limit to first 100 lines
-        
-        # Try to extract publication date
-        published_at = None
-        date_selectors = [
-            'time[datetime]',
-            '.date-display-single',
-            '.field--name-field-display-date',
-            'meta[property="article:published_time"]'
-        ]
-        
-        for selector in date_selectors:
-            if selector.startswith('meta'):
-                elem = soup.find('meta', property='article:published_time')
-                if elem:
-                    try:
-                        published_at = datetime.fromisoformat(elem.get('content', '').replace('Z', '+00:00'))
-                    except:
-                        pass
+        if not render_js:
+            if listing['links']:
+                tracker.record_probe(listing_url, plain_matched=True)
             else:
-                elem = soup.select_one(selector)
-                if elem:
-                    if elem.get('datetime'):
-                        try:
-                            published_at = datetime.fromisoformat(elem.get('datetime').replace('Z', '+00:00'))
-                        except:
-                            pass
-                    else:
-                        # Try to parse text date
-                        date_text = elem.get_text(strip=True)
-                        # Add date parsing logic here if needed
+                get_dagster_logger().info(f"No press release links in plain fetch, rendering JavaScript: {listing_url}")
+                result = self.scrape_url(listing_url, render_js=True, revalidate=True)
+                if not result['success']:
+                    return result, None
+                listing = self._parsed_listing(listing_url, result, render_js=True)
+                # Only remember the pattern if rendering is what made the links appear
+                if listing['links']:
+                    tracker.record_probe(listing_url, plain_matched=False)
         
-        return {
-            'title': title[:500],
-            'content': content[:5000],
-            'url': url,
-            'published_at': published_at
+        return result, listing
+    
+    def fetch_mode_stats(self):
+        """Per-mode latency and request counts, plus plain-fetch hits and escalations."""
+        return get_fetch_mode_tracker().stats()
+    
+    def _parsed_listing(self, listing_url, result, render_js=False):
+        """Links on a listing page, reusing the cached parse when the body hash is unchanged."""
+        cache = get_http_cache()
+        cache_key = _cache_key(listing_url, render_js)
+        if cache and result.get('unchanged'):
+            cached = cache.get(cache_key)
+            if cached and cached.get('parsed_hash') == result.get('content_hash'):
+                get_dagster_logger().info(f"Listing unchanged, reusing parsed links: {listing_url}")
+                return {'links': cached['links'], 'fallback_links': cached['fallback_links']}
+        
+        soup = BeautifulSoup(result['content'], 'html.parser')
+        listing = {
+            'links': self._listing_links(soup),
+            'fallback_links': self._fallback_listing_links(soup)
         }
+        if cache and result.get('content_hash'):
+            cache.annotate(cache_key, parsed_hash=result['content_hash'], **listing)
+        return listing
+    
+    def _listing_links(self, soup):
+        """Press release links on a listing page, in selector priority order."""
+        logger = get_dagster_logger()
+        links = []
+        for selector in LISTING_SELECTORS:
+            matched = soup.select(selector)
+            if matched:
+                logger.info(f"Found {len(matched)} links with selector: {selector}")
+            for link in matched:
+                href = link.get('href', '')
+                if href:
+                    if not href.startswith('http'):
+                        href = f"https://www.sec.gov{href}"
+                    # Only add if it's a press release URL and not already in list
+                    if 'press-release' in href and href not in links:
+                        links.append(href)
+        return links
+    
+    def _fallback_listing_links(self, soup):
+        """Links that look like press releases by their year pattern."""
+        links = []
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '')
+            if '/2025-' in href or '/2024-' in href:  # Look for year patterns
+                if not href.startswith('http'):
+                    href = f"https://www.sec.gov{href}"
+                if href not in links:
+                    links.append(href)
+        return links
+    
+    def parse_content(self, html, url):
+        return parse_content(html, url, os.getenv("PARSER_ENGINE", "bs4"))
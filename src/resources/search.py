@@ -0,0 +1,114 @@
+"""Full-text search over press releases and their summaries.
+
+Both tables carry a generated ``search_vector`` column with a GIN index, so
+the vectors are maintained by PostgreSQL on every insert and update made by
+the assets. Titles weigh most, then summaries, then article text. A search
+matches each table through its own index, ranks the union of matches with
+``ts_rank`` and only builds ``ts_headline`` snippets for the returned page.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+RELEASE_SEARCH_DDL = """
+    ALTER TABLE raw_data.press_releases ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(content, '')), 'C')
+        ) STORED;
+    CREATE INDEX IF NOT EXISTS idx_press_releases_search
+        ON raw_data.press_releases USING GIN (search_vector);
+"""
+
+SUMMARY_SEARCH_DDL = """
+    ALTER TABLE raw_data.press_release_summary ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (setweight(to_tsvector('english', summary), 'B')) STORED;
+    CREATE INDEX IF NOT EXISTS idx_press_release_summary_search
+        ON raw_data.press_release_summary USING GIN (search_vector);
+"""
+
+SEARCH_QUERY = """
+    WITH q AS (SELECT websearch_to_tsquery('english', %(q)s) AS query),
+    matches AS (
+        SELECT pr.id FROM raw_data.press_releases pr, q
+        WHERE pr.search_vector @@ q.query {date_filter}
+        UNION
+        SELECT prs.press_release_id FROM raw_data.press_release_summary prs, q
+        WHERE prs.search_vector @@ q.query
+    ),
+    ranked AS (
+        SELECT pr.id, pr.title, pr.published_at, pr.url, pr.content, pr.search_vector,
+               prs.summary,
+               ts_rank(pr.search_vector || COALESCE(prs.search_vector, ''::tsvector), q.query) AS rank
+        FROM matches m
+        JOIN raw_data.press_releases pr ON pr.id = m.id
+        LEFT JOIN raw_data.press_release_summary prs ON prs.press_release_id = pr.id
+        CROSS JOIN q
+        -- Re-check against the whole release so excluded terms apply across both tables
+        WHERE (pr.search_vector || COALESCE(prs.search_vector, ''::tsvector)) @@ q.query {date_filter}
+        ORDER BY rank DESC, pr.published_at DESC NULLS LAST
+        LIMIT %(limit)s
+    )
+    -- Terms of an AND query may be split between title, summary and text, so
+    -- snippets highlight any of the query's lexemes rather than only full
+    -- matches; querytree leaves out negated terms, which are never highlighted
+    SELECT r.title, r.published_at, r.url, r.summary,
+           ts_headline('english',
+                       CASE WHEN r.search_vector @@ q.any_term OR r.summary IS NULL THEN r.content ELSE r.summary END,
+                       q.any_term, %(headline_options)s) AS snippet,
+           r.rank
+    FROM ranked r
+    CROSS JOIN (
+        SELECT COALESCE(
+            (SELECT string_agg(DISTINCT '''' || m[1] || '''', ' | ')::tsquery
+             FROM regexp_matches(querytree(q.query), '''((?:[^'']|'''')*)''', 'g') AS m),
+            q.query
+        ) AS any_term
+        FROM q
+    ) q
+    ORDER BY r.rank DESC, r.published_at DESC NULLS LAST
+"""
+
+HEADLINE_OPTIONS = "StartSel=<b>, StopSel=</b>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def ensure_release_search(cursor):
+    """Add the generated search vector and GIN index to press_releases."""
+    cursor.execute(RELEASE_SEARCH_DDL)
+
+
+def ensure_summary_search(cursor):
+    """Add the generated search vector and GIN index to press_release_summary."""
+    cursor.execute(SUMMARY_SEARCH_DDL)
+
+
+def search_releases(cursor, q: str, since: Optional[date] = None, until: Optional[date] = None,
+                    limit: int = 20) -> List[Dict[str, Any]]:
+    """Releases matching a web-search style query, best match first.
+
+    ``since`` and ``until`` bound the publication date (inclusive) and prune
+    partitions; releases without a date are excluded when either is set.
+    """
+    # Bounds are only added when given: a NULL-guarded predicate would stop partition pruning
+    date_filter = ''
+    if since:
+        date_filter += ' AND pr.published_at >= %(since)s'
+    if until:
+        date_filter += " AND pr.published_at < %(until)s::date + 1"
+    cursor.execute(SEARCH_QUERY.format(date_filter=date_filter), {
+        'q': q,
+        'since': since,
+        'until': until,
+        'limit': limit,
+        'headline_options': HEADLINE_OPTIONS
+    })
+    return [
+        {
+            'title': title,
+            'published_at': published_at,
+            'url': url,
+            'summary': summary,
+            'snippet': snippet,
+            'rank': float(rank)
+        }
+        for title, published_at, url, summary, snippet, rank in cursor.fetchall()
+    ]
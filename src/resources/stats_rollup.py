@@ -0,0 +1,204 @@
+"""Trigger-maintained rollup of press release counts.
+
+``raw_data.release_stats`` holds a single row of totals and
+``raw_data.release_daily_counts`` one row per publication day. Statement-level
+triggers with transition tables update both in the same transaction as each
+insert, update or delete, so readers get the figures from O(1) rows instead of
+scanning ``press_releases`` and ``press_release_summary``.
+"""
+from typing import Any, Dict, Optional
+
+RELEASE_ROLLUP_DDL = """
+    CREATE TABLE IF NOT EXISTS raw_data.release_stats (
+        id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+        total_releases BIGINT NOT NULL DEFAULT 0,
+        total_summarized BIGINT,
+        oldest_release TIMESTAMP,
+        newest_release TIMESTAMP,
+        last_scraped TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS raw_data.release_daily_counts (
+        day DATE PRIMARY KEY,
+        releases INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE OR REPLACE FUNCTION raw_data.rollup_release_insert() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE raw_data.release_stats s
+        SET total_releases = s.total_releases + n.cnt,
+            oldest_release = LEAST(s.oldest_release, n.oldest),
+            newest_release = GREATEST(s.newest_release, n.newest),
+            last_scraped = GREATEST(s.last_scraped, n.last_scraped)
+        FROM (
+            SELECT COUNT(*) AS cnt, MIN(published_at) AS oldest,
+                   MAX(published_at) AS newest, MAX(scraped_at) AS last_scraped
+            FROM new_rows
+        ) n
+        WHERE n.cnt > 0;
+
+        INSERT INTO raw_data.release_daily_counts (day, releases)
+        SELECT published_at::date, COUNT(*) FROM new_rows
+        WHERE published_at IS NOT NULL
+        GROUP BY 1
+        ON CONFLICT (day) DO UPDATE SET releases = raw_data.release_daily_counts.releases + EXCLUDED.releases;
+        RETURN NULL;
+    END $$;
+
+    CREATE OR REPLACE FUNCTION raw_data.rollup_release_delete() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE raw_data.release_stats s
+        SET total_releases = s.total_releases - (SELECT COUNT(*) FROM old_rows);
+
+        UPDATE raw_data.release_daily_counts d
+        SET releases = d.releases - o.cnt
+        FROM (
+            SELECT published_at::date AS day, COUNT(*) AS cnt FROM old_rows
+            WHERE published_at IS NOT NULL GROUP BY 1
+        ) o
+        WHERE d.day = o.day;
+        DELETE FROM raw_data.release_daily_counts WHERE releases <= 0;
+
+        PERFORM raw_data.rollup_release_bounds();
+        RETURN NULL;
+    END $$;
+
+    CREATE OR REPLACE FUNCTION raw_data.rollup_release_update() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        -- Only publication dates move between days; totals are unchanged
+        UPDATE raw_data.release_daily_counts d
+        SET releases = d.releases - o.cnt
+        FROM (
+            SELECT published_at::date AS day, COUNT(*) AS cnt FROM old_rows
+            WHERE published_at IS NOT NULL GROUP BY 1
+        ) o
+        WHERE d.day = o.day;
+
+        INSERT INTO raw_data.release_daily_counts (day, releases)
+        SELECT published_at::date, COUNT(*) FROM new_rows
+        WHERE published_at IS NOT NULL
+        GROUP BY 1
+        ON CONFLICT (day) DO UPDATE SET releases = raw_data.release_daily_counts.releases + EXCLUDED.releases;
+        DELETE FROM raw_data.release_daily_counts WHERE releases <= 0;
+
+        PERFORM raw_data.rollup_release_bounds();
+        RETURN NULL;
+    END $$;
+
+    -- Oldest and newest dates cannot be decremented, so they are re-read
+    -- through the per-partition published_at indexes after deletes and updates
+    CREATE OR REPLACE FUNCTION raw_data.rollup_release_bounds() RETURNS void
+    LANGUAGE sql AS $$
+        UPDATE raw_data.release_stats
+        SET oldest_release = (SELECT MIN(published_at) FROM raw_data.press_releases),
+            newest_release = (SELECT MAX(published_at) FROM raw_data.press_releases),
+            last_scraped = (SELECT MAX(scraped_at) FROM raw_data.press_releases);
+    $$;
+
+    CREATE INDEX IF NOT EXISTS idx_press_releases_scraped_at
+        ON raw_data.press_releases (scraped_at);
+
+    CREATE OR REPLACE TRIGGER press_releases_rollup_insert
+        AFTER INSERT ON raw_data.press_releases
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_release_insert();
+    CREATE OR REPLACE TRIGGER press_releases_rollup_delete
+        AFTER DELETE ON raw_data.press_releases
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_release_delete();
+    CREATE OR REPLACE TRIGGER press_releases_rollup_update
+        AFTER UPDATE ON raw_data.press_releases
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_release_update();
+
+    -- First run only: seed the rollup from a full scan, with writers blocked
+    -- so no insert falls between the scan and the triggers
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM raw_data.release_stats) THEN
+            LOCK TABLE raw_data.press_releases IN SHARE ROW EXCLUSIVE MODE;
+            INSERT INTO raw_data.release_stats (total_releases, oldest_release, newest_release, last_scraped)
+            SELECT COUNT(*), MIN(published_at), MAX(published_at), MAX(scraped_at)
+            FROM raw_data.press_releases
+            ON CONFLICT (id) DO NOTHING;
+            INSERT INTO raw_data.release_daily_counts (day, releases)
+            SELECT published_at::date, COUNT(*) FROM raw_data.press_releases
+            WHERE published_at IS NOT NULL
+            GROUP BY 1
+            ON CONFLICT (day) DO NOTHING;
+        END IF;
+    END $$;
+"""
+
+SUMMARY_ROLLUP_DDL = """
+    CREATE OR REPLACE FUNCTION raw_data.rollup_summary_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE raw_data.release_stats SET total_summarized = total_summarized + (SELECT COUNT(*) FROM new_rows);
+        ELSE
+            UPDATE raw_data.release_stats SET total_summarized = total_summarized - (SELECT COUNT(*) FROM old_rows);
+        END IF;
+        RETURN NULL;
+    END $$;
+
+    CREATE OR REPLACE TRIGGER press_release_summary_rollup_insert
+        AFTER INSERT ON raw_data.press_release_summary
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_summary_change();
+    CREATE OR REPLACE TRIGGER press_release_summary_rollup_delete
+        AFTER DELETE ON raw_data.press_release_summary
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION raw_data.rollup_summary_change();
+
+    DO $$
+    BEGIN
+        IF (SELECT total_summarized IS NULL FROM raw_data.release_stats) THEN
+            LOCK TABLE raw_data.press_release_summary IN SHARE ROW EXCLUSIVE MODE;
+            UPDATE raw_data.release_stats
+            SET total_summarized = (SELECT COUNT(*) FROM raw_data.press_release_summary)
+            WHERE total_summarized IS NULL;
+        END IF;
+    END $$;
+"""
+
+READ_STATS_QUERY = """
+    SELECT s.total_releases,
+           COALESCE(s.total_summarized, 0),
+           s.oldest_release,
+           s.newest_release,
+           s.last_scraped,
+           (SELECT COALESCE(SUM(releases), 0) FROM raw_data.release_daily_counts
+            WHERE day >= CURRENT_DATE - %s)
+    FROM raw_data.release_stats s
+"""
+
+
+def ensure_release_rollup(cursor):
+    """Create the rollup tables and press_releases triggers, seeding them on first use."""
+    cursor.execute(RELEASE_ROLLUP_DDL)
+
+
+def ensure_summary_rollup(cursor):
+    """Create the press_release_summary triggers; needs ensure_release_rollup first."""
+    cursor.execute(SUMMARY_ROLLUP_DDL)
+
+
+def read_stats(cursor, recent_days: int = 30) -> Optional[Dict[str, Any]]:
+    """Current totals from the rollup, or None before it has been seeded."""
+    cursor.execute(READ_STATS_QUERY, (recent_days,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    total_releases, total_summarized, oldest, newest, last_scraped, recent = row
+    return {
+        'total_releases': total_releases,
+        'total_summarized': total_summarized,
+        'unsummarized': max(0, total_releases - total_summarized),
+        'oldest_release': oldest,
+        'newest_release': newest,
+        'last_scraped': last_scraped,
+        'recent_releases': recent
+    }
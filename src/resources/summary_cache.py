@@ -0,0 +1,136 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from dagster import get_dagster_logger
+
+# Shared by every SummaryCache in the process, keyed like the table
+_lru: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+_lru_lock = threading.Lock()
+
+
+class SummaryCache:
+    """Summaries keyed by (model, prompt version, content hash).
+
+    Backed by ``raw_data.summary_cache`` with an in-process LRU in front, so
+    re-ingested releases and rebuilds of ``press_release_summary`` skip Ollama
+    whenever the model and prompt would see the same input again. Entries of
+    any other model or prompt version are deleted by ``invalidate_stale``.
+    """
+
+    def __init__(self, postgres, model: str, prompt_version: str, lru_size: int = None):
+        self.postgres = postgres
+        self.model = model
+        self.prompt_version = prompt_version
+        self.lru_size = lru_size if lru_size is not None else int(os.getenv("SUMMARY_CACHE_LRU_SIZE", "1024"))
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def ensure_table(self):
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS raw_data.summary_cache (
+                        model VARCHAR(100) NOT NULL,
+                        prompt_version VARCHAR(20) NOT NULL,
+                        content_hash VARCHAR(64) NOT NULL,
+                        summary TEXT NOT NULL,
+                        bullet_points JSONB,
+                        word_count INTEGER,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (model, prompt_version, content_hash)
+                    );
+                """)
+
+    def invalidate_stale(self) -> int:
+        """Drop entries made with another model or prompt version; returns how many."""
+        with _lru_lock:
+            for key in [k for k in _lru if k[:2] != (self.model, self.prompt_version)]:
+                del _lru[key]
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    DELETE FROM raw_data.summary_cache
+                    WHERE model <> %s OR prompt_version <> %s
+                """, (self.model, self.prompt_version))
+                return cursor.rowcount
+
+    def get(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        key = (self.model, self.prompt_version, content_hash)
+        with _lru_lock:
+            entry = _lru.get(key)
+            if entry is not None:
+                _lru.move_to_end(key)
+        if entry is not None:
+            self.memory_hits += 1
+            return entry
+
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT summary, bullet_points, word_count
+                    FROM raw_data.summary_cache
+                    WHERE model = %s AND prompt_version = %s AND content_hash = %s
+                """, key)
+                row = cursor.fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        summary, bullet_points, word_count = row
+        entry = {
+            'summary': summary,
+            'bullet_points': json.loads(bullet_points) if isinstance(bullet_points, str) else bullet_points,
+            'word_count': word_count,
+            'model_used': self.model
+        }
+        self.db_hits += 1
+        self._remember(key, entry)
+        return entry
+
+    def put(self, content_hash: str, result: Dict[str, Any]):
+        """Store a fresh summary; failed placeholders are never cached.
+
+        The cache is best effort: a failed write is logged, not raised.
+        """
+        if result.get('model_used') != self.model:
+            return
+        key = (self.model, self.prompt_version, content_hash)
+        entry = {k: result[k] for k in ('summary', 'bullet_points', 'word_count', 'model_used')}
+        self._remember(key, entry)
+        try:
+            with self.postgres.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        INSERT INTO raw_data.summary_cache
+                            (model, prompt_version, content_hash, summary, bullet_points, word_count)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (model, prompt_version, content_hash) DO NOTHING
+                    """, key + (entry['summary'], json.dumps(entry['bullet_points']), entry['word_count']))
+                    self.stored += cursor.rowcount
+        except Exception as e:
+            get_dagster_logger().warning(f"Failed to cache summary {content_hash[:12]}: {str(e)}")
+
+    def _remember(self, key: Tuple[str, str, str], entry: Dict[str, Any]):
+        if self.lru_size <= 0:
+            return
+        with _lru_lock:
+            _lru[key] = entry
+            _lru.move_to_end(key)
+            while len(_lru) > self.lru_size:
+                _lru.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            'model': self.model,
+            'prompt_version': self.prompt_version,
+            'memory_hits': self.memory_hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'stored': self.stored,
+            'hit_rate': round((self.memory_hits + self.db_hits) / lookups, 3) if lookups else None
+        }
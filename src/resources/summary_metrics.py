@@ -0,0 +1,83 @@
+"""Per-summary LLM performance telemetry.
+
+Every summary generated by the LLM gets a row in ``raw_data.summary_metrics``:
+pipeline-side latency plus the durations and token counts Ollama reports
+(``total_duration``, ``load_duration``, ``prompt_eval_count``,
+``prompt_eval_duration``, ``eval_count``, ``eval_duration``). Rows carry the
+run, model and endpoint, so throughput can be compared across runs and
+model changes. A stream cut short has no server counters; its generated
+tokens and generation time are counted from the chunks received. Summaries
+served from the cache or reused from duplicates make no LLM call and get
+no row.
+"""
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+SUMMARY_METRICS_DDL = """
+    CREATE TABLE IF NOT EXISTS raw_data.summary_metrics (
+        id BIGSERIAL PRIMARY KEY,
+        press_release_id INTEGER REFERENCES raw_data.press_release_keys(id),
+        run_id VARCHAR(64),
+        model VARCHAR(100),
+        endpoint VARCHAR(255),
+        latency_ms REAL,
+        total_duration_ms REAL,
+        load_duration_ms REAL,
+        prompt_eval_count INTEGER,
+        prompt_eval_duration_ms REAL,
+        eval_count INTEGER,
+        eval_duration_ms REAL,
+        stopped_early BOOLEAN,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_summary_metrics_model_recorded
+        ON raw_data.summary_metrics (model, recorded_at);
+"""
+
+METRIC_FIELDS = (
+    'latency_ms', 'total_duration_ms', 'load_duration_ms', 'prompt_eval_count',
+    'prompt_eval_duration_ms', 'eval_count', 'eval_duration_ms'
+)
+COLUMNS = ('press_release_id', 'run_id', 'model', 'endpoint') + METRIC_FIELDS + ('stopped_early',)
+
+
+def ensure_summary_metrics(cursor):
+    cursor.execute(SUMMARY_METRICS_DDL)
+
+
+def metrics_row(release_id: int, run_id: str, result: Dict[str, Any]) -> tuple:
+    """A ``summary_metrics`` row, in COLUMNS order, for a result of ``LLMResource.summarize``."""
+    metrics = result['metrics']
+    return (
+        (release_id, run_id, result['model_used'], result.get('endpoint'))
+        + tuple(metrics.get(field) for field in METRIC_FIELDS)
+        + (result.get('stopped_early'),)
+    )
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, ``q`` in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def aggregate_metrics(metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Latency percentiles, throughput and prompt sizes over a run's metrics."""
+    latencies = [m['latency_ms'] for m in metrics]
+    prompt_tokens = [m['prompt_eval_count'] for m in metrics if m.get('prompt_eval_count') is not None]
+    # Throughput only from requests that report both tokens and time
+    generated = [m for m in metrics if m.get('eval_count') and m.get('eval_duration_ms')]
+    prompted = [m for m in metrics if m.get('prompt_eval_count') and m.get('prompt_eval_duration_ms')]
+    eval_seconds = sum(m['eval_duration_ms'] for m in generated) / 1000
+    prompt_seconds = sum(m['prompt_eval_duration_ms'] for m in prompted) / 1000
+    return {
+        'requests': len(metrics),
+        'latency_p50_ms': percentile(latencies, 50),
+        'latency_p95_ms': percentile(latencies, 95),
+        'tokens_per_second': round(sum(m['eval_count'] for m in generated) / eval_seconds, 1) if eval_seconds else None,
+        'prompt_tokens_per_second': round(sum(m['prompt_eval_count'] for m in prompted) / prompt_seconds, 1) if prompt_seconds else None,
+        'avg_prompt_tokens': round(sum(prompt_tokens) / len(prompt_tokens), 1) if prompt_tokens else None,
+        'prompt_tokens_p95': percentile(prompt_tokens, 95)
+    }
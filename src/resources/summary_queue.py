@@ -0,0 +1,160 @@
+import os
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+PENDING = 'pending'
+CLAIMED = 'claimed'
+DONE = 'done'
+FAILED = 'failed'
+
+SUMMARY_QUEUE_DDL = """
+    CREATE TABLE IF NOT EXISTS raw_data.summary_queue (
+        press_release_id INTEGER PRIMARY KEY REFERENCES raw_data.press_release_keys(id),
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        claimed_by VARCHAR(200),
+        lease_expires_at TIMESTAMP,
+        last_error TEXT,
+        enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_summary_queue_claimable
+        ON raw_data.summary_queue (status, lease_expires_at);
+"""
+
+
+class SummaryQueue:
+    """Summarization work queue in ``raw_data.summary_queue``.
+
+    Releases are queued as they are inserted, by the registry trigger (see
+    ``release_storage``). Workers claim batches with ``FOR UPDATE SKIP
+    LOCKED``, so overlapping runs never summarize the same release twice.
+    Each claim carries a lease; rows whose lease has expired (their worker
+    crashed, or their summaries were never written) are claimable again.
+    A release that keeps failing is parked as ``failed`` after
+    ``max_attempts`` claims, whether it failed or its lease ran out.
+    """
+
+    def __init__(self, postgres, worker_id: str, lease_seconds: int = None, max_attempts: int = None):
+        self.postgres = postgres
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds or int(os.getenv("SUMMARY_LEASE_SECONDS", "600"))
+        self.max_attempts = max_attempts or int(os.getenv("SUMMARY_MAX_ATTEMPTS", "3"))
+
+    def ensure_table(self):
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(SUMMARY_QUEUE_DDL)
+
+    def claimable_count(self) -> int:
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT COUNT(*) FROM raw_data.summary_queue
+                    WHERE status = 'pending'
+                       OR (status = 'claimed' AND lease_expires_at < NOW() AND attempts < %s)
+                """, (self.max_attempts,))
+                return cursor.fetchone()[0]
+
+    def claim(self, limit: int) -> List[int]:
+        """Lease up to ``limit`` releases; returns their ids, newest first."""
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Expired claims with no attempts left would otherwise stay
+                # claimed forever, neither claimable nor parked
+                cursor.execute("""
+                    UPDATE raw_data.summary_queue
+                    SET status = 'failed',
+                        lease_expires_at = NULL,
+                        last_error = COALESCE(last_error, 'Lease expired after the last attempt'),
+                        updated_at = NOW()
+                    WHERE status = 'claimed' AND lease_expires_at < NOW() AND attempts >= %s
+                """, (self.max_attempts,))
+                cursor.execute("""
+                    WITH claimable AS (
+                        SELECT press_release_id
+                        FROM raw_data.summary_queue
+                        WHERE status = 'pending'
+                           OR (status = 'claimed' AND lease_expires_at < NOW() AND attempts < %s)
+                        ORDER BY press_release_id DESC
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    UPDATE raw_data.summary_queue q
+                    SET status = 'claimed',
+                        claimed_by = %s,
+                        lease_expires_at = NOW() + %s * INTERVAL '1 second',
+                        attempts = q.attempts + 1,
+                        updated_at = NOW()
+                    FROM claimable c
+                    WHERE q.press_release_id = c.press_release_id
+                    RETURNING q.press_release_id
+                """, (self.max_attempts, limit, self.worker_id, self.lease_seconds))
+                return sorted((row[0] for row in cursor.fetchall()), reverse=True)
+
+    def iter_claimed(self, release_ids: Sequence[int], fetch_size: int = None) -> Iterator[Tuple[int, str, str]]:
+        """Stream (id, title, content) for claimed releases in keyset pages of ``fetch_size``.
+
+        Only one page of content is held at a time, and no transaction stays
+        open while the caller works through it.
+        """
+        fetch_size = fetch_size or int(os.getenv("SUMMARY_FETCH_SIZE", "10"))
+        ids = list(release_ids)
+        last_id = None
+        while ids:
+            with self.postgres.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT id, title, content
+                        FROM raw_data.press_releases
+                        WHERE id = ANY(%s) AND (%s IS NULL OR id < %s)
+                        ORDER BY id DESC
+                        LIMIT %s
+                    """, (ids, last_id, last_id, fetch_size))
+                    page = cursor.fetchall()
+            if not page:
+                return
+            yield from page
+            if len(page) < fetch_size:
+                return
+            last_id = page[-1][0]
+
+    def complete(self, release_ids: Sequence[int]):
+        if not release_ids:
+            return
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE raw_data.summary_queue
+                    SET status = 'done', lease_expires_at = NULL, last_error = NULL, updated_at = NOW()
+                    WHERE press_release_id = ANY(%s) AND claimed_by = %s
+                """, (list(release_ids), self.worker_id))
+
+    def fail(self, release_id: int, error: str):
+        """Release a claim after an error, parking the row once it has used up its attempts."""
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE raw_data.summary_queue
+                    SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                        lease_expires_at = NULL,
+                        last_error = %s,
+                        updated_at = NOW()
+                    WHERE press_release_id = %s AND claimed_by = %s
+                """, (self.max_attempts, error[:1000], release_id, self.worker_id))
+
+    def stats(self) -> Dict[str, Any]:
+        with self.postgres.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT status, COUNT(*),
+                           COUNT(*) FILTER (WHERE status = 'claimed' AND lease_expires_at < NOW())
+                    FROM raw_data.summary_queue
+                    GROUP BY status
+                """)
+                rows = cursor.fetchall()
+        stats = {status: 0 for status in (PENDING, CLAIMED, DONE, FAILED)}
+        stats['expired_leases'] = 0
+        for status, count, expired in rows:
+            stats[status] = count
+            stats['expired_leases'] += expired
+        return stats
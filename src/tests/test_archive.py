@@ -0,0 +1,70 @@
+import gzip
+import hashlib
+from unittest.mock import MagicMock, patch
+
+from dagster import build_op_context
+from src.resources.archive import HtmlArchive
+from src.jobs.reparse import reparse_archived_releases
+
+
+class TestHtmlArchive:
+    """Tests for the raw HTML archive and the re-parse job."""
+    
+    def test_put_and_get(self, tmp_path):
+        """Sunshine test: Pages round-trip through gzip storage."""
+        # Arrange
+        archive = HtmlArchive(str(tmp_path))
+        url_hash = hashlib.sha256(b'https://test.com/1').hexdigest()
+        
+        # Act
+        stored = archive.put(url_hash, '<html>é</html>')
+        stored_again = archive.put(url_hash, '<html>other</html>')
+        
+        # Assert
+        assert stored is True
+        assert stored_again is False
+        assert archive.get(url_hash) == '<html>é</html>'
+        assert list(archive.iter_hashes()) == [url_hash]
+        with gzip.open(archive.path(url_hash), 'rt') as f:
+            assert f.read() == '<html>é</html>'
+    
+    def test_get_missing(self, tmp_path):
+        """Rainy test: Missing pages return None."""
+        # Arrange
+        archive = HtmlArchive(str(tmp_path))
+        
+        # Act & Assert
+        assert archive.get('0' * 64) is None
+    
+    def test_reparse_updates_stored_releases(self, tmp_path):
+        """Test that archived pages are re-parsed and bulk-updated."""
+        # Arrange
+        archive = HtmlArchive(str(tmp_path))
+        url = 'https://test.com/1'
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        archive.put(url_hash, '<html><body><h1>New Title</h1><div class="article__content"><p>Body</p></div></body></html>')
+        archive.put('f' * 64, '<html></html>')  # not in the database
+        
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(url_hash, url)]
+        mock_cursor.rowcount = 1
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_postgres = MagicMock()
+        mock_postgres.get_connection.return_value.__enter__.return_value = mock_conn
+        
+        context = build_op_context(resources={"postgres": mock_postgres})
+        env = {'SCRAPER_ARCHIVE_DIR': str(tmp_path), 'REPARSE_WORKERS': '1'}
+        
+        # Act
+        with patch.dict('os.environ', env), patch('src.jobs.reparse.execute_values') as mock_execute_values:
+            result = reparse_archived_releases(context)
+        
+        # Assert
+        release_rows = mock_execute_values.call_args_list[0][0][2]
+        key_rows = mock_execute_values.call_args_list[1][0][2]
+        # 'Body' is too short to fingerprint
+        assert release_rows == [(url_hash, 'New Title', 'Body', None, None, None)]
+        assert key_rows == [(url_hash, None, None)]
+        assert result.metadata['updated'].value == 1
+        assert result.metadata['not_in_db'].value == 1
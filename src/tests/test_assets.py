@@ -1,9 +1,66 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, MagicMock, patch
 import hashlib
+import time
 from dagster import build_asset_context, materialize_to_memory
 from src.assets.scraper import raw_press_releases
 from src.assets.summarizer import press_release_summary
+from src.resources.llm import summary_cache_key
+
+
+@pytest.fixture
+def summary_run():
+    """Resources, queue, cache and batch writes of a press_release_summary run.
+    
+    The queue hands out nothing, the cache misses and every written row is
+    inserted; tests set up only what differs and call ``_queue`` for claims.
+    """
+    with patch('src.assets.summarizer.SummaryCache') as mock_cache_class, \
+            patch('src.assets.summarizer.SummaryQueue') as mock_queue_class, \
+            patch('src.resources.batch_writer.execute_values') as mock_execute_values:
+        mock_postgres = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (0, 0, None, None, None, 0)
+        mock_cursor.fetchall.return_value = []
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_postgres.get_connection.return_value.__enter__.return_value = mock_conn
+        mock_postgres.pool_stats.return_value = {}
+        
+        cache = mock_cache_class.return_value
+        cache.get.return_value = None
+        cache.invalidate_stale.return_value = 0
+        
+        queue = mock_queue_class.return_value
+        queue.claim.return_value = []
+        queue.claimable_count.return_value = 0
+        queue.stats.return_value = {}
+        mock_execute_values.side_effect = lambda cursor, query, rows, **kwargs: [(row[0],) for row in rows]
+        
+        mock_llm = MagicMock()
+        mock_llm.test_connection.return_value = True
+        mock_llm.http_stats.return_value = {}
+        mock_llm.warm_up.return_value = {'loaded': True, 'load_ms': 0.0, 'keep_alive': '20m'}
+        mock_llm.endpoint_stats.return_value = {}
+        mock_llm.endpoint_count.return_value = 1
+        
+        yield SimpleNamespace(
+            postgres=mock_postgres, cursor=mock_cursor, llm=mock_llm,
+            queue=queue, cache=cache, execute_values=mock_execute_values
+        )
+
+
+def _queue(queue, batches, releases):
+    """Hand out ``batches`` of claimed ids, then nothing; ``releases`` maps id to (id, title, content)."""
+    queue.claimable_count.return_value = sum(len(batch) for batch in batches)
+    queue.claim.side_effect = list(batches) + [[]]
+    queue.iter_claimed.side_effect = lambda ids: (releases[i] for i in ids)
+
+
+def _materialize_summary(run):
+    with build_asset_context(resources={"postgres": run.postgres, "llm": run.llm}) as context:
+        return press_release_summary(context)
 
 
 class TestRawPressReleasesAsset:
@@ -72,6 +129,95 @@ class TestRawPressReleasesAsset:
         # Assert
         assert result.metadata["errors"] == 1
         assert result.metadata["scraped"] == 0
+    
+    @patch.dict('os.environ', {'SCRAPER_CONCURRENCY': '3'})
+    @patch('src.resources.batch_writer.execute_values')
+    def test_raw_press_releases_concurrent_fetch(self, mock_execute_values):
+        """Test that all new URLs are fetched and throughput is reported."""
+        # Arrange
+        mock_postgres = MagicMock()
+        mock_scraper = MagicMock()
+        urls = [f'https://test.com/{i}' for i in range(5)]
+        mock_scraper.get_sec_urls.return_value = urls
+        
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = (5, 0, None, None, None, 0)
+        mock_execute_values.side_effect = lambda cursor, query, rows, **kwargs: [(row[0],) for row in rows]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_postgres.get_connection.return_value.__enter__.return_value = mock_conn
+        
+        mock_scraper.scrape_url.side_effect = lambda url: {
+            'success': True,
+            'url': url,
+            'url_hash': hashlib.sha256(url.encode()).hexdigest(),
+            'content': '<html></html>',
+            'scraped_at': '2025-01-01T00:00:00'
+        }
+        mock_scraper.parse_content.return_value = {
+            'title': 'Title', 'content': 'Body', 'url': '', 'published_at': None
+        }
+        mock_scraper.http_stats.return_value = {}
+        mock_scraper.cache_stats.return_value = {}
+        mock_scraper.fetch_mode_stats.return_value = {}
+        mock_scraper.circuit_state.return_value = "closed"
+        mock_postgres.pool_stats.return_value = {}
+        
+        # Act
+        with build_asset_context(resources={"postgres": mock_postgres, "scraper": mock_scraper}) as context:
+            result = raw_press_releases(context)
+        
+        # Assert
+        assert mock_scraper.scrape_url.call_count == 5
+        assert result.metadata["scraped"] == 5
+        assert result.metadata["concurrency"] == 3
+        assert "pages_per_sec" in result.metadata
+    
+    @patch.dict('os.environ', {'SCRAPER_PARSE_WORKERS': '0'})
+    @patch('src.resources.batch_writer.execute_values')
+    def test_raw_press_releases_inline_parse_reports_stage_timings(self, mock_execute_values):
+        """Test that per-stage timings are reported with inline parsing."""
+        # Arrange
+        mock_postgres = MagicMock()
+        mock_scraper = MagicMock()
+        mock_scraper.get_sec_urls.return_value = ['https://test.com/1', 'https://test.com/2']
+        
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = (1, 0, None, None, None, 0)
+        # The second URL conflicts with a row stored concurrently
+        mock_execute_values.return_value = [('https://test.com/1',)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_postgres.get_connection.return_value.__enter__.return_value = mock_conn
+        
+        mock_scraper.scrape_url.side_effect = lambda url: {
+            'success': True,
+            'url': url,
+            'url_hash': hashlib.sha256(url.encode()).hexdigest(),
+            'content': '<html></html>'
+        }
+        mock_scraper.parse_content.return_value = {
+            'title': 'Title', 'content': 'Body', 'url': '', 'published_at': None
+        }
+        mock_scraper.http_stats.return_value = {}
+        mock_scraper.cache_stats.return_value = {}
+        mock_scraper.fetch_mode_stats.return_value = {}
+        mock_scraper.circuit_state.return_value = "closed"
+        mock_postgres.pool_stats.return_value = {}
+        
+        # Act
+        with build_asset_context(resources={"postgres": mock_postgres, "scraper": mock_scraper}) as context:
+            result = raw_press_releases(context)
+        
+        # Assert
+        assert mock_scraper.parse_content.call_count == 2
+        assert result.metadata["scraped"] == 1
+        assert result.metadata["skipped_existing"] == 1
+        assert result.metadata["parse_workers"] == 0
+        for stage in ("wall_seconds", "fetch_seconds", "parse_seconds", "write_seconds"):
+            assert result.metadata[stage] >= 0
 
 
 class TestPressReleaseSummaryAsset:
@@ -127,3 +273,128 @@ class TestPressReleaseSummaryAsset:
         # Assert
         assert result.metadata["error"] == "LLM service not available"
         assert result.metadata["processed"] == 0
+    
+    def test_summary_drains_claimed_batches(self, summary_run):
+        """Test that claimed batches are summarized, completed and failures released."""
+        # Arrange
+        summary_run.cursor.fetchone.return_value = (3, 2, None, None, None, 0)
+        _queue(summary_run.queue, [[3, 2], [1]], {3: (3, 'A', 'a'), 2: (2, 'B', 'b'), 1: (1, 'C', 'c')})
+        summary_run.llm.summarize.side_effect = [
+            {'summary': '• a', 'bullet_points': ['a'], 'word_count': 1, 'model_used': 'm'},
+            Exception("LLM timeout"),
+            {'summary': '• c', 'bullet_points': ['c'], 'word_count': 1, 'model_used': 'm'}
+        ]
+        
+        # Act
+        result = _materialize_summary(summary_run)
+        
+        # Assert
+        assert result.metadata["processed"] == 3
+        assert result.metadata["summarized"] == 2
+        assert result.metadata["errors"] == 1
+        assert result.metadata["remaining_unsummarized"] == 1
+        summary_run.queue.fail.assert_called_once_with(2, "LLM timeout")
+        summary_run.queue.complete.assert_called_once_with([3, 1])
+
+    @patch('src.assets.summarizer.find_summarized_duplicates')
+    def test_summary_reuses_duplicate_summaries(self, mock_find_duplicates, summary_run):
+        """Test that near-duplicates take an existing summary without calling the LLM."""
+        # Arrange
+        _queue(summary_run.queue, [[5, 4]], {4: (4, 'B', 'b')})
+        mock_find_duplicates.return_value = {5: {
+            'source_id': 1, 'summary': '• reused', 'bullet_points': ['reused'],
+            'word_count': 1, 'model_used': 'm', 'distance': 1
+        }}
+        summary_run.llm.summarize.return_value = {'summary': '• b', 'bullet_points': ['b'], 'word_count': 1, 'model_used': 'm'}
+        
+        # Act
+        result = _materialize_summary(summary_run)
+        
+        # Assert
+        rows = summary_run.execute_values.call_args[0][2]
+        assert rows[0] == (5, '• reused', '["reused"]', 1, 'm', 1)
+        assert rows[1][0] == 4 and rows[1][5] is None
+        summary_run.llm.summarize.assert_called_once_with('b', 'B')
+        assert result.metadata["reused_summaries"] == 1
+        assert result.metadata["summarized"] == 2
+
+    @patch.dict('os.environ', {'SUMMARY_CONCURRENCY': '3'})
+    def test_summary_concurrent_requests(self, summary_run):
+        """Test that concurrent summaries are all written and completed."""
+        # Arrange
+        _queue(summary_run.queue, [[5, 4, 3], [2, 1]], {i: (i, f'T{i}', f'c{i}') for i in range(1, 6)})
+        
+        def summarize(content, title):
+            time.sleep(0.01)
+            return {'summary': f'• {title}', 'bullet_points': [title], 'word_count': 1, 'model_used': 'm',
+                    'load_ms': 900.0 if title == 'T5' else 0.0, 'generate_ms': 10.0,
+                    'metrics': {'latency_ms': 10.0 * int(title[1:]), 'eval_count': 5, 'eval_duration_ms': 100.0}}
+        summary_run.llm.summarize.side_effect = summarize
+        
+        # Act
+        result = _materialize_summary(summary_run)
+        
+        # Assert
+        rows = summary_run.execute_values.call_args[0][2]
+        assert sorted(row[0] for row in rows) == [1, 2, 3, 4, 5]
+        assert all(row[1] == f'• T{row[0]}' for row in rows)
+        assert result.metadata["processed"] == 5
+        assert result.metadata["summarized"] == 5
+        assert result.metadata["llm_concurrency"]['max_limit'] == 3
+        assert result.metadata["llm_timing"]['requests_with_load'] == 1
+        assert result.metadata["llm_timing"]['load_ms_total'] == 900.0
+        assert result.metadata["llm_timing"]['avg_generate_ms'] == 10.0
+        metric_rows = [row for call in summary_run.execute_values.call_args_list
+                       if 'summary_metrics' in call[0][1] for row in call[0][2]]
+        assert sorted(row[0] for row in metric_rows) == [1, 2, 3, 4, 5]
+        assert result.metadata["llm_metrics"]['latency_p50_ms'] == 30.0
+        assert result.metadata["llm_metrics"]['latency_p95_ms'] == 50.0
+        assert result.metadata["llm_metrics"]['tokens_per_second'] == 50.0
+        assert result.metadata["llm_metrics"]['recorded'] == 5
+
+    def test_summary_served_from_cache(self, summary_run):
+        """Test that cached summaries skip the LLM and fresh ones are cached."""
+        # Arrange
+        _queue(summary_run.queue, [[2, 1]], {2: (2, 'Cached', 'same body'), 1: (1, 'Fresh', 'new body')})
+        cached = {'summary': '• cached', 'bullet_points': ['cached'], 'word_count': 1, 'model_used': 'm'}
+        summary_run.cache.get.side_effect = [cached, None]
+        summary_run.cache.stats.return_value = {'hit_rate': 0.5}
+        fresh = {'summary': '• fresh', 'bullet_points': ['fresh'], 'word_count': 1, 'model_used': 'm'}
+        summary_run.llm.summarize.return_value = fresh
+        
+        # Act
+        result = _materialize_summary(summary_run)
+        
+        # Assert
+        rows = summary_run.execute_values.call_args[0][2]
+        assert rows[0] == (2, '• cached', '["cached"]', 1, 'm', None)
+        summary_run.llm.summarize.assert_called_once_with('new body', 'Fresh')
+        summary_run.cache.put.assert_called_once_with(summary_cache_key('new body', 'Fresh'), fresh)
+        assert result.metadata["summarized"] == 2
+        assert result.metadata["summary_cache"] == {'hit_rate': 0.5}
+
+    def test_summary_failed_placeholder_is_released_not_written(self, summary_run):
+        """Rainy test: A 'failed' placeholder from the LLM goes back to the queue, not into the table."""
+        # Arrange
+        _queue(summary_run.queue, [[2, 1]], {2: (2, 'A', 'a'), 1: (1, 'B', 'b')})
+        summary_run.llm.summarize.side_effect = [
+            {'summary': '• a', 'bullet_points': ['a'], 'word_count': 1, 'model_used': 'm',
+             'metrics': {'latency_ms': 10.0}},
+            {'summary': '• Summary generation failed', 'bullet_points': ['Summary generation failed'],
+             'word_count': 8, 'model_used': 'failed', 'error': 'Connection refused'}
+        ]
+        
+        # Act
+        result = _materialize_summary(summary_run)
+        
+        # Assert
+        def written(table):
+            return [row[0] for call in summary_run.execute_values.call_args_list
+                    if table in call[0][1] for row in call[0][2]]
+        assert written('press_release_summary') == [2]
+        assert written('summary_metrics') == [2]
+        assert result.metadata["summarized"] == 1
+        assert result.metadata["errors"] == 1
+        summary_run.queue.fail.assert_called_once_with(1, 'Connection refused')
+        summary_run.queue.complete.assert_called_once_with([2])
+        summary_run.cache.put.assert_called_once()
@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock, patch
+import psycopg2
+from src.resources.batch_writer import BatchedWriter
+
+
+def _postgres():
+    postgres = MagicMock()
+    cursor = MagicMock()
+    postgres.get_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = cursor
+    return postgres
+
+
+class TestBatchedWriter:
+    """Tests for the multi-row INSERT ... ON CONFLICT writer."""
+    
+    @patch('src.resources.batch_writer.execute_values')
+    def test_flushes_at_batch_size_and_counts_conflicts(self, mock_execute_values):
+        """Sunshine test: Rows are written in batches; conflicts are counted as skipped."""
+        # Arrange
+        mock_execute_values.side_effect = lambda cursor, query, rows, **kwargs: [(row[0],) for row in rows[1:]]
+        postgres = _postgres()
+        inserted = []
+        
+        # Act
+        with BatchedWriter(postgres, 't', ('a', 'b'), conflict_target='(a)', returning='a',
+                           batch_size=3, flush_seconds=60, on_inserted=inserted.extend) as writer:
+            for i in range(7):
+                writer.add((i, 'x'))
+        
+        # Assert
+        assert mock_execute_values.call_count == 3
+        assert postgres.get_connection.call_count == 3
+        assert 'ON CONFLICT (a) DO NOTHING RETURNING a' in mock_execute_values.call_args[0][1]
+        assert writer.inserted == 4
+        assert writer.skipped == 3
+        assert inserted == [1, 2, 4, 5]
+    
+    @patch('src.resources.batch_writer.execute_values')
+    def test_flushes_after_interval(self, mock_execute_values):
+        """Test that a partial batch is flushed once the interval has passed."""
+        # Arrange
+        mock_execute_values.return_value = [(1,)]
+        writer = BatchedWriter(_postgres(), 't', ('a',), conflict_target='(a)', returning='a',
+                               batch_size=100, flush_seconds=0)
+        
+        # Act
+        writer.add((1,))
+        
+        # Assert
+        assert mock_execute_values.call_count == 1
+        assert writer.inserted == 1
+    
+    @patch('src.resources.batch_writer.execute_values')
+    def test_failed_flush_is_counted(self, mock_execute_values):
+        """Rainy test: A failing batch is counted as failed and the writer carries on."""
+        # Arrange
+        mock_execute_values.side_effect = [psycopg2.OperationalError("down"), [(3,)]]
+        writer = BatchedWriter(_postgres(), 't', ('a',), conflict_target='(a)', returning='a',
+                               batch_size=2, flush_seconds=60)
+        
+        # Act
+        for i in range(3):
+            writer.add((i,))
+        writer.flush()
+        
+        # Assert
+        assert writer.stats()['failed'] == 2
+        assert writer.stats()['inserted'] == 1
+    
+    @patch('src.resources.batch_writer.execute_values')
+    def test_rejected_batch_falls_back_to_single_rows(self, mock_execute_values):
+        """Rainy test: One bad row in a batch loses only that row."""
+        # Arrange
+        def execute(cursor, query, rows, **kwargs):
+            if len(rows) > 1 or rows[0][0] == 1:
+                raise psycopg2.DataError("value too long")
+            return [(rows[0][0],)]
+        mock_execute_values.side_effect = execute
+        postgres = _postgres()
+        cursor = postgres.get_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+        flushed = []
+        writer = BatchedWriter(postgres, 't', ('a',), conflict_target='(a)', returning='a',
+                               batch_size=3, flush_seconds=60, on_flushed=flushed.extend)
+        
+        # Act
+        for i in range(3):
+            writer.add((i,))
+        
+        # Assert
+        assert writer.stats()['inserted'] == 2
+        assert writer.stats()['failed'] == 1
+        assert writer.stats()['row_fallbacks'] == 1
+        assert flushed == [(0,), (2,)]
+        assert [c[0][0] for c in cursor.execute.call_args_list].count("ROLLBACK TO SAVEPOINT batch_row") == 1
@@ -76,3 +76,46 @@ class TestPostgresResource:
         assert len(results) == 1
         assert results[0]['id'] == 1
         assert results[0]['title'] == 'Test Release'
+    
+    @patch.dict('os.environ', {'POSTGRES_POOL_MAX': '2', 'POSTGRES_POOL_MIN': '1', 'POSTGRES_HOST': 'pooled-host'})
+    @patch('psycopg2.connect')
+    def test_pooled_connections_are_reused(self, mock_connect):
+        """Sunshine test: Pooled mode reuses one connection across checkouts."""
+        # Arrange
+        mock_connect.side_effect = lambda **kwargs: MagicMock()
+        resource = PostgresResource()
+        
+        # Act
+        for _ in range(5):
+            with resource.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+        stats = resource.pool_stats()
+        
+        # Assert
+        assert mock_connect.call_count == 1
+        assert stats['pooled'] is True
+        assert stats['checkouts'] == 5
+        assert stats['in_use'] == 0
+    
+    @patch.dict('os.environ', {'POSTGRES_POOL_MAX': '2', 'POSTGRES_HOST': 'stale-host'})
+    @patch('psycopg2.connect')
+    def test_pooled_health_check_replaces_dead_connection(self, mock_connect):
+        """Rainy test: A connection failing its health check is replaced."""
+        # Arrange
+        dead = MagicMock()
+        dead.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError("gone")
+        healthy = MagicMock()
+        mock_connect.side_effect = [MagicMock(), dead, healthy]
+        resource = PostgresResource()
+        with resource.get_connection(), resource.get_connection():
+            pass
+        
+        # Act
+        for _ in range(2):
+            with resource.get_connection():
+                pass
+        
+        # Assert
+        assert resource.pool_stats()['invalidated'] == 1
+        assert mock_connect.call_count == 3
@@ -0,0 +1,63 @@
+from src.resources.extractive import estimate_tokens, select_sentences, split_sentences
+
+RELEASE = """Washington D.C., March 3, 2025 —
+
+The Securities and Exchange Commission today charged Harbor Point Securities with fraudulent cherry-picking of profitable trades for favored client accounts.
+According to the complaint, Harbor Point Securities allocated profitable trades to favored accounts and unprofitable trades to other client accounts between 2019 and 2023.
+Harbor Point Securities agreed to pay a civil penalty of $12 million and disgorgement to settle the cherry-picking charges.
+According to the complaint, Harbor Point Securities allocated profitable trades to favored accounts and unprofitable trades to other client accounts between 2019 and 2024.
+The SEC's investigation was conducted by staff in the Chicago Regional Office.
+The SEC appreciates the assistance of the Financial Industry Regulatory Authority.
+
+###"""
+
+
+class TestSelectSentences:
+    """Tests for token-budgeted extractive sentence selection."""
+    
+    def test_selects_within_budget_in_original_order(self):
+        """Sunshine test: The key sentences fit the budget and keep their order."""
+        # Act
+        selected = select_sentences([RELEASE], token_budget=75)[0]
+        
+        # Assert
+        sentences = split_sentences(selected)
+        assert estimate_tokens(selected) <= 75
+        assert any(s.startswith('The Securities and Exchange Commission today charged') for s in sentences)
+        assert 'civil penalty of $12 million' in selected
+        assert '###' not in selected
+        assert sentences == [s for s in split_sentences(RELEASE) if s in sentences]
+    
+    def test_skips_near_repeats(self):
+        """Test that a sentence nearly identical to one already kept is left out."""
+        # Act
+        selected = select_sentences([RELEASE], token_budget=100)[0]
+        
+        # Assert
+        assert selected.count('According to the complaint') == 1
+    
+    def test_selection_does_not_depend_on_batch(self):
+        """Test that a release gets the same excerpt alone or batched, so cache keys are stable."""
+        # Arrange
+        other = ' '.join(f"Sentence {i} about an unrelated municipal bond offering by a county." for i in range(30))
+        
+        # Act
+        alone = select_sentences([RELEASE], token_budget=60)
+        batched = select_sentences([other, RELEASE, 'Short release.'], token_budget=60)
+        
+        # Assert
+        assert batched[1] == alone[0]
+        assert batched[2] == 'Short release.'
+        assert estimate_tokens(batched[0]) <= 60
+    
+    def test_oversized_sentence_is_truncated(self):
+        """Rainy test: A release that is one long sentence is cut to the budget."""
+        # Arrange
+        text = ' '.join(f"word{i}" for i in range(100))
+        
+        # Act
+        selected = select_sentences([text, None, ''], token_budget=20)
+        
+        # Assert
+        assert selected[0].split() == [f"word{i}" for i in range(20)]
+        assert selected[1:] == [None, '']
@@ -0,0 +1,150 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from src.benchmarks.fake_services import FakeServices, LISTING_PAGE_SIZE
+from src.resources.llm import LLMResource
+from src.resources.resilience import CircuitBreaker
+from src.resources.scraper import ScraperResource
+
+
+def _env(services):
+    host, port = services.address.split(':')
+    return {
+        'SCRAPER_API_KEY': 'test-key',
+        'SCRAPER_API_URL': f"http://{services.address}/api/v1/",
+        'SCRAPER_HOST_RATE': '1000',
+        'OLLAMA_HOST': host,
+        'OLLAMA_PORT': port
+    }
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker():
+    with patch('src.resources.scraper._breaker', CircuitBreaker()):
+        yield
+
+
+class TestFakeServices:
+    """Tests for the offline ScrapingBee and Ollama stand-ins."""
+    
+    def test_pipeline_runs_against_synthetic_pages(self):
+        """Sunshine test: Listing, article and summary calls all work offline."""
+        # Arrange
+        with FakeServices() as services, patch.dict('os.environ', _env(services)):
+            scraper = ScraperResource()
+            llm = LLMResource()
+            
+            # Act
+            urls = scraper.get_sec_urls(limit=LISTING_PAGE_SIZE + 5)
+            page = scraper.scrape_url(urls[0])
+            parsed = scraper.parse_content(page['content'], urls[0])
+            summary = llm.summarize(parsed['content'], parsed['title'])
+        
+        # Assert
+        assert len(urls) == LISTING_PAGE_SIZE + 5
+        assert parsed['title'].startswith('SEC Announces Enforcement Action')
+        assert parsed['published_at'] is not None
+        assert summary['model_used'] != 'failed'
+        assert len(summary['bullet_points']) == 3
+    
+    def test_record_then_replay(self, tmp_path):
+        """Test that recorded responses are replayed once the upstream is gone."""
+        # Arrange
+        upstream = FakeServices().start()
+        recorder = FakeServices(
+            recordings=str(tmp_path), record=True,
+            scrapingbee_url=f"http://{upstream.address}/api/v1/",
+            ollama_url=f"http://{upstream.address}"
+        )
+        
+        # Act
+        with recorder, patch.dict('os.environ', _env(recorder)):
+            recorded = ScraperResource().scrape_url('https://www.sec.gov/newsroom/press-release/2025-7')
+        upstream.stop()
+        with FakeServices(recordings=str(tmp_path)) as replayer, patch.dict('os.environ', _env(replayer)):
+            replayed = ScraperResource().scrape_url('https://www.sec.gov/newsroom/press-release/2025-7')
+            replay_stats = replayer.stats()
+        
+        # Assert
+        assert recorder.stats()['recorded'] == 1
+        assert replay_stats['replayed'] == 1
+        assert replayed['content'] == recorded['content']
+    
+    @patch.dict('os.environ', {'SCRAPER_MAX_RETRIES': '0'})
+    def test_error_injection(self):
+        """Rainy test: Injected 503s surface as transient scrape errors."""
+        # Arrange
+        with FakeServices(error_rate=1.0, error_status=503, latency_ms=5) as services, \
+                patch.dict('os.environ', _env(services)):
+            
+            # Act
+            result = ScraperResource().scrape_url('https://www.sec.gov/newsroom/press-release/2025-1')
+            stats = services.stats()
+        
+        # Assert
+        assert result['success'] is False
+        assert result['error_kind'] == 'transient'
+        assert stats['injected_errors'] == 1
+    
+    def test_streamed_summary_cancels_generation(self):
+        """Test that a streamed summary stops the generation after three bullets."""
+        # Arrange
+        with FakeServices(generate_ms=200) as services, \
+                patch.dict('os.environ', dict(_env(services), LLM_STREAM='true')):
+            llm = LLMResource()
+            
+            # Act
+            summary = llm.summarize('Body text', 'Streaming title')
+            for _ in range(50):
+                if services.stats()['cancelled']:
+                    break
+                time.sleep(0.01)
+            stats = services.stats()
+        
+        # Assert
+        assert summary['bullet_points'][0] == 'Streaming title'
+        assert summary['stopped_early'] is True
+        assert summary['first_bullet_ms'] < 200
+        assert stats['cancelled'] == 1
+    
+    def test_warm_up_loads_model_once(self):
+        """Test that a preloaded model is kept alive and a zero keep_alive unloads it."""
+        # Arrange
+        with FakeServices(load_ms=50) as services, patch.dict('os.environ', _env(services)):
+            llm = LLMResource()
+            
+            # Act
+            warm_up = llm.warm_up()
+            warm = llm.summarize('Body text', 'Warm title')
+            with patch.dict('os.environ', {'LLM_KEEP_ALIVE': '0'}):
+                llm.summarize('Body text', 'Unloading title')
+            cold = llm.summarize('Body text', 'Cold title')
+            stats = services.stats()
+        
+        # Assert
+        assert warm_up['loaded'] is True
+        assert warm_up['load_ms'] >= 50
+        assert warm['load_ms'] == 0
+        assert cold['load_ms'] == 50
+        assert stats['loads'] == 2
+    
+    def test_summaries_spread_over_ollama_and_openai_endpoints(self):
+        """Test that summaries are balanced over an Ollama and an OpenAI-compatible endpoint."""
+        # Arrange
+        with FakeServices() as ollama, FakeServices() as openai, patch.dict('os.environ', {
+            'LLM_ENDPOINTS': f"{ollama.address},openai+http://{openai.address}/v1", 'LLM_STREAM': 'true'
+        }):
+            llm = LLMResource()
+            
+            # Act
+            healthy = llm.test_connection()
+            summaries = [llm.summarize('Body text', f'Title {i}') for i in range(4)]
+            stats = llm.endpoint_stats()
+        
+        # Assert
+        assert healthy is True
+        assert all(s['model_used'] != 'failed' for s in summaries)
+        assert summaries[0]['bullet_points'][0] == 'Title 0'
+        assert {s['endpoint'] for s in summaries} == {f"http://{ollama.address}", f"http://{openai.address}/v1"}
+        assert [s['requests'] for s in stats.values()] == [2, 2]
@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+from src.resources.fingerprint import fingerprint, find_summarized_duplicates, hamming
+
+ARTICLE = (
+    "According to the SEC's order, Northbridge Capital misled investors about fees between 2016 and 2021. "
+    "Without admitting or denying the findings, Northbridge Capital consented to a cease-and-desist order "
+    "and agreed to pay a civil penalty of $12 million. The investigation was conducted by staff in the "
+    "Boston Regional Office, and the SEC appreciates the assistance of FINRA in this matter. Investors "
+    "harmed by the conduct will receive distributions from a fair fund administered by the Commission."
+)
+
+OTHER_ARTICLE = (
+    "The Securities and Exchange Commission today charged a former biotech executive with insider trading "
+    "ahead of the announcement of a failed clinical trial. The complaint alleges the executive sold shares "
+    "days before the results were published, avoiding losses of roughly $400,000. A parallel criminal case "
+    "was filed by the Department of Justice, and the litigation will be led by the Market Abuse Unit."
+)
+
+
+class TestFingerprint:
+    """Tests for release content fingerprints and duplicate lookup."""
+    
+    def test_exact_duplicate_ignores_case_and_spacing(self):
+        """Sunshine test: Reformatted copies share the exact content hash."""
+        # Act
+        original = fingerprint(ARTICLE)
+        copy = fingerprint("  " + ARTICLE.upper().replace(' ', '\n  '))
+        
+        # Assert
+        assert original == copy
+        assert -(1 << 63) <= original[1] < (1 << 63)
+    
+    def test_correction_is_near_and_other_release_is_far(self):
+        """Sunshine test: A one-figure correction stays within 3 bits, unrelated text does not."""
+        # Arrange
+        corrected = ARTICLE.replace('$12 million', '$14 million')
+        
+        # Act
+        original_hash, original = fingerprint(ARTICLE)
+        corrected_hash, near = fingerprint(corrected)
+        _, far = fingerprint(OTHER_ARTICLE)
+        
+        # Assert
+        assert corrected_hash != original_hash
+        assert hamming(original, near) <= 3
+        assert hamming(original, far) > 10
+    
+    def test_short_text_is_not_fingerprinted(self):
+        """Rainy test: Placeholder bodies get no fingerprint so they never match each other."""
+        # Act / Assert
+        assert fingerprint('No content') == (None, None)
+        assert fingerprint(None) == (None, None)
+    
+    def test_find_summarized_duplicates(self):
+        """Sunshine test: Lookup rows are keyed by the release that needs a summary."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [(7, 3, '• Reused', '["Reused"]', 1, 'qwen2.5:0.5b', 2)]
+        
+        # Act
+        duplicates = find_summarized_duplicates(cursor, [7, 8], max_distance=3)
+        
+        # Assert
+        assert cursor.execute.call_args[0][1] == (3, [7, 8])
+        assert duplicates == {7: {
+            'source_id': 3,
+            'summary': '• Reused',
+            'bullet_points': '["Reused"]',
+            'word_count': 1,
+            'model_used': 'qwen2.5:0.5b',
+            'distance': 2
+        }}
+        assert find_summarized_duplicates(cursor, [], max_distance=3) == {}
+    
+    def test_failed_summaries_are_not_reused(self):
+        """Rainy test: A neighbour whose summary is a failed placeholder is no candidate."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        
+        # Act
+        duplicates = find_summarized_duplicates(cursor, [7], max_distance=3)
+        
+        # Assert
+        query = cursor.execute.call_args[0][0]
+        lateral = query[query.index('CROSS JOIN LATERAL'):query.index(') d')]
+        assert "prs.model_used <> 'failed'" in lateral
+        assert duplicates == {}
@@ -0,0 +1,87 @@
+import time
+from unittest.mock import patch
+
+from src.resources.fetch_modes import get_fetch_mode_tracker
+from src.resources.http_cache import HttpCache
+
+
+class TestHttpCache:
+    """Tests for the on-disk page cache."""
+    
+    def test_put_and_get(self, tmp_path):
+        """Sunshine test: Stored pages come back with their validators."""
+        # Arrange
+        cache = HttpCache(str(tmp_path), ttl_seconds=3600, max_bytes=10_000)
+        
+        # Act
+        cache.put('https://test.com/a', '<html>a</html>', etag='"v1"')
+        entry = cache.get('https://test.com/a')
+        
+        # Assert
+        assert entry['body'] == '<html>a</html>'
+        assert entry['etag'] == '"v1"'
+        assert entry['content_hash'] == HttpCache.content_hash('<html>a</html>')
+    
+    def test_expired_entry_is_dropped(self, tmp_path):
+        """Rainy test: Entries older than the TTL are treated as missing."""
+        # Arrange
+        cache = HttpCache(str(tmp_path), ttl_seconds=60, max_bytes=10_000)
+        cache.put('https://test.com/a', 'body')
+        
+        # Act
+        with patch('src.resources.http_cache.time.time', return_value=time.time() + 120):
+            entry = cache.get('https://test.com/a')
+        
+        # Assert
+        assert entry is None
+    
+    def test_size_eviction_drops_least_recently_used(self, tmp_path):
+        """Test that the oldest-accessed entries go first when over budget."""
+        # Arrange
+        cache = HttpCache(str(tmp_path), ttl_seconds=3600, max_bytes=25)
+        cache.put('https://test.com/old', 'x' * 10)
+        cache.put('https://test.com/mid', 'y' * 10)
+        time.sleep(0.01)
+        cache.get('https://test.com/old')
+        
+        # Act
+        cache.put('https://test.com/new', 'z' * 10)
+        
+        # Assert
+        assert cache.get('https://test.com/mid') is None
+        assert cache.get('https://test.com/old') is not None
+        assert cache.get('https://test.com/new') is not None
+    
+    def test_annotations_survive_identical_refetch(self, tmp_path):
+        """Test that parsed annotations are kept only while the body is unchanged."""
+        # Arrange
+        cache = HttpCache(str(tmp_path), ttl_seconds=3600, max_bytes=10_000)
+        cache.put('https://test.com/list', 'same')
+        cache.annotate('https://test.com/list', links=['a'])
+        
+        # Act
+        cache.put('https://test.com/list', 'same')
+        kept = cache.get('https://test.com/list').get('links')
+        cache.put('https://test.com/list', 'changed')
+        dropped = cache.get('https://test.com/list').get('links')
+        
+        # Assert
+        assert kept == ['a']
+        assert dropped is None
+    
+    def test_put_after_render_probe_is_recorded(self, tmp_path):
+        """Rainy test: Fetch mode state never lands in the cache tree or breaks eviction."""
+        # Arrange
+        with patch.dict('os.environ', {'SCRAPER_CACHE_DIR': str(tmp_path)}):
+            get_fetch_mode_tracker().record_probe('https://test.com/list?page=0', plain_matched=False)
+        # A state file left inside the cache directory by an earlier release
+        (tmp_path / 'stale.json').write_text('{"test.com/list?page={n}": {"render_js": true}}')
+        cache = HttpCache(str(tmp_path), ttl_seconds=3600, max_bytes=10_000)
+        
+        # Act
+        cache.put('https://test.com/a', 'body')
+        cache.put('https://test.com/b', 'body')
+        
+        # Assert
+        assert not (tmp_path / 'render_modes.json').exists()
+        assert cache.get('https://test.com/b')['body'] == 'body'
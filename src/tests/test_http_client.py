@@ -0,0 +1,74 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.resources.http_client import HttpClient
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClient:
+    """Tests for the shared pooled HTTP client."""
+
+    def test_keep_alive_reuses_connection(self, local_server):
+        """Sunshine test: Sequential requests share one pooled connection."""
+        # Arrange
+        client = HttpClient(pool_connections=1, pool_maxsize=1)
+
+        # Act
+        for _ in range(3):
+            assert client.get(f"http://{local_server}/", read_timeout=5).text == "ok"
+        stats = client.stats()[local_server]
+
+        # Assert
+        assert stats['requests'] == 3
+        assert stats['connections_opened'] == 1
+        assert stats['connections_reused'] == 2
+        assert stats['avg_latency_ms'] >= 0
+
+    def test_failed_request_is_counted(self):
+        """Rainy test: Connection failures are recorded as errors."""
+        # Arrange
+        client = HttpClient(connect_timeout=0.5)
+
+        # Act
+        with pytest.raises(Exception):
+            client.get("http://127.0.0.1:9/", read_timeout=0.5)
+
+        # Assert
+        assert client.stats()["127.0.0.1:9"]['errors'] == 1
+
+    def test_async_request(self, local_server):
+        """Test the async entry point shares the same pools."""
+        # Arrange
+        import asyncio
+        client = HttpClient()
+
+        # Act
+        response = asyncio.run(client.arequest("GET", f"http://{local_server}/", read_timeout=5))
+
+        # Assert
+        assert response.status_code == 200
+        assert client.stats(local_server)[local_server]['requests'] == 1
@@ -0,0 +1,62 @@
+from unittest.mock import patch
+from src.resources.llm_pool import OLLAMA, OPENAI, Endpoint, EndpointPool, parse_endpoints
+
+
+class TestEndpointPool:
+    """Tests for LLM endpoint parsing, routing and ejection."""
+    
+    def test_parse_endpoints(self):
+        """Sunshine test: Ollama and OpenAI-compatible entries and their models are told apart."""
+        # Act
+        endpoints = parse_endpoints(
+            "llm-1:11434, http://llm-2:11434=qwen2.5:7b,openai+http://vllm:8000/v1=Qwen/Qwen2.5-0.5B-Instruct,"
+        )
+        
+        # Assert
+        assert endpoints == [
+            (OLLAMA, 'http://llm-1:11434', None),
+            (OLLAMA, 'http://llm-2:11434', 'qwen2.5:7b'),
+            (OPENAI, 'http://vllm:8000/v1', 'Qwen/Qwen2.5-0.5B-Instruct')
+        ]
+    
+    def test_least_outstanding_routing(self):
+        """Sunshine test: Requests go to the endpoint with the fewest outstanding."""
+        # Arrange
+        a, b, c = Endpoint('http://a'), Endpoint('http://b'), Endpoint('http://c')
+        pool = EndpointPool([a, b, c])
+        
+        # Act
+        first = [pool.acquire() for _ in range(3)]
+        pool.release(b, ok=True)
+        after_release = pool.acquire()
+        
+        # Assert
+        assert sorted(e.url for e in first) == ['http://a', 'http://b', 'http://c']
+        assert after_release is b
+        assert pool.stats()['http://b']['outstanding'] == 1
+    
+    @patch('src.resources.resilience.time.monotonic')
+    def test_ejection_and_readmission(self, mock_monotonic):
+        """Rainy test: A failing endpoint is ejected, then re-admitted after a good trial."""
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        a = Endpoint('http://a', failure_threshold=2, reset_timeout=30)
+        b = Endpoint('http://b')
+        pool = EndpointPool([a, b])
+        
+        # Act
+        for _ in range(2):
+            pool.release(pool.acquire(exclude=[b]), ok=False)
+        while_ejected = {pool.acquire().url for _ in range(3)}
+        only_a = pool.acquire(exclude=[b])
+        mock_monotonic.return_value = 131.0
+        trial = pool.acquire(exclude=[b])
+        pool.release(trial, ok=True)
+        
+        # Assert
+        assert while_ejected == {'http://b'}
+        assert only_a is None
+        assert trial is a
+        assert pool.stats()['http://a'] == {
+            'kind': OLLAMA, 'model': None, 'state': 'closed', 'outstanding': 0, 'requests': 3, 'failures': 2, 'ejections': 1
+        }
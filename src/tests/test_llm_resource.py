@@ -1,19 +1,26 @@
+import json
 import pytest
 from unittest.mock import Mock, patch
 from src.resources.llm import LLMResource
 
 
+@pytest.fixture(autouse=True)
+def fresh_llm_state():
+    with patch('src.resources.llm._health', {}), patch('src.resources.llm_pool._pools', {}):
+        yield
+
+
 class TestLLMResource:
     """Tests for Ollama LLM resource."""
     
-    @patch('requests.get')
-    def test_connection_success(self, mock_get):
+    @patch('requests.Session.request')
+    def test_connection_success(self, mock_request):
         """Sunshine test: Successful Ollama connection."""
         # Arrange
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {'models': [{'name': 'qwen2.5:0.5b'}]}
-        mock_get.return_value = mock_response
+        mock_request.return_value = mock_response
         
         llm = LLMResource()
         
@@ -22,13 +29,13 @@ class TestLLMResource:
         
         # Assert
         assert result is True
-        mock_get.assert_called_with('http://ollama:11434/api/tags', timeout=5)
+        mock_request.assert_called_with('GET', 'http://ollama:11434/api/tags', timeout=(5.0, 5))
     
-    @patch('requests.get')
-    def test_connection_failure(self, mock_get):
+    @patch('requests.Session.request')
+    def test_connection_failure(self, mock_request):
         """Rainy test: Handle Ollama connection failure."""
         # Arrange
-        mock_get.side_effect = Exception("Connection refused")
+        mock_request.side_effect = Exception("Connection refused")
         llm = LLMResource()
         
         # Act
@@ -37,8 +44,8 @@ class TestLLMResource:
         # Assert
         assert result is False
     
-    @patch('requests.post')
-    def test_summarize_success(self, mock_post):
+    @patch('requests.Session.request')
+    def test_summarize_success(self, mock_request):
         """Test successful summarization."""
         # Arrange
         mock_response = Mock()
@@ -46,7 +53,7 @@ class TestLLMResource:
         mock_response.json.return_value = {
             'response': '• First point\n• Second point\n• Third point'
         }
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
         
         llm = LLMResource()
         
@@ -59,14 +66,14 @@ class TestLLMResource:
         assert result['word_count'] > 0
         assert result['model_used'] == 'qwen2.5:0.5b'
     
-    @patch('requests.post')
-    def test_summarize_api_error(self, mock_post):
+    @patch('requests.Session.request')
+    def test_summarize_api_error(self, mock_request):
         """Rainy test: Handle API errors during summarization."""
         # Arrange
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = "Internal server error"
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
         
         llm = LLMResource()
         
@@ -76,4 +83,205 @@ class TestLLMResource:
         # Assert
         assert 'Summary generation failed' in result['summary']
         assert result['model_used'] == 'failed'
+        assert result['error']
         assert len(result['bullet_points']) == 3
+    
+    @patch.dict('os.environ', {'LLM_STREAM': 'true'})
+    @patch('requests.Session.request')
+    def test_summarize_stream_stops_after_three_bullets(self, mock_request):
+        """Sunshine test: Streaming stops reading once three bullets are complete."""
+        # Arrange
+        tokens = ['• First', ' point\n', '• Second point\n', '• Third', ' point\n', 'Closing', ' remark', '']
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = [
+            json.dumps({'response': token, 'done': token == ''}).encode() for token in tokens
+        ]
+        mock_request.return_value = mock_response
+        
+        llm = LLMResource()
+        
+        # Act
+        result = llm.summarize("Test content", "Test title")
+        
+        # Assert
+        assert result['bullet_points'] == ['First point', 'Second point', 'Third point']
+        assert result['stopped_early'] is True
+        assert result['first_bullet_ms'] is not None
+        assert result['metrics']['eval_count'] == 5
+        assert result['metrics']['prompt_eval_count'] is None
+        mock_response.close.assert_called_once()
+        assert mock_request.call_args.kwargs['stream'] is True
+        assert mock_request.call_args.kwargs['json']['stream'] is True
+    
+    @patch.dict('os.environ', {'LLM_STREAM': 'true'})
+    @patch('requests.Session.request')
+    def test_summarize_stream_word_budget(self, mock_request):
+        """Rainy test: A rambling bullet is cut off at the word budget."""
+        # Arrange
+        words = ' '.join(f'w{i}' for i in range(60))
+        tokens = ['• Short first point\n', '• ' + words, ' more', '']
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = [
+            json.dumps({'response': token, 'done': token == ''}).encode() for token in tokens
+        ]
+        mock_request.return_value = mock_response
+        
+        llm = LLMResource()
+        
+        # Act
+        result = llm.summarize("Test content", "Test title")
+        
+        # Assert
+        assert result['stopped_early'] is True
+        assert result['bullet_points'][0] == 'Short first point'
+        assert result['bullet_points'][1] == ' '.join(f'w{i}' for i in range(47))
+        assert sum(len(point.split()) for point in result['bullet_points'][:2]) == 50
+    
+    @patch('requests.Session.request')
+    def test_connection_result_cached(self, mock_request):
+        """Sunshine test: A recent health check is reused instead of probing again."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_request.return_value = mock_response
+        llm = LLMResource()
+        
+        # Act
+        first = llm.test_connection()
+        second = llm.test_connection()
+        
+        # Assert
+        assert first is True and second is True
+        assert mock_request.call_count == 1
+    
+    @patch('requests.Session.request')
+    def test_warm_up_preloads_with_keep_alive(self, mock_request):
+        """Sunshine test: Warm-up sends an empty prompt with keep_alive under the load timeout."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'response': '', 'done': True, 'done_reason': 'load'}
+        mock_request.return_value = mock_response
+        llm = LLMResource()
+        
+        # Act
+        result = llm.warm_up()
+        
+        # Assert
+        assert result['loaded'] is True
+        assert result['load_ms'] >= 0
+        payload = mock_request.call_args.kwargs['json']
+        assert payload['prompt'] == ''
+        assert payload['keep_alive'] == '20m'
+        assert mock_request.call_args.kwargs['timeout'] == (5.0, 120.0)
+    
+    @patch('requests.Session.request')
+    def test_warm_up_failure(self, mock_request):
+        """Rainy test: A failed preload is reported, not raised."""
+        # Arrange
+        mock_request.side_effect = Exception("Connection refused")
+        llm = LLMResource()
+        
+        # Act
+        result = llm.warm_up()
+        
+        # Assert
+        assert result['loaded'] is False
+        assert 'Connection refused' in result['error']
+    
+    @patch('requests.Session.request')
+    def test_summarize_reports_load_and_generate_time(self, mock_request):
+        """Sunshine test: Ollama's load and generation durations are reported separately."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'response': '• First point\n• Second point\n• Third point',
+            'load_duration': 1_500_000_000,
+            'prompt_eval_duration': 200_000_000,
+            'eval_duration': 300_000_000
+        }
+        mock_request.return_value = mock_response
+        llm = LLMResource()
+        
+        # Act
+        result = llm.summarize("Test content", "Test title")
+        
+        # Assert
+        assert result['load_ms'] == 1500.0
+        assert result['generate_ms'] == 500.0
+        assert mock_request.call_args.kwargs['json']['keep_alive'] == '20m'
+    
+    @patch.dict('os.environ', {'LLM_ENDPOINTS': 'http://llm-1:11434,http://llm-2:11434'})
+    @patch('requests.Session.request')
+    def test_summarize_fails_over_to_next_endpoint(self, mock_request):
+        """Rainy test: A request that fails on one endpoint is retried on another."""
+        # Arrange
+        good = Mock()
+        good.status_code = 200
+        good.json.return_value = {'response': '• First point\n• Second point\n• Third point'}
+        
+        def request(method, url, **kwargs):
+            if url.startswith('http://llm-1'):
+                raise Exception("Connection refused")
+            return good
+        mock_request.side_effect = request
+        llm = LLMResource()
+        
+        # Act
+        results = [llm.summarize("Test content", "Test title") for _ in range(2)]
+        stats = llm.endpoint_stats()
+        
+        # Assert
+        assert all(r['endpoint'] == 'http://llm-2:11434' for r in results)
+        assert all(r['model_used'] == 'qwen2.5:0.5b' for r in results)
+        assert stats['http://llm-1:11434']['failures'] >= 1
+    
+    @patch.dict('os.environ', {'LLM_ENDPOINTS': 'http://llm-3:11434=llama3.2:1b'})
+    @patch('requests.Session.request')
+    def test_summarize_uses_the_endpoint_model(self, mock_request):
+        """Sunshine test: An endpoint's own model is requested and recorded."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'response': '• First point\n• Second point\n• Third point'}
+        mock_request.return_value = mock_response
+        llm = LLMResource()
+        
+        # Act
+        result = llm.summarize("Test content", "Test title")
+        
+        # Assert
+        assert mock_request.call_args.kwargs['json']['model'] == 'llama3.2:1b'
+        assert result['model_used'] == 'llama3.2:1b'
+    
+    @patch('requests.Session.request')
+    def test_summarize_keeps_ollama_metrics(self, mock_request):
+        """Sunshine test: Ollama's durations and token counts are kept with the summary."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'response': '• First point\n• Second point\n• Third point',
+            'total_duration': 900_000_000,
+            'load_duration': 100_000_000,
+            'prompt_eval_count': 180,
+            'prompt_eval_duration': 300_000_000,
+            'eval_count': 24,
+            'eval_duration': 480_000_000
+        }
+        mock_request.return_value = mock_response
+        llm = LLMResource()
+        
+        # Act
+        result = llm.summarize("Test content", "Test title")
+        
+        # Assert
+        metrics = result['metrics']
+        assert metrics['total_duration_ms'] == 900.0
+        assert metrics['prompt_eval_count'] == 180
+        assert metrics['eval_count'] == 24
+        assert metrics['eval_duration_ms'] == 480.0
+        assert metrics['latency_ms'] >= 0
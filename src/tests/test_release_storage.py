@@ -0,0 +1,48 @@
+import os
+from datetime import date
+from unittest.mock import MagicMock, patch
+from src.resources.release_storage import add_months, ensure_release_storage, list_partitions
+
+
+class TestReleaseStorage:
+    """Tests for the monthly-partitioned press release storage helpers."""
+    
+    @patch.dict(os.environ, {"RELEASE_PARTITIONS_AHEAD": "2"})
+    def test_ensure_release_storage_creates_window(self):
+        """Sunshine test: Partitions are ensured from last month to two months ahead."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (4,)
+        
+        # Act
+        created = ensure_release_storage(cursor, today=date(2025, 12, 15))
+        
+        # Assert
+        assert created == 4
+        assert "PARTITION BY RANGE (published_at)" in cursor.execute.call_args_list[0][0][0]
+        assert cursor.execute.call_args_list[1][0][1] == (date(2025, 11, 1), date(2026, 2, 1))
+    
+    def test_add_months_crosses_years(self):
+        """Sunshine test: Month arithmetic wraps across year boundaries."""
+        # Act / Assert
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+        assert add_months(date(2025, 1, 1), -24) == date(2023, 1, 1)
+        assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    
+    def test_list_partitions(self):
+        """Sunshine test: Partition names are mapped to their month and attach state."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [
+            ('press_releases_y2023m01', False),
+            ('press_releases_y2025m03', True),
+        ]
+        
+        # Act
+        partitions = list_partitions(cursor)
+        
+        # Assert
+        assert partitions == [
+            {'name': 'press_releases_y2023m01', 'month': date(2023, 1, 1), 'attached': False},
+            {'name': 'press_releases_y2025m03', 'month': date(2025, 3, 1), 'attached': True},
+        ]
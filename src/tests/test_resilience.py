@@ -0,0 +1,102 @@
+from unittest.mock import patch
+import requests
+from src.resources.resilience import (
+    TRANSIENT, RATE_LIMITED, PERMANENT,
+    AdaptiveLimiter, CircuitBreaker, TokenBucket,
+    backoff_delay, classify_exception, classify_status, retry_after_seconds
+)
+
+
+class TestResilience:
+    """Tests for fetch error classification, backoff and limiting."""
+    
+    def test_classify_errors(self):
+        """Sunshine test: Statuses and exceptions map to retry classes."""
+        # Act / Assert
+        assert classify_status(429) == RATE_LIMITED
+        assert classify_status(503) == TRANSIENT
+        assert classify_status(404) == PERMANENT
+        assert classify_exception(requests.Timeout()) == TRANSIENT
+        assert classify_exception(ValueError()) == PERMANENT
+    
+    def test_retry_after_and_backoff(self):
+        """Test Retry-After parsing and the jittered backoff ceiling."""
+        # Act / Assert
+        assert retry_after_seconds('12') == 12.0
+        assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+        assert retry_after_seconds('soon') is None
+        with patch('src.resources.resilience.random.uniform', side_effect=lambda low, high: high):
+            assert backoff_delay(0, 1, 30) == 1
+            assert backoff_delay(3, 1, 30) == 8
+            assert backoff_delay(10, 1, 30) == 30
+    
+    @patch('src.resources.resilience.time.sleep')
+    def test_token_bucket_refuses_beyond_timeout(self, mock_sleep):
+        """Rainy test: An empty bucket refuses when the refill exceeds the timeout."""
+        # Arrange
+        bucket = TokenBucket(rate=1, capacity=5)
+        
+        # Act
+        first = bucket.acquire(5)
+        second = bucket.acquire(5, timeout=1)
+        
+        # Assert
+        assert first is True
+        assert second is False
+        assert TokenBucket(rate=0, capacity=0).acquire(100) is True
+    
+    def test_circuit_breaker_opens_and_half_opens(self):
+        """Test the closed -> open -> half-open -> closed cycle."""
+        # Arrange
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        
+        # Act
+        breaker.record_failure()
+        breaker.record_failure()
+        refused = not breaker.allow()
+        with patch('src.resources.resilience.time.monotonic', return_value=breaker._opened_at + 61):
+            trial = breaker.allow()
+            second_trial = breaker.allow()
+        breaker.record_success()
+        
+        # Assert
+        assert refused
+        assert trial is True
+        assert second_trial is False
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_adaptive_limiter_grows_while_fast_and_backs_off_when_queueing(self):
+        """Sunshine test: The limit climbs while calls stay near the baseline and drops when they slow."""
+        # Arrange
+        limiter = AdaptiveLimiter(1, 1, 4)
+        
+        # Act: fill the limit with fast calls until it stops growing
+        for _ in range(20):
+            for _ in range(limiter.limit):
+                limiter.acquire()
+            for _ in range(limiter.limit):
+                limiter.release(0.1)
+        grown = limiter.limit
+        for _ in range(grown):
+            limiter.acquire()
+        limiter.release(0.5)
+        
+        # Assert
+        assert grown == 4
+        assert limiter.limit == 3
+        assert limiter.stats()['decreases'] == 1
+        assert limiter.stats()['baseline_ms'] == 100.0
+    
+    def test_fixed_limiter_ignores_failures(self):
+        """Rainy test: A fixed limit is neither cut by failures nor raised by fast calls."""
+        # Arrange
+        limiter = AdaptiveLimiter(2, 2, 2)
+        
+        # Act
+        for ok in (False, True, False):
+            limiter.acquire()
+            limiter.release(0.1, ok=ok)
+        
+        # Assert
+        assert limiter.limit == 2
+        assert limiter.stats()['max_in_flight'] == 1
@@ -1,14 +1,32 @@
+import os
+import glob
 import pytest
 from unittest.mock import Mock, patch
 import hashlib
 from datetime import datetime
-from src.resources.scraper import ScraperResource
+from src.resources.scraper import ScraperResource, HostRateLimiter
+from src.resources.fetch_modes import render_state_path
+from src.resources.parsers import parse_content_bs4, parse_content_lxml
+from src.resources.resilience import CircuitBreaker, TokenBucket
+
+SEC_PAGES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'fixtures', 'sec_pages', '*.html')))
+
+# Pages html.parser and libxml2 build into different trees
+MALFORMED_PAGES = {
+    'unclosed_p': '<h1>T</h1><div class="region-content"><p>a</p><p>b<p>c</p></div>',
+    'unclosed_li': '<h1>T</h1><div class="region-content"><ul><li>a<li>b</ul></div>',
+    'list_in_p': '<h1>T</h1><div class="region-content"><p>a<ul><li>x</li></ul></p></div>',
+    'table_in_p': '<h1>T</h1><div class="region-content"><p>a<table><tr><td>t</td></tr></table>b</p></div>',
+    'stray_end_tag': '<h1>T</h1><div class="region-content"><p>a</p></p><li>z</li></div>',
+    'misnested_inline': '<h1>T</h1><div class="region-content"><p><b>a<i>b</b>c</i></p></div>'
+}
 
 
 class TestScraperResource:
     """Tests for web scraper resource."""
     
-    @patch('requests.get')
+    @patch.dict('os.environ', {'SCRAPER_API_KEY': 'test-key'})
+    @patch('requests.Session.request')
     def test_scrape_url_success(self, mock_get):
         """Sunshine test: Successful URL scraping."""
         # Arrange
@@ -29,7 +47,8 @@ class TestScraperResource:
         assert 'url_hash' in result
         assert result['url_hash'] == hashlib.sha256('https://test.com'.encode()).hexdigest()
     
-    @patch('requests.get')
+    @patch.dict('os.environ', {'SCRAPER_API_KEY': 'test-key'})
+    @patch('requests.Session.request')
     def test_scrape_url_error(self, mock_get):
         """Rainy test: Handle scraping errors gracefully."""
         # Arrange
@@ -95,3 +114,249 @@ class TestScraperResource:
         # Assert
         assert result['success'] is False
         assert 'No API key' in result['error']
+
+    @patch('src.resources.scraper.time.sleep')
+    def test_host_rate_limiter_spaces_requests(self, mock_sleep):
+        """Test that requests to one host are spaced by the configured rate."""
+        # Arrange
+        limiter = HostRateLimiter()
+        
+        # Act
+        limiter.acquire('www.sec.gov', 2.0)
+        limiter.acquire('www.sec.gov', 2.0)
+        limiter.acquire('other.example.com', 2.0)
+        
+        # Assert
+        assert mock_sleep.call_count == 1
+        assert 0.4 < mock_sleep.call_args[0][0] <= 0.5
+    
+    def test_get_sec_urls_stops_at_known_page(self):
+        """Test that incremental paging stops on a page of known releases."""
+        # Arrange
+        listing = """
+        <html><body><div class="view-content">
+            <a href="/newsroom/press-releases/2025-101">A</a>
+            <a href="/newsroom/press-releases/2025-100">B</a>
+        </div></body></html>
+        """
+        scraper = ScraperResource()
+        
+        # Act
+        with patch.object(ScraperResource, 'scrape_url', return_value={'success': True, 'content': listing}) as mock_scrape:
+            urls = scraper.get_sec_urls(limit=50, known_urls=lambda page_urls: set(page_urls))
+        
+        # Assert
+        assert mock_scrape.call_count == 1
+        assert urls == [
+            'https://www.sec.gov/newsroom/press-releases/2025-101',
+            'https://www.sec.gov/newsroom/press-releases/2025-100'
+        ]
+    
+    def test_get_sec_urls_continues_past_new_releases(self):
+        """Test that paging continues while pages contain unknown releases."""
+        # Arrange
+        pages = [
+            {'success': True, 'content': '<a href="/news/press-release/2025-101">A</a>'},
+            {'success': True, 'content': '<a href="/news/press-release/2025-100">B</a>'},
+        ]
+        scraper = ScraperResource()
+        known = {'https://www.sec.gov/news/press-release/2025-100'}
+        
+        # Act
+        with patch.object(ScraperResource, 'scrape_url', side_effect=pages) as mock_scrape:
+            urls = scraper.get_sec_urls(limit=50, known_urls=lambda page_urls: known & set(page_urls))
+        
+        # Assert
+        assert mock_scrape.call_count == 2
+        assert len(urls) == 2
+    
+    @patch('requests.Session.request')
+    def test_cached_article_is_not_refetched(self, mock_request, tmp_path):
+        """Test that a cached page is served without a network request."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = '<html>article</html>'
+        mock_response.headers = {}
+        mock_request.return_value = mock_response
+        scraper = ScraperResource()
+        
+        # Act
+        with patch.dict('os.environ', {'SCRAPER_API_KEY': 'test-key', 'SCRAPER_CACHE_DIR': str(tmp_path)}):
+            first = scraper.scrape_url('https://test.com/article')
+            second = scraper.scrape_url('https://test.com/article')
+        
+        # Assert
+        assert mock_request.call_count == 1
+        assert first['from_cache'] is False
+        assert second['from_cache'] is True
+        assert second['content'] == '<html>article</html>'
+    
+    @patch('requests.Session.request')
+    def test_unchanged_listing_is_not_reparsed(self, mock_request, tmp_path):
+        """Test that a listing with an unchanged body hash reuses its parsed links."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = '<a href="/news/press-release/2025-101">A</a>'
+        mock_response.headers = {'Spb-ETag': '"v1"'}
+        mock_request.return_value = mock_response
+        scraper = ScraperResource()
+        env = {'SCRAPER_API_KEY': 'test-key', 'SCRAPER_CACHE_DIR': str(tmp_path)}
+        
+        # Act
+        with patch.dict('os.environ', env):
+            first = scraper.get_sec_urls(limit=1)
+            with patch.object(ScraperResource, '_listing_links') as mock_parse:
+                second = scraper.get_sec_urls(limit=1)
+        
+        # Assert
+        assert first == second == ['https://www.sec.gov/news/press-release/2025-101']
+        mock_parse.assert_not_called()
+        assert mock_request.call_args.kwargs['headers'] == {'Spb-If-None-Match': '"v1"'}
+    
+    @pytest.mark.parametrize('path', SEC_PAGES, ids=os.path.basename)
+    def test_lxml_engine_matches_bs4(self, path):
+        """Test that the lxml engine output is identical on saved SEC pages."""
+        # Arrange
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        
+        # Act
+        expected = parse_content_bs4(html, path)
+        actual = parse_content_lxml(html, path)
+        
+        # Assert
+        assert actual == expected
+    
+    @pytest.mark.parametrize('html', MALFORMED_PAGES.values(), ids=MALFORMED_PAGES.keys())
+    def test_lxml_engine_matches_bs4_on_malformed_html(self, html):
+        """Rainy test: Unclosed and misnested tags give the same output from both engines."""
+        # Act
+        expected = parse_content_bs4(html, 'https://test.com')
+        actual = parse_content_lxml(html, 'https://test.com')
+        
+        # Assert
+        assert actual == expected
+    
+    @patch.dict('os.environ', {'PARSER_ENGINE': 'lxml'})
+    def test_parse_content_uses_configured_engine(self):
+        """Test that PARSER_ENGINE selects the lxml engine."""
+        # Arrange
+        scraper = ScraperResource()
+        
+        # Act
+        with patch.dict('src.resources.parsers.PARSER_ENGINES', {'lxml': Mock(return_value={'title': 'x'})}):
+            result = scraper.parse_content('<html></html>', 'https://test.com')
+        
+        # Assert
+        assert result == {'title': 'x'}
+    
+    def test_listing_escalates_to_render_js_and_remembers(self, tmp_path):
+        """Test that render_js is used only after a plain fetch misses, then reused."""
+        # Arrange
+        plain = {'success': True, 'content': '<div id="app"></div>'}
+        rendered = {'success': True, 'content': '<a href="/news/press-release/2025-101">A</a>'}
+        scraper = ScraperResource()
+        
+        def fake_scrape(url, render_js=False, revalidate=False):
+            return rendered if render_js else plain
+        
+        # Act
+        with patch.dict('os.environ', {'SCRAPER_CACHE_DIR': str(tmp_path)}), \
+                patch.object(ScraperResource, 'scrape_url', side_effect=fake_scrape) as mock_scrape:
+            first = scraper.get_sec_urls(limit=1)
+            first_modes = [c.kwargs['render_js'] for c in mock_scrape.call_args_list]
+            mock_scrape.reset_mock()
+            second = scraper.get_sec_urls(limit=1)
+            second_modes = [c.kwargs['render_js'] for c in mock_scrape.call_args_list]
+            stats = scraper.fetch_mode_stats()
+        
+        # Assert
+        assert first == second == ['https://www.sec.gov/news/press-release/2025-101']
+        assert first_modes == [False, True]
+        assert second_modes == [True]
+        assert stats['escalations'] == 1
+        assert stats['render_js_patterns'] == ['www.sec.gov/newsroom/press-releases?page={n}']
+        assert os.path.exists(render_state_path(str(tmp_path)))
+        assert not (tmp_path / 'render_modes.json').exists()
+
+    @patch('requests.Session.request')
+    def test_render_escalation_does_not_revalidate_plain_page(self, mock_request, tmp_path):
+        """Rainy test: The rendered fetch is cached apart from the plain one it replaces."""
+        # Arrange
+        def request(method, url, params=None, headers=None, **kwargs):
+            if params['render_js'] == 'true':
+                etag = '"rendered-etag"'
+                if headers.get('Spb-If-None-Match') == etag:
+                    return Mock(status_code=304, headers={})
+                return Mock(status_code=200, text='<a href="/news/press-release/2025-101">A</a>', headers={'Spb-ETag': etag})
+            return Mock(status_code=200, text='<div id="app"></div>', headers={'Spb-ETag': '"plain-etag"'})
+        mock_request.side_effect = request
+        scraper = ScraperResource()
+        env = {'SCRAPER_API_KEY': 'test-key', 'SCRAPER_CACHE_DIR': str(tmp_path)}
+        
+        # Act
+        with patch.dict('os.environ', env):
+            first = scraper.get_sec_urls(limit=1)
+            second = scraper.get_sec_urls(limit=1)
+        
+        # Assert
+        calls = [(c.kwargs['params']['render_js'], c.kwargs['headers']) for c in mock_request.call_args_list]
+        assert first == second == ['https://www.sec.gov/news/press-release/2025-101']
+        assert calls == [
+            ('false', {}),
+            ('true', {}),
+            ('true', {'Spb-If-None-Match': '"rendered-etag"'})
+        ]
+    
+    @patch.dict('os.environ', {'SCRAPER_API_KEY': 'test-key', 'SCRAPER_MAX_RETRIES': '3'})
+    @patch('src.resources.scraper.time.sleep')
+    @patch('requests.Session.request')
+    def test_scrape_url_retries_transient_errors(self, mock_request, mock_sleep):
+        """Test that 5xx and 429 responses are retried, honoring Retry-After."""
+        # Arrange
+        responses = [Mock(status_code=503, headers={}), Mock(status_code=429, headers={'Retry-After': '2'}),
+                     Mock(status_code=200, headers={}, text='<html>ok</html>')]
+        mock_request.side_effect = responses
+        scraper = ScraperResource()
+        
+        # Act
+        with patch('src.resources.scraper._breaker', CircuitBreaker()):
+            result = scraper.scrape_url('https://test.com/retry')
+        
+        # Assert
+        assert result['success'] is True
+        assert mock_request.call_count == 3
+        assert any(call[0][0] == 2.0 for call in mock_sleep.call_args_list)
+    
+    @patch.dict('os.environ', {'SCRAPER_API_KEY': 'test-key', 'SCRAPER_MAX_RETRIES': '0'})
+    @patch('requests.Session.request')
+    def test_scrape_url_stops_when_circuit_opens(self, mock_request):
+        """Rainy test: Once the breaker opens, no further requests are sent."""
+        # Arrange
+        mock_request.return_value = Mock(status_code=502, headers={})
+        scraper = ScraperResource()
+        
+        # Act
+        with patch('src.resources.scraper._breaker', CircuitBreaker(failure_threshold=2)):
+            results = [scraper.scrape_url(f'https://test.com/{i}') for i in range(4)]
+        
+        # Assert
+        assert mock_request.call_count == 2
+        assert [r['error_kind'] for r in results] == ['transient', 'transient', 'circuit_open', 'circuit_open']
+    
+    @patch.dict('os.environ', {'SCRAPER_API_KEY': 'test-key'})
+    @patch('requests.Session.request')
+    def test_scrape_url_respects_credit_budget(self, mock_request):
+        """Rainy test: A render_js fetch is refused when the credit budget is spent."""
+        # Arrange
+        scraper = ScraperResource()
+        
+        # Act
+        with patch('src.resources.scraper._credit_bucket', TokenBucket(rate=0.001, capacity=3)):
+            result = scraper.scrape_url('https://test.com/js', render_js=True)
+        
+        # Assert
+        assert result['error_kind'] == 'budget_exhausted'
+        mock_request.assert_not_called()
@@ -0,0 +1,64 @@
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from src.resources.search import search_releases
+
+
+class TestSearchReleases:
+    """Tests for full-text search over press releases."""
+    
+    def test_search_maps_rows(self):
+        """Sunshine test: Matches are returned with snippet and rank, without date bounds."""
+        # Arrange
+        cursor = MagicMock()
+        published = datetime(2025, 3, 2)
+        cursor.fetchall.return_value = [
+            ('SEC Charges Adviser', published, 'https://test.com/1', '• Summary', 'civil <b>penalty</b>', 0.42)
+        ]
+        
+        # Act
+        results = search_releases(cursor, 'penalty', limit=5)
+        
+        # Assert
+        query, params = cursor.execute.call_args[0]
+        assert 'published_at >=' not in query
+        assert params['q'] == 'penalty'
+        assert params['limit'] == 5
+        assert results == [{
+            'title': 'SEC Charges Adviser',
+            'published_at': published,
+            'url': 'https://test.com/1',
+            'summary': '• Summary',
+            'snippet': 'civil <b>penalty</b>',
+            'rank': 0.42
+        }]
+    
+    def test_search_date_range(self):
+        """Sunshine test: Date bounds are added to the query only when given."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        
+        # Act
+        results = search_releases(cursor, 'fraud', since=date(2025, 1, 1), until=date(2025, 1, 31))
+        
+        # Assert
+        query, params = cursor.execute.call_args[0]
+        assert 'pr.published_at >= %(since)s' in query
+        assert 'pr.published_at < %(until)s::date + 1' in query
+        assert params['since'] == date(2025, 1, 1)
+        assert results == []
+    
+    def test_headline_query_uses_positive_lexemes(self):
+        """Rainy test: Snippet highlighting is built from the query's lexemes, not its text."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        
+        # Act
+        search_releases(cursor, '"insider trading" -crypto')
+        
+        # Assert
+        query, params = cursor.execute.call_args[0]
+        assert 'querytree(q.query)' in query
+        assert "replace(query::text" not in query
+        assert params['q'] == '"insider trading" -crypto'
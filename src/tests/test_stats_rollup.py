@@ -0,0 +1,33 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+from src.resources.stats_rollup import read_stats
+
+
+class TestStatsRollup:
+    """Tests for reading the trigger-maintained stats rollup."""
+    
+    def test_read_stats(self):
+        """Sunshine test: The rollup row is mapped to named totals."""
+        # Arrange
+        cursor = MagicMock()
+        newest = datetime(2025, 3, 1)
+        cursor.fetchone.return_value = (120, 100, datetime(2019, 1, 2), newest, newest, 14)
+        
+        # Act
+        stats = read_stats(cursor, recent_days=30)
+        
+        # Assert
+        assert cursor.execute.call_args[0][1] == (30,)
+        assert stats['total_releases'] == 120
+        assert stats['unsummarized'] == 20
+        assert stats['newest_release'] == newest
+        assert stats['recent_releases'] == 14
+    
+    def test_read_stats_before_seeding(self):
+        """Rainy test: No rollup row yet returns None so callers can fall back."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        
+        # Act / Assert
+        assert read_stats(cursor) is None
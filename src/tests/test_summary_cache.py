@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+import pytest
+from src.resources.llm import summary_cache_key
+from src.resources.summary_cache import SummaryCache
+
+
+def _postgres(cursor):
+    postgres = MagicMock()
+    postgres.get_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = cursor
+    return postgres
+
+
+@pytest.fixture(autouse=True)
+def empty_lru():
+    with patch('src.resources.summary_cache._lru', OrderedDict()):
+        yield
+
+
+class TestSummaryCache:
+    """Tests for the Postgres-backed summary cache and its in-process LRU."""
+    
+    def test_database_hit_is_served_from_memory_next_time(self):
+        """Sunshine test: A database hit is remembered, so the next lookup skips Postgres."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchone.return_value = ('• a\n• b\n• c', ['a', 'b', 'c'], 3)
+        cache = SummaryCache(_postgres(cursor), model='qwen', prompt_version='v1')
+        
+        # Act
+        first = cache.get('hash')
+        second = cache.get('hash')
+        
+        # Assert
+        assert first == second == {
+            'summary': '• a\n• b\n• c', 'bullet_points': ['a', 'b', 'c'], 'word_count': 3, 'model_used': 'qwen'
+        }
+        assert cursor.execute.call_count == 1
+        assert cursor.execute.call_args[0][1] == ('qwen', 'v1', 'hash')
+        assert cache.stats()['db_hits'] == 1
+        assert cache.stats()['memory_hits'] == 1
+        assert cache.stats()['hit_rate'] == 1.0
+    
+    def test_failed_summaries_are_not_cached(self):
+        """Rainy test: Failure placeholders never reach the cache."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        cache = SummaryCache(_postgres(cursor), model='qwen', prompt_version='v1')
+        
+        # Act
+        cache.put('hash', {'summary': '• failed', 'bullet_points': ['failed'], 'word_count': 1, 'model_used': 'failed'})
+        result = cache.get('hash')
+        
+        # Assert
+        assert result is None
+        assert cursor.execute.call_count == 1
+        assert cache.stats()['misses'] == 1
+    
+    def test_invalidate_drops_other_models_and_prompts(self):
+        """Test that switching model drops stale entries from memory and Postgres."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.rowcount = 4
+        summary = {'summary': '• a', 'bullet_points': ['a'], 'word_count': 1, 'model_used': 'old'}
+        SummaryCache(_postgres(cursor), model='old', prompt_version='v1').put('hash', summary)
+        cache = SummaryCache(_postgres(cursor), model='new', prompt_version='v1')
+        cursor.fetchone.return_value = None
+        
+        # Act
+        invalidated = cache.invalidate_stale()
+        stale = SummaryCache(_postgres(cursor), model='old', prompt_version='v1').get('hash')
+        
+        # Assert
+        assert invalidated == 4
+        query, params = cursor.execute.call_args_list[1][0]
+        assert 'DELETE FROM raw_data.summary_cache' in query
+        assert params == ('new', 'v1')
+        assert stale is None
+    
+    def test_cache_key_ignores_whitespace_only(self):
+        """Test that the key follows what the prompt sees, not incidental whitespace."""
+        # Act
+        key = summary_cache_key("SEC  charges\nfirm", "Title")
+        
+        # Assert
+        assert key == summary_cache_key("SEC charges firm ", " Title")
+        assert key != summary_cache_key("SEC charges firm", "Other title")
+        assert summary_cache_key("x" * 2000 + "tail", "T") == summary_cache_key("x" * 2000, "T")
@@ -0,0 +1,57 @@
+from src.resources.summary_metrics import COLUMNS, aggregate_metrics, metrics_row
+
+
+def _metrics(latency_ms, prompt_tokens=None, prompt_ms=None, tokens=None, eval_ms=None):
+    return {
+        'latency_ms': latency_ms, 'total_duration_ms': None, 'load_duration_ms': None,
+        'prompt_eval_count': prompt_tokens, 'prompt_eval_duration_ms': prompt_ms,
+        'eval_count': tokens, 'eval_duration_ms': eval_ms
+    }
+
+
+class TestSummaryMetrics:
+    """Tests for per-summary LLM telemetry rows and their aggregation."""
+    
+    def test_aggregate_metrics(self):
+        """Sunshine test: Percentiles and throughput over a run's requests."""
+        # Arrange
+        metrics = [_metrics(100.0 * i, prompt_tokens=200, prompt_ms=100.0, tokens=20, eval_ms=400.0)
+                   for i in range(1, 21)]
+        
+        # Act
+        aggregate = aggregate_metrics(metrics)
+        
+        # Assert
+        assert aggregate['requests'] == 20
+        assert aggregate['latency_p50_ms'] == 1000.0
+        assert aggregate['latency_p95_ms'] == 1900.0
+        assert aggregate['tokens_per_second'] == 50.0
+        assert aggregate['prompt_tokens_per_second'] == 2000.0
+        assert aggregate['avg_prompt_tokens'] == 200.0
+    
+    def test_aggregate_without_server_counters(self):
+        """Rainy test: Streams cut short report latency only, and no throughput is invented."""
+        # Act
+        aggregate = aggregate_metrics([_metrics(300.0), _metrics(100.0)])
+        empty = aggregate_metrics([])
+        
+        # Assert
+        assert aggregate['latency_p50_ms'] == 100.0
+        assert aggregate['tokens_per_second'] is None
+        assert aggregate['avg_prompt_tokens'] is None
+        assert empty['requests'] == 0 and empty['latency_p95_ms'] is None
+    
+    def test_metrics_row_matches_columns(self):
+        """Test that a summarize result maps onto the table's columns."""
+        # Arrange
+        result = {'model_used': 'm', 'endpoint': 'http://llm-1:11434', 'stopped_early': False,
+                  'metrics': _metrics(250.0, prompt_tokens=180, prompt_ms=90.0, tokens=40, eval_ms=800.0)}
+        
+        # Act
+        row = dict(zip(COLUMNS, metrics_row(7, 'run-1', result)))
+        
+        # Assert
+        assert len(row) == len(COLUMNS)
+        assert row['press_release_id'] == 7 and row['run_id'] == 'run-1'
+        assert row['endpoint'] == 'http://llm-1:11434'
+        assert row['eval_count'] == 40 and row['latency_ms'] == 250.0
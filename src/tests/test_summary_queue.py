@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock
+from src.resources.release_storage import STORAGE_DDL
+from src.resources.summary_queue import SummaryQueue
+
+
+def _postgres(cursor):
+    postgres = MagicMock()
+    postgres.get_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = cursor
+    return postgres
+
+
+class TestSummaryQueue:
+    """Tests for the leased summarization work queue."""
+    
+    def test_claim_uses_skip_locked_and_lease(self):
+        """Sunshine test: Claims lock with SKIP LOCKED and return ids newest first."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [(4,), (9,)]
+        queue = SummaryQueue(_postgres(cursor), worker_id='host:1:run', lease_seconds=120, max_attempts=3)
+        
+        # Act
+        claimed = queue.claim(10)
+        
+        # Assert
+        query, params = cursor.execute.call_args[0]
+        assert 'FOR UPDATE SKIP LOCKED' in query
+        assert 'lease_expires_at < NOW()' in query
+        assert params == (3, 10, 'host:1:run', 120)
+        assert claimed == [9, 4]
+    
+    def test_iter_claimed_pages_by_keyset(self):
+        """Test that claimed content is read in keyset pages of the fetch size."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.side_effect = [[(9, 't', 'c'), (7, 't', 'c')], [(4, 't', 'c')]]
+        queue = SummaryQueue(_postgres(cursor), worker_id='w')
+        
+        # Act
+        stream = queue.iter_claimed([9, 7, 4], fetch_size=2)
+        first = next(stream)
+        
+        # Assert
+        assert first[0] == 9
+        assert cursor.execute.call_count == 1
+        assert [row[0] for row in stream] == [7, 4]
+        assert cursor.execute.call_args_list[1][0][1] == ([9, 7, 4], 7, 7, 2)
+    
+    def test_claim_parks_expired_claims_without_attempts_left(self):
+        """Rainy test: A lease that expired on its last attempt is parked as failed, not left claimed."""
+        # Arrange
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        queue = SummaryQueue(_postgres(cursor), worker_id='w', max_attempts=3)
+        
+        # Act
+        queue.claim(10)
+        
+        # Assert
+        park_query, park_params = cursor.execute.call_args_list[0][0]
+        assert "SET status = 'failed'" in park_query
+        assert "status = 'claimed' AND lease_expires_at < NOW() AND attempts >= %s" in park_query
+        assert park_params == (3,)
+        assert 'FOR UPDATE SKIP LOCKED' in cursor.execute.call_args_list[1][0][0]
+    
+    def test_releases_are_queued_on_insert(self):
+        """Test that the registry trigger queues new releases and the backfill runs only once."""
+        # Act
+        trigger = STORAGE_DDL[STORAGE_DDL.index('register_press_release()'):STORAGE_DDL.index('press_releases_register')]
+        
+        # Assert
+        assert 'INSERT INTO raw_data.summary_queue (press_release_id) VALUES (new_id)' in trigger
+        assert "IS DISTINCT FROM 'Queued on insert by register_press_release'" in STORAGE_DDL
+        assert not hasattr(SummaryQueue, 'enqueue_missing')